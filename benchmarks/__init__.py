@@ -0,0 +1,10 @@
+"""
+Performance benchmarks for Tutor.
+
+Run all benchmarks with::
+
+    python -m benchmarks
+
+Benchmarks run offline, on synthetic projects with a configurable number of plugins,
+patches and templates. Run ``python -m benchmarks --help`` for all options.
+"""
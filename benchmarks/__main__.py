@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import sys
+import typing as t
+
+import click
+
+from . import (
+    bench_cli,
+    bench_config,
+    bench_env,
+    bench_hooks,
+    bench_plugins,
+    bench_serialize,
+)
+from .base import Runner
+
+MODULES = [
+    bench_cli,
+    bench_config,
+    bench_env,
+    bench_hooks,
+    bench_plugins,
+    bench_serialize,
+]
+
+
+@click.command(help="Run the Tutor performance benchmarks")
+@click.option(
+    "-k", "--select", help="Only run benchmarks with a name that contains this string"
+)
+@click.option(
+    "-n", "--repeat", type=click.IntRange(min=1), default=10, show_default=True
+)
+@click.option("--plugins", type=click.IntRange(min=1), default=20, show_default=True)
+@click.option("--patches", type=click.IntRange(min=0), default=50, show_default=True)
+@click.option("--templates", type=click.IntRange(min=0), default=200, show_default=True)
+@click.option(
+    "-s", "--save", type=click.Path(dir_okay=False), help="Save results to a json file"
+)
+@click.option(
+    "-c",
+    "--compare",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Compare results with a json file generated by --save, and fail on regressions",
+)
+@click.option(
+    "-t",
+    "--tolerance",
+    type=float,
+    default=1.25,
+    show_default=True,
+    help="Median durations greater than the reference by this factor are regressions",
+)
+def main(
+    select: t.Optional[str],
+    repeat: int,
+    plugins: int,
+    patches: int,
+    templates: int,
+    save: t.Optional[str],
+    compare: t.Optional[str],
+    tolerance: float,
+) -> None:
+    runner = Runner(
+        repeat=repeat,
+        select=select,
+        plugins=plugins,
+        patches=patches,
+        templates=templates,
+    )
+    runner.print_header()
+    for module in MODULES:
+        module.run(runner)
+    parameters = {"plugins": plugins, "patches": patches, "templates": templates}
+    results = {result.name: result.as_dict() for result in runner.results}
+    if save:
+        with open(save, "w", encoding="utf-8") as f:
+            json.dump({"parameters": parameters, "results": results}, f, indent=2)
+    if compare:
+        with open(compare, encoding="utf-8") as f:
+            reference = json.load(f)
+        if reference["parameters"] != parameters:
+            print(
+                f"Warning: reference results were generated with different parameters: {reference['parameters']}"
+            )
+        regressions = []
+        for name, result in results.items():
+            reference_median = reference["results"].get(name, {}).get("median")
+            if not reference_median:
+                continue
+            ratio = result["median"] / reference_median
+            if ratio > tolerance:
+                regressions.append(f"{name}: {ratio:.2f}x slower")
+        if regressions:
+            print("Performance regressions:\n  " + "\n  ".join(regressions))
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import io
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import typing as t
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+
+# Import all commands, as the command line would, to declare all core hooks.
+import tutor.commands.cli  # noqa: F401
+from tutor import hooks, plugins, serialize, utils
+from tutor.core.hooks import contexts
+from tutor.plugins.v0 import DictPlugin
+
+# Context of all the hooks that are created by the benchmarks
+CONTEXT = "benchmarks"
+
+# Print the exit code, duration and peak memory (in bytes) of a command
+MEASURE_COMMAND = """
+import subprocess, sys, time
+start = time.perf_counter()
+returncode = subprocess.call(
+    sys.argv[1:], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+)
+duration = time.perf_counter() - start
+try:
+    import resource
+    # ru_maxrss is in kilobytes
+    maxrss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+except ImportError:
+    # resource is not available on Windows
+    maxrss = 0
+print(returncode, duration, maxrss)
+"""
+
+
+class Result:
+    def __init__(self, name: str, durations: list[float], memory: int):
+        self.name = name
+        # Durations, in seconds
+        self.durations = durations
+        # Peak memory, in bytes
+        self.memory = memory
+
+    @property
+    def min(self) -> float:
+        return min(self.durations)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.durations)
+
+    def as_dict(self) -> dict[str, t.Any]:
+        return {"min": self.min, "median": self.median, "memory": self.memory}
+
+
+class Runner:
+    """
+    Run benchmarks and collect their results.
+
+    Benchmarks which are not selected are skipped, including their setup.
+    """
+
+    def __init__(
+        self,
+        repeat: int = 10,
+        select: t.Optional[str] = None,
+        plugins: int = 20,
+        patches: int = 50,
+        templates: int = 200,
+    ):
+        self.repeat = repeat
+        self.select = select
+        self.plugins = plugins
+        self.patches = patches
+        self.templates = templates
+        self.results: list[Result] = []
+
+    def is_selected(self, *names: str) -> bool:
+        return any(self.select is None or self.select in name for name in names)
+
+    def measure(
+        self,
+        name: str,
+        func: t.Callable[[], t.Any],
+        setup: t.Optional[t.Callable[[], t.Any]] = None,
+    ) -> None:
+        """
+        Measure the duration of `func` over multiple runs. Peak memory allocation is
+        measured in a separate run, because tracing allocations slows down execution.
+        """
+        if not self.is_selected(name):
+            return
+        durations = []
+        with quiet():
+            for _ in range(self.repeat):
+                if setup:
+                    setup()
+                start = time.perf_counter()
+                func()
+                durations.append(time.perf_counter() - start)
+            if setup:
+                setup()
+            tracemalloc.start()
+            try:
+                func()
+                _current, memory = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        self.add(Result(name, durations, memory))
+
+    def measure_command(
+        self, name: str, command: list[str], environment: dict[str, str]
+    ) -> None:
+        """
+        Measure the duration of a command that runs in a subprocess. Peak memory is the
+        maximum resident set size of the subprocess.
+
+        Commands are started from a minimal Python process: otherwise, the resident set
+        size of the benchmark process would be accounted to the subprocess, which is
+        forked from it.
+        """
+        if not self.is_selected(name):
+            return
+        durations = []
+        memory = 0
+        for _ in range(self.repeat):
+            output = subprocess.check_output(
+                [sys.executable, "-S", "-c", MEASURE_COMMAND, *command],
+                env={**os.environ, **environment},
+                text=True,
+            )
+            returncode, duration, maxrss = output.split()
+            if returncode != "0":
+                raise RuntimeError(f"Command failed: {' '.join(command)}")
+            durations.append(float(duration))
+            memory = max(memory, int(maxrss))
+        self.add(Result(name, durations, memory))
+
+    def add(self, result: Result) -> None:
+        self.results.append(result)
+        print(
+            f"{result.name:<45}{result.min * 1000:>10.2f}{result.median * 1000:>12.2f}"
+            f"{result.memory / 1024:>14.0f}"
+        )
+
+    @staticmethod
+    def print_header() -> None:
+        print(
+            f"{'benchmark':<45}{'min (ms)':>10}{'median (ms)':>12}{'memory (KiB)':>14}"
+        )
+
+
+@contextmanager
+def quiet() -> t.Iterator[None]:
+    """
+    Discard the output of Tutor functions.
+    """
+    with redirect_stdout(io.StringIO()), redirect_stderr(io.StringIO()):
+        yield
+
+
+@contextmanager
+def synthetic_project(runner: Runner) -> t.Iterator[str]:
+    """
+    Create a temporary project root with synthetic plugins. Plugins are loaded in the
+    current process, and they are also stored as yaml files in the "plugins" folder of
+    the project, such that they can be loaded by commands that run in subprocesses:
+
+        TUTOR_PLUGINS_ROOT=<root>/plugins tutor ...
+
+    Each plugin defines configuration defaults and all patches. Templates are evenly
+    distributed among plugins and each of them includes a patch.
+
+    Yield the project root. All hooks are cleared on exit.
+    """
+    with tempfile.TemporaryDirectory(prefix="tutor-benchmark-") as root:
+        names = [f"benchmark{p}" for p in range(runner.plugins)]
+        plugins_root = os.path.join(root, "plugins")
+        utils.ensure_directory_exists(plugins_root)
+        for p, name in enumerate(names):
+            templates_root = os.path.join(root, "templates", str(p))
+            data = plugin_data(runner, name, templates_root)
+            with open(
+                os.path.join(plugins_root, f"{name}.yml"), "w", encoding="utf-8"
+            ) as f:
+                serialize.dump(data, f)
+            for i in range(p, runner.templates, runner.plugins):
+                path = os.path.join(templates_root, name, "apps", f"template{i}.yml")
+                utils.ensure_file_directory_exists(path)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(template_content(runner, name, i))
+        with hooks.Contexts.PLUGINS.enter():
+            with contexts.enter(CONTEXT):
+                for name in names:
+                    with open(
+                        os.path.join(plugins_root, f"{name}.yml"), encoding="utf-8"
+                    ) as f:
+                        DictPlugin(serialize.load(f))
+                plugins.load_all(names)
+        try:
+            yield root
+        finally:
+            for name in names:
+                hooks.Actions.PLUGIN_UNLOADED.do(name, root, {})
+            hooks.clear_all(context=CONTEXT)
+
+
+def plugin_data(runner: Runner, name: str, templates_root: str) -> dict[str, t.Any]:
+    prefix = name.upper()
+    return {
+        "name": name,
+        "version": "1.0.0",
+        "config": {
+            "defaults": {
+                f"SETTING{s}": f"{{{{ LMS_HOST }}}}/{name}/{s}" for s in range(10)
+            },
+        },
+        "patches": {
+            f"benchmark-patch-{i}": f"# {name}\n{name}: {{{{ {prefix}_SETTING{i % 10} }}}}"
+            for i in range(runner.patches)
+        },
+        "templates": templates_root,
+    }
+
+
+def template_content(runner: Runner, name: str, index: int) -> str:
+    prefix = name.upper()
+    patch_name = f"benchmark-patch-{index % max(runner.patches, 1)}"
+    return f"""# Template {index}
+lms: {{{{ LMS_HOST }}}}
+setting: {{{{ {prefix}_SETTING0 }}}}
+{{% if ENABLE_HTTPS %}}https: true{{% endif %}}
+{{% for i in range(20) %}}
+item{{{{ i }}}}: {{{{ {prefix}_SETTING1 }}}}/{{{{ i }}}}
+{{% endfor %}}
+{{{{ patch("{patch_name}") }}}}
+"""
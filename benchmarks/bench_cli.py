@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import os
+import sys
+
+from tutor import config as tutor_config
+from tutor import env
+
+from .base import Runner, quiet, synthetic_project
+
+MAIN = "from tutor.commands.cli import main; main()"
+
+
+def run(runner: Runner) -> None:
+    if not runner.is_selected("cli."):
+        return
+    with synthetic_project(runner) as root:
+        with quiet():
+            config = tutor_config.load_minimal(root)
+            tutor_config.save_enabled_plugins(config)
+            tutor_config.save_config_file(root, config)
+            env.save(root, tutor_config.load_full(root))
+        environment = {
+            "TUTOR_ROOT": root,
+            "TUTOR_PLUGINS_ROOT": os.path.join(root, "plugins"),
+            "TUTOR_IGNORE_ENTRYPOINT_PLUGINS": "1",
+        }
+        runner.measure_command(
+            "cli.version", [sys.executable, "-c", MAIN, "--version"], environment
+        )
+        runner.measure_command(
+            "cli.help", [sys.executable, "-c", MAIN, "--help"], environment
+        )
+        runner.measure_command(
+            "cli.completion",
+            [sys.executable, "-c", MAIN],
+            {
+                **environment,
+                "_TUTOR_COMPLETE": "bash_complete",
+                "COMP_WORDS": "tutor config printv",
+                "COMP_CWORD": "2",
+            },
+        )
+        runner.measure_command(
+            "cli.config.printvalue",
+            [sys.executable, "-c", MAIN, "config", "printvalue", "LMS_HOST"],
+            environment,
+        )
+        runner.measure_command(
+            "cli.images.printtag",
+            [sys.executable, "-c", MAIN, "images", "printtag", "openedx"],
+            environment,
+        )
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from tutor import config as tutor_config
+
+from .base import Runner, quiet, synthetic_project
+
+
+def run(runner: Runner) -> None:
+    if not runner.is_selected("config."):
+        return
+    with synthetic_project(runner) as root:
+        with quiet():
+            tutor_config.save_config_file(root, tutor_config.load_minimal(root))
+        runner.measure("config.load_minimal", lambda: tutor_config.load_minimal(root))
+        runner.measure("config.load_full", lambda: tutor_config.load_full(root))
+        runner.measure("config.load_lazy", lambda: tutor_config.load_lazy(root))
+
+        def render_full() -> None:
+            config = tutor_config.get_user(root)
+            tutor_config.update_with_base(config)
+            tutor_config.update_with_defaults(config)
+            tutor_config.render_full(config)
+
+        runner.measure("config.render_full", render_full)
+
+        tutor_config.enable_cache()
+        try:
+            tutor_config.load_full(root)
+            runner.measure(
+                "config.load_full (cached)", lambda: tutor_config.load_full(root)
+            )
+        finally:
+            tutor_config.enable_cache(False)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from tutor import config as tutor_config
+from tutor import env
+
+from .base import Runner, quiet, synthetic_project
+
+
+def run(runner: Runner) -> None:
+    if not runner.is_selected("env."):
+        return
+    with synthetic_project(runner) as root:
+        with quiet():
+            tutor_config.save_config_file(root, tutor_config.load_minimal(root))
+            config = tutor_config.load_full(root)
+
+        runner.measure(
+            "env.save",
+            lambda: env.save(root, config),
+            setup=lambda: env.delete_env_dir(root),
+        )
+        runner.measure(
+            "env.save (4 jobs)",
+            lambda: env.save(root, config, jobs=4),
+            setup=lambda: env.delete_env_dir(root),
+        )
+        # The environment and its manifest were generated by the previous benchmark
+        runner.measure(
+            "env.save (incremental, unchanged)",
+            lambda: env.save(root, config, incremental=True),
+        )
+
+        renderer = env.Renderer(config)
+        templates = list(renderer.iter_templates_in("benchmark"))
+        runner.measure(
+            "env.Renderer.render_template",
+            lambda: [renderer.render_template(name) for name in templates],
+        )
+        runner.measure(
+            "env.Renderer.patch",
+            lambda: [
+                renderer.patch(f"benchmark-patch-{i}") for i in range(runner.patches)
+            ],
+            setup=renderer.rendered_patches.clear,
+        )
+        runner.measure(
+            "env.Renderer.patch (rendered)",
+            lambda: [
+                renderer.patch(f"benchmark-patch-{i}") for i in range(runner.patches)
+            ],
+        )
+        runner.measure(
+            "env.Renderer.iter_templates_in",
+            lambda: [
+                list(renderer.iter_templates_in(prefix))
+                for prefix in ["apps", "build", "k8s", "local", "dev", "benchmark"]
+            ],
+        )
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import typing as t
+
+from tutor.core.hooks import Action, Filter
+
+from .base import Runner
+
+CALLBACKS = 1000
+
+
+def run(runner: Runner) -> None:
+    # Filters that are populated with static items, such as most Tutor filters
+    items_filter: Filter[list[int], []] = Filter()
+    for i in range(CALLBACKS):
+        items_filter.add_item(i, priority=i % 20)
+    runner.measure(
+        f"hooks.Filter.apply ({CALLBACKS} items)", lambda: items_filter.apply([])
+    )
+
+    # Filters with callback functions
+    func_filter: Filter[int, []] = Filter()
+    for _ in range(CALLBACKS):
+        func_filter.add()(increment)
+    runner.measure(
+        f"hooks.Filter.apply ({CALLBACKS} functions)", lambda: func_filter.apply(0)
+    )
+
+    action: Action[[int]] = Action()
+    for _ in range(CALLBACKS):
+        action.add()(noop)
+    runner.measure(f"hooks.Action.do ({CALLBACKS} callbacks)", lambda: action.do(0))
+
+    def add_items() -> None:
+        new_filter: Filter[list[int], []] = Filter()
+        for i in range(CALLBACKS):
+            new_filter.add_item(i, priority=i % 20)
+
+    runner.measure(f"hooks.Filter.add_item ({CALLBACKS} items)", add_items)
+
+
+def increment(value: int) -> int:
+    return value + 1
+
+
+def noop(*_args: t.Any) -> None:
+    pass
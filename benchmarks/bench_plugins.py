@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import functools
+import os
+import tempfile
+
+from tutor import hooks, plugins
+from tutor.core.hooks import contexts
+from tutor.plugins import base
+from tutor.plugins.v0 import DictPlugin
+
+from .base import CONTEXT, Runner
+
+# Number of patches of each plugin in the plugins.load_all benchmarks
+PATCHES = 200
+
+
+def run(runner: Runner) -> None:
+    if not runner.is_selected("plugins."):
+        return
+
+    def discover() -> None:
+        list(base.iter_entrypoints("tutor.plugin.v0"))
+        list(base.iter_entrypoints("tutor.plugin.v1"))
+        list(base.iter_plugins_root("*.yml"))
+        list(base.iter_plugins_root("*.py"))
+
+    def clear_cache() -> None:
+        # Reload the cache from disk
+        base.enable_discovery_cache()
+
+    runner.measure("plugins.discover", discover)
+
+    cache_path = base.DISCOVERY_CACHE_PATH
+    with tempfile.TemporaryDirectory(prefix="tutor-benchmark-") as root:
+        base.DISCOVERY_CACHE_PATH = os.path.join(root, "plugins.json")
+        try:
+            base.enable_discovery_cache()
+            discover()
+            runner.measure("plugins.discover (cached)", discover, setup=clear_cache)
+        finally:
+            base.enable_discovery_cache(False)
+            base.DISCOVERY_CACHE_PATH = cache_path
+
+    for count in [25, 50, 100]:
+        runner.measure(
+            f"plugins.load_all ({count} plugins, {PATCHES} patches)",
+            functools.partial(load_plugins, count),
+            setup=unload_plugins,
+        )
+    unload_plugins()
+
+
+def load_plugins(count: int) -> None:
+    names = [f"benchmark{p}" for p in range(count)]
+    with contexts.enter(CONTEXT):
+        for name in names:
+            DictPlugin(
+                {
+                    "name": name,
+                    "patches": {
+                        f"benchmark-patch-{i}": f"{name}: {i}" for i in range(PATCHES)
+                    },
+                }
+            )
+        plugins.load_all(names)
+
+
+def unload_plugins() -> None:
+    for name in list(plugins.iter_loaded()):
+        if name.startswith("benchmark"):
+            hooks.Actions.PLUGIN_UNLOADED.do(name, "", {})
+    hooks.clear_all(context=CONTEXT)
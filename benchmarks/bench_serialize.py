@@ -0,0 +1,60 @@
+"""
+Compare the libyaml-based and pure-Python yaml loaders/dumpers on the files that Tutor
+parses most often: the configuration and the Kubernetes manifests.
+"""
+
+from __future__ import annotations
+
+import yaml
+
+from tutor import config as tutor_config
+from tutor import env, serialize
+
+from .base import Runner
+
+
+def run(runner: Runner) -> None:
+    if not runner.is_selected("serialize."):
+        return
+    config = tutor_config.load_defaults()
+    tutor_config.update_with_base(config)
+    tutor_config.render_full(config)
+    manifests = "\n---\n".join(
+        str(env.render_file(config, "k8s", name))
+        for name in ["deployments.yml", "jobs.yml", "services.yml", "volumes.yml"]
+    )
+    documents = list(serialize.load_all(manifests))
+    config_yaml = serialize.dumps(config)
+
+    runner.measure(
+        "serialize.load config (pure)",
+        lambda: yaml.load(config_yaml, Loader=yaml.SafeLoader),
+    )
+    runner.measure("serialize.load config", lambda: serialize.load(config_yaml))
+    runner.measure(
+        "serialize.dumps config (pure)",
+        lambda: yaml.dump(config, default_flow_style=False, allow_unicode=True),
+    )
+    runner.measure("serialize.dumps config", lambda: serialize.dumps(config))
+    runner.measure(
+        "serialize.load_all manifests (pure)",
+        lambda: list(yaml.load_all(manifests, Loader=yaml.SafeLoader)),
+    )
+    runner.measure(
+        "serialize.load_all manifests", lambda: list(serialize.load_all(manifests))
+    )
+    runner.measure(
+        "serialize.dump_all manifests (pure)",
+        lambda: yaml.safe_dump_all(
+            documents, default_flow_style=False, allow_unicode=True
+        ),
+    )
+    runner.measure(
+        "serialize.dump_all manifests",
+        lambda: yaml.dump_all(
+            documents,
+            Dumper=serialize.SafeDumper,
+            default_flow_style=False,
+            allow_unicode=True,
+        ),
+    )
@@ -1,5 +1,9 @@
+import os
+import subprocess
+import sys
 import unittest
 
+from tests.helpers import temporary_root
 from tutor.__about__ import __version__
 
 from .base import TestCommandMixin
@@ -21,3 +25,47 @@ class CliTests(unittest.TestCase, TestCommandMixin):
         self.assertEqual(0, result.exit_code)
         self.assertIsNone(result.exception)
         self.assertRegex(result.output, rf"cli, version {__version__}\n")
+
+    def test_cli_help_lists_lazy_commands(self) -> None:
+        result = self.invoke(["--help"])
+        for name in ["config", "dev", "images", "k8s", "local", "mounts", "plugins"]:
+            self.assertIn(f"  {name} ", result.output)
+
+    def test_cli_lazy_imports(self) -> None:
+        # Run in a separate interpreter, because other tests import all modules
+        output = subprocess.check_output(
+            [
+                sys.executable,
+                "-c",
+                "import sys; import tutor.commands.cli; "
+                "print('tutor.commands.k8s' in sys.modules, 'Crypto' in sys.modules)",
+            ],
+            text=True,
+        )
+        self.assertEqual("False False\n", output)
+
+    def test_cli_lazy_commands_in_same_process(self) -> None:
+        # Run in a separate interpreter, where the "local" command is not imported yet
+        script = """
+import sys
+from click.testing import CliRunner
+from tutor import hooks
+from tutor.commands.cli import cli
+
+hooks.Actions.CORE_READY.do()
+runner = CliRunner(env={"TUTOR_ROOT": sys.argv[1]})
+for args in [["config", "save"], ["local", "do", "--help"]]:
+    result = runner.invoke(cli, args)
+    print(result.exit_code, "init" in result.output)
+"""
+        with temporary_root() as root:
+            output = subprocess.check_output(
+                [sys.executable, "-c", script, root],
+                text=True,
+                env={
+                    **os.environ,
+                    "TUTOR_IGNORE_ENTRYPOINT_PLUGINS": "1",
+                    "TUTOR_IGNORE_DICT_PLUGINS": "1",
+                },
+            )
+        self.assertEqual(["0 False", "0 True"], output.splitlines())
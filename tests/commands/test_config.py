@@ -1,3 +1,4 @@
+import os
 import unittest
 
 from tests.helpers import temporary_root
@@ -65,6 +66,28 @@ class ConfigTests(unittest.TestCase, TestCommandMixin):
         self.assertEqual(0, result.exit_code)
         self.assertTrue(result.output)
 
+    def test_config_deps(self) -> None:
+        with temporary_root() as root:
+            self.invoke_in_root(root, ["config", "save"])
+            result = self.invoke_in_root(
+                root, ["config", "deps", "apps/caddy/Caddyfile"]
+            )
+            self.assertEqual(0, result.exit_code)
+            self.assertIn("LMS_HOST", result.output)
+            self.assertIn("caddyfile", result.output)
+
+            result = self.invoke_in_root(root, ["config", "deps", "--key", "LMS_HOST"])
+            self.assertEqual(0, result.exit_code)
+            self.assertIn("apps/caddy/Caddyfile", result.output)
+            self.assertNotIn("apps/redis/redis.conf", result.output)
+
+    def test_config_deps_without_manifest(self) -> None:
+        with temporary_root() as root:
+            self.invoke_in_root(root, ["config", "save"])
+            os.remove(os.path.join(root, "env", ".manifest.json"))
+            result = self.invoke_in_root(root, ["config", "deps", "--key", "LMS_HOST"])
+        self.assertEqual(1, result.exit_code)
+
     def test_config_append(self) -> None:
         with temporary_root() as root:
             self.invoke_in_root(
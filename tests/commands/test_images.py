@@ -1,7 +1,8 @@
+import json
 from unittest.mock import Mock, patch
 
 from tests.helpers import PluginsTestCase, temporary_root
-from tutor import images, plugins
+from tutor import exceptions, hooks, images, parallel, plugins
 from tutor.__about__ import __version__
 from tutor.commands.images import ImageNotFoundError
 
@@ -51,6 +52,23 @@ class ImagesTests(PluginsTestCase, TestCommandMixin):
         # Note: we should update this tag whenever the mysql image is updated
         image_pull.assert_called_once_with("docker.io/mysql:8.4.0")
 
+    @patch.object(images, "get_size", return_value=2000000)
+    @patch.object(images, "pull")
+    def test_images_pull_jobs(self, image_pull: Mock, _get_size: Mock) -> None:
+        def pull(tag: str, prefix: str = "") -> None:
+            if tag.startswith("docker.io/redis"):
+                raise exceptions.TutorError("pull failed")
+
+        image_pull.side_effect = pull
+        result = self.invoke(["images", "pull", "--jobs=3", "mysql", "redis", "mysql"])
+        self.assertIsInstance(result.exception, parallel.TasksFailedError)
+        self.assertEqual(1, result.exit_code)
+        # All images are pulled, even after a failure
+        self.assertEqual(2, image_pull.call_count)
+        self.assertIn("[docker.io/mysql:8.4.0] ", str(image_pull.call_args_list))
+        self.assertIn("docker.io/mysql:8.4.0: 0.0s, 2.0 MB", result.output)
+        self.assertRegex(result.output, r"docker.io/redis:.*: failed after")
+
     def test_images_printtag_image(self) -> None:
         result = self.invoke(["images", "printtag", "openedx"])
         self.assertIsNone(result.exception)
@@ -151,6 +169,101 @@ class ImagesTests(PluginsTestCase, TestCommandMixin):
             list(image_build.call_args[0][1:]),
         )
 
+    @patch.object(images, "get_context_hash_label", return_value="hash")
+    @patch.object(images, "get_context_hash", return_value="hash")
+    @patch.object(images, "build", return_value=None)
+    def test_images_build_unchanged(
+        self, image_build: Mock, _get_hash: Mock, _get_label: Mock
+    ) -> None:
+        with temporary_root() as root:
+            self.invoke_in_root(root, ["config", "save"])
+            result = self.invoke_in_root(
+                root, ["images", "build", "--skip-unchanged", "openedx"]
+            )
+            self.assertEqual(0, result.exit_code)
+            self.assertIn("is up-to-date, skipping build", result.output)
+            image_build.assert_not_called()
+
+            # Images are always built by default
+            result = self.invoke_in_root(root, ["images", "build", "openedx"])
+            self.assertEqual(0, result.exit_code)
+            image_build.assert_called_once()
+            # The context hash is computed only with --skip-unchanged
+            _get_hash.assert_called_once()
+
+    @patch.object(images, "get_context_hash_label", return_value=None)
+    @patch.object(images, "build", return_value=None)
+    def test_images_build_plan(self, image_build: Mock, _get_label: Mock) -> None:
+        plugins.v0.DictPlugin(
+            {
+                "name": "plugin1",
+                "hooks": {
+                    "build-image": {
+                        "service1": "service1:1.0.0",
+                        "service2": "service2:2.0.0",
+                    }
+                },
+            }
+        )
+        plugins.load("plugin1")
+        hooks.Filters.IMAGES_BUILD_DEPENDENCIES.add_item(("service1", "service2"))
+        with temporary_root() as root:
+            self.invoke_in_root(root, ["config", "save"])
+            result = self.invoke_in_root(
+                root,
+                [
+                    "images",
+                    "build",
+                    "--plan",
+                    "--cache-to-registry",
+                    "service1",
+                    "service2",
+                ],
+            )
+        self.assertIsNone(result.exception)
+        self.assertEqual(0, result.exit_code)
+        image_build.assert_not_called()
+        plan = json.loads(result.output)
+        self.assertEqual(["service2", "service1"], [image["name"] for image in plan])
+        self.assertEqual(["service2"], plan[1]["dependencies"])
+        self.assertEqual(
+            ["type=registry,ref=service1:1.0.0-cache"], plan[1]["cache_from"]
+        )
+        self.assertEqual(
+            ["type=registry,mode=max,ref=service1:1.0.0-cache,image-manifest=true"],
+            plan[1]["cache_to"],
+        )
+        self.assertIsNone(plan[1]["changed"])
+
+    @patch.object(images, "build", return_value=None)
+    def test_images_build_jobs(self, image_build: Mock) -> None:
+        plugins.v0.DictPlugin(
+            {
+                "name": "plugin1",
+                "hooks": {
+                    "build-image": {
+                        "service1": "service1:1.0.0",
+                        "service2": "service2:2.0.0",
+                    }
+                },
+            }
+        )
+        plugins.load("plugin1")
+        hooks.Filters.IMAGES_BUILD_DEPENDENCIES.add_item(("service1", "service2"))
+        with temporary_root() as root:
+            self.invoke_in_root(root, ["config", "save"])
+            result = self.invoke_in_root(
+                root, ["images", "build", "--jobs=2", "service1", "service2"]
+            )
+        self.assertIsNone(result.exception)
+        self.assertEqual(0, result.exit_code)
+        # service1 is built after service2
+        self.assertEqual(
+            ["service2:2.0.0", "service1:1.0.0"],
+            [call[0][1] for call in image_build.call_args_list],
+        )
+        self.assertEqual("[service1] ", image_build.call_args.kwargs["prefix"])
+
     def test_images_push(self) -> None:
         result = self.invoke(["images", "push"])
         self.assertIsNone(result.exception)
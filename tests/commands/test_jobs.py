@@ -3,7 +3,15 @@ import tempfile
 import unittest
 from unittest.mock import patch
 
-from tests.helpers import PluginsTestCase, temporary_root
+import click
+
+from tests.helpers import (
+    PluginsTestCase,
+    TestContext,
+    TestTaskRunner,
+    temporary_root,
+)
+from tutor import hooks, utils
 from tutor.commands import jobs
 from tutor.commands.jobs_utils import load_env_file, parse_test_env_var
 from tutor.exceptions import TutorError
@@ -20,6 +28,86 @@ class JobsTests(PluginsTestCase, TestCommandMixin):
             self.assertEqual(0, result.exit_code)
             self.assertIn("All services initialised.", result.output)
 
+    def test_initialise_jobs(self) -> None:
+        hooks.Filters.CLI_DO_INIT_TASKS.add_items(
+            [("myservice", "echo hello"), ("myservice", "echo world")]
+        )
+        hooks.Filters.CLI_DO_INIT_TASKS_DEPENDENCIES.add_item(("myservice", ()))
+        count = len(list(hooks.Filters.CLI_DO_INIT_TASKS.iterate()))
+        prefixes: list[str] = []
+
+        def docker_compose(*_command: str) -> int:
+            prefixes.append(utils._OUTPUT.prefix)
+            return 0
+
+        with temporary_root() as root:
+            self.invoke_in_root(root, ["config", "save"])
+            with patch("tutor.utils.docker_compose", side_effect=docker_compose):
+                result = self.invoke_in_root(root, ["local", "do", "init", "-j", "2"])
+        self.assertIsNone(result.exception)
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(count, len(prefixes))
+        # Tasks from the same service run in order
+        self.assertEqual(
+            [f"[myservice ({count - 1}/{count})] ", f"[myservice ({count}/{count})] "],
+            [prefix for prefix in prefixes if prefix.startswith("[myservice")],
+        )
+        self.assertIn("All services initialised.", result.output)
+
+    def test_initialise_batch(self) -> None:
+        hooks.Filters.CLI_DO_INIT_TASKS.add_items(
+            [("myservice", "echo hello"), ("myservice", "echo world")]
+        )
+        with temporary_root() as root:
+            self.invoke_in_root(root, ["config", "save"])
+            with patch("tutor.utils.docker_compose") as mock_docker_compose:
+                result = self.invoke_in_root(root, ["local", "do", "init", "--batch"])
+        self.assertIsNone(result.exception)
+        self.assertEqual(0, result.exit_code)
+        # Both tasks run in the same container
+        dc_args, _dc_kwargs = mock_docker_compose.call_args
+        self.assertIn("myservice-job", dc_args)
+        self.assertIn("Task 2/2", dc_args[-1])
+        self.assertIn("echo world", dc_args[-1])
+        self.assertIn("All services initialised.", result.output)
+
+    def test_do_command_params_dont_change_scheduling(self) -> None:
+        # A plugin "do" command with options that have the same names as the options
+        # of "do init"
+        command = click.Command(name="mytasks")
+        with temporary_root() as root:
+            self.invoke_in_root(root, ["config", "save"])
+            click_context = click.Context(command, obj=TestContext(root))
+            click_context.params = {"jobs": 2, "batch": True, "skip_unchanged": True}
+            with click_context:
+                with patch.object(
+                    TestTaskRunner, "run_task", return_value=0
+                ) as mock_run_task:
+                    jobs.do_callback(
+                        [("myservice", "echo hello"), ("myservice", "echo world")]
+                    )
+            # Tasks are neither batched nor recorded
+            self.assertEqual(2, mock_run_task.call_count)
+            self.assertFalse(os.path.exists(os.path.join(root, "data", "tasks.json")))
+
+    def test_get_task_dependencies(self) -> None:
+        names = ["db", "app1", "other", "app2", "undeclared", "last"]
+        services = ["db", "app", "other", "app", "undeclared", "last"]
+        hooks.Filters.CLI_DO_INIT_TASKS_DEPENDENCIES.add_items(
+            [("db", ()), ("app", ("db",)), ("other", ()), ("last", ("app",))]
+        )
+        self.assertEqual(
+            {
+                "db": [],
+                "app1": ["db"],
+                "other": [],
+                "app2": ["db", "app1"],
+                "undeclared": ["db", "app1", "other", "app2"],
+                "last": ["app1", "app2", "undeclared"],
+            },
+            jobs.get_task_dependencies(names, services),
+        )
+
     def test_create_user_template_without_staff(self) -> None:
         command = jobs.create_user_template(
             "superuser", False, "username", "email", "p4ssw0rd"
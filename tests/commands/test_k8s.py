@@ -1,4 +1,13 @@
+import typing as t
 import unittest
+from time import monotonic
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from urllib3.exceptions import ReadTimeoutError
+
+from tutor.commands.k8s import K8sClients, K8sTaskRunner
+from tutor.exceptions import TutorError
 
 from .base import TestCommandMixin
 
@@ -8,3 +17,155 @@ class K8sTests(unittest.TestCase, TestCommandMixin):
         result = self.invoke(["k8s", "--help"])
         self.assertIsNone(result.exception)
         self.assertEqual(0, result.exit_code)
+
+    def test_wait_for_job(self) -> None:
+        clients = MagicMock()
+        batch_api = clients.batch_api
+        core_api = clients.core_api
+        # Pods and jobs are listed first, and then watched
+        core_api.list_namespaced_pod.side_effect = [
+            make_list(),
+            make_list(make_pod("pod1", "Failed"), make_pod("pod2", "Pending")),
+        ]
+        batch_api.read_namespaced_job.return_value = make_job("job", active=1)
+        batch_api.list_namespaced_job.side_effect = [
+            make_list(make_job("job", active=1)),
+            make_list(make_job("job", failed=1)),
+        ]
+        streams: dict[t.Any, list[list[t.Any]]] = {
+            core_api.list_namespaced_pod: [
+                # Pods are watched until they start
+                [
+                    event("ADDED", make_pod("pod1", "Pending")),
+                    None,
+                    event("MODIFIED", make_pod("pod1", "Running")),
+                ],
+                [event("MODIFIED", make_pod("pod2", "Running"))],
+            ],
+            core_api.read_namespaced_pod_log: [["hello"], ["world"]],
+            batch_api.list_namespaced_job: [
+                # The first pod failed and the job is retried
+                [event("MODIFIED", make_job("job", active=1, failed=1))],
+                [event("MODIFIED", make_job("job", failed=1, conditions=["Complete"]))],
+            ],
+        }
+        clients.watch.return_value.stream.side_effect = lambda func, *_args, **_kwargs: (
+            iter(streams[func].pop(0))
+        )
+
+        runner = K8sTaskRunner("/tmp/root", {"K8S_NAMESPACE": "openedx"})
+        with patch.object(K8sClients, "instance", return_value=clients):
+            with patch("tutor.utils.echo_output") as mock_echo_output:
+                runner.wait_for_job("job", None)
+        self.assertEqual(
+            ["hello", "world"],
+            [call.args[0] for call in mock_echo_output.call_args_list],
+        )
+        self.assertEqual(
+            ["pod1", "pod2"],
+            [
+                call.kwargs["name"]
+                for call in clients.watch.return_value.stream.call_args_list
+                if call.args[0] is core_api.read_namespaced_pod_log
+            ],
+        )
+
+    def test_wait_for_failed_job(self) -> None:
+        clients = MagicMock()
+        clients.core_api.list_namespaced_pod.return_value = make_list(
+            make_pod("pod", "Failed")
+        )
+        clients.batch_api.list_namespaced_job.return_value = make_list(
+            make_job("job", failed=2, conditions=["Failed"])
+        )
+        clients.watch.return_value.stream.return_value = iter([])
+
+        runner = K8sTaskRunner("/tmp/root", {"K8S_NAMESPACE": "openedx"})
+        with patch.object(K8sClients, "instance", return_value=clients):
+            with self.assertRaises(TutorError) as context:
+                runner.wait_for_job("job", None)
+        self.assertIn("Job job failed", context.exception.args[0])
+
+    def test_wait_for_job_failed_before_pod_start(self) -> None:
+        clients = MagicMock()
+        clients.core_api.list_namespaced_pod.return_value = make_list(
+            make_pod("pod", "Pending")
+        )
+        clients.batch_api.read_namespaced_job.return_value = make_job(
+            "job", failed=1, conditions=["Failed"]
+        )
+
+        runner = K8sTaskRunner("/tmp/root", {"K8S_NAMESPACE": "openedx"})
+        with patch.object(K8sClients, "instance", return_value=clients):
+            with self.assertRaises(TutorError) as context:
+                runner.wait_for_job("job", None)
+        self.assertIn("Job job failed", context.exception.args[0])
+        clients.watch.assert_not_called()
+
+    def test_wait_for_hanging_pod(self) -> None:
+        clients = MagicMock()
+        clients.core_api.list_namespaced_pod.return_value = make_list(
+            make_pod("pod", "Running")
+        )
+
+        def stream_logs(*_args: t.Any, **kwargs: t.Any) -> t.Iterator[str]:
+            # The pod prints nothing until the request times out
+            self.assertLessEqual(kwargs["_request_timeout"], 10)
+            raise ReadTimeoutError(None, "", "Read timed out")  # type: ignore[arg-type]
+            yield ""
+
+        clients.watch.return_value.stream.side_effect = stream_logs
+
+        runner = K8sTaskRunner("/tmp/root", {"K8S_NAMESPACE": "openedx"})
+        with patch.object(K8sClients, "instance", return_value=clients):
+            with self.assertRaises(TutorError) as context:
+                runner.wait_for_job("job", monotonic() + 10)
+        self.assertIn("K8S_JOBS_TIMEOUT", context.exception.args[0])
+
+    def test_wait_for_job_timeout(self) -> None:
+        clients = MagicMock()
+        clients.core_api.list_namespaced_pod.return_value = make_list()
+
+        runner = K8sTaskRunner(
+            "/tmp/root", {"K8S_NAMESPACE": "openedx", "K8S_JOBS_TIMEOUT": 10}
+        )
+        deadline = runner.get_deadline()
+        assert deadline is not None
+        self.assertGreater(deadline, monotonic())
+        with patch.object(K8sClients, "instance", return_value=clients):
+            with self.assertRaises(TutorError) as context:
+                runner.wait_for_job("job", monotonic() - 1)
+        self.assertIn("K8S_JOBS_TIMEOUT", context.exception.args[0])
+        clients.watch.assert_not_called()
+
+
+def make_list(*items: t.Any) -> t.Any:
+    return SimpleNamespace(
+        items=list(items), metadata=SimpleNamespace(resource_version="1")
+    )
+
+
+def make_pod(name: str, phase: str) -> t.Any:
+    return SimpleNamespace(
+        metadata=SimpleNamespace(name=name), status=SimpleNamespace(phase=phase)
+    )
+
+
+def make_job(
+    name: str, active: int = 0, failed: int = 0, conditions: t.Iterable[str] = ()
+) -> t.Any:
+    return SimpleNamespace(
+        metadata=SimpleNamespace(name=name),
+        status=SimpleNamespace(
+            active=active,
+            failed=failed,
+            conditions=[
+                SimpleNamespace(type=condition, status="True")
+                for condition in conditions
+            ],
+        ),
+    )
+
+
+def event(event_type: str, item: t.Any) -> dict[str, t.Any]:
+    return {"type": event_type, "object": item}
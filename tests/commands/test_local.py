@@ -5,6 +5,10 @@ import unittest
 from unittest.mock import patch
 
 from tests.helpers import temporary_root
+from tutor import images as tutor_images
+from tutor.commands import compose
+from tutor.commands.local import LocalTaskRunner
+from tutor.types import Config
 
 from .base import TestCommandMixin
 
@@ -25,6 +29,90 @@ class LocalTests(unittest.TestCase, TestCommandMixin):
         self.assertIsNone(result.exception)
         self.assertEqual(0, result.exit_code)
 
+    def test_warm_job_container(self) -> None:
+        with temporary_root() as root:
+            config: Config = {
+                "LOCAL_PROJECT_NAME": "tutor_local",
+                "COMPOSE_WARM_JOBS": True,
+            }
+            runner = LocalTaskRunner(root, config)
+            compose_path = os.path.join(root, "env", "local", "docker-compose.yml")
+            os.makedirs(os.path.dirname(compose_path))
+            with open(compose_path, "w", encoding="utf-8") as f:
+                f.write("image: openedx:1")
+            fingerprint = runner.get_job_fingerprint("lms")
+            with patch("tutor.utils.docker_compose") as mock_docker_compose:
+                with patch("tutor.utils.docker") as mock_docker:
+                    # The container is started on first use
+                    with patch.object(compose, "inspect_container", return_value=None):
+                        runner.run_task("lms", "echo hello")
+                    run_args = mock_docker_compose.call_args[0]
+                    self.assertIn("--detach", run_args)
+                    self.assertIn("--name=tutor_local-lms-job-warm", run_args)
+                    self.assertIn(
+                        f"--label={compose.WARM_JOB_LABEL}={fingerprint}", run_args
+                    )
+                    exec_args = mock_docker.call_args[0]
+                    self.assertEqual("exec", exec_args[0])
+                    self.assertIn("tutor_local-lms-job-warm", exec_args)
+                    self.assertIn("sh -e -c 'echo hello'", exec_args[-1])
+
+                    # The container is reused
+                    mock_docker_compose.reset_mock()
+                    with patch.object(
+                        compose, "inspect_container", return_value=fingerprint
+                    ):
+                        runner.run_task("lms", "echo hello")
+                    mock_docker_compose.assert_not_called()
+
+                    # The container is replaced when the environment changes
+                    with open(compose_path, "w", encoding="utf-8") as f:
+                        f.write("image: openedx:2")
+                    with patch.object(
+                        compose, "inspect_container", return_value=fingerprint
+                    ):
+                        runner.run_task("lms", "echo hello")
+                    mock_docker.assert_any_call(
+                        "rm", "--force", "tutor_local-lms-job-warm"
+                    )
+                    mock_docker_compose.assert_called_once()
+
+    def test_warm_job_container_image_change(self) -> None:
+        with temporary_root() as root:
+            config: Config = {
+                "LOCAL_PROJECT_NAME": "tutor_local",
+                "COMPOSE_WARM_JOBS": True,
+            }
+            runner = LocalTaskRunner(root, config)
+            jobs_path = os.path.join(root, "env", "local", "docker-compose.jobs.yml")
+            os.makedirs(os.path.dirname(jobs_path))
+            with open(jobs_path, "w", encoding="utf-8") as f:
+                f.write("services:\n  lms-job:\n    image: openedx:1\n")
+            with patch.object(tutor_images, "inspect", return_value="sha256:1"):
+                fingerprint = runner.get_job_fingerprint("lms")
+
+            with patch("tutor.utils.docker_compose") as mock_docker_compose:
+                with patch("tutor.utils.docker") as mock_docker:
+                    with patch.object(
+                        compose, "inspect_container", return_value=fingerprint
+                    ):
+                        # The container is reused while the image is the same
+                        with patch.object(
+                            tutor_images, "inspect", return_value="sha256:1"
+                        ):
+                            runner.run_task("lms", "echo hello")
+                        mock_docker_compose.assert_not_called()
+
+                        # The image was rebuilt with the same tag
+                        with patch.object(
+                            tutor_images, "inspect", return_value="sha256:2"
+                        ):
+                            runner.run_task("lms", "echo hello")
+                    mock_docker.assert_any_call(
+                        "rm", "--force", "tutor_local-lms-job-warm"
+                    )
+                    mock_docker_compose.assert_called_once()
+
     def test_copyfrom(self) -> None:
         with temporary_root() as root:
             with tempfile.TemporaryDirectory() as directory:
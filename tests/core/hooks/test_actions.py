@@ -57,3 +57,16 @@ class PluginActionsTests(unittest.TestCase):
         self.side_effect_int = 4
         action.do()
         self.assertEqual(4, self.side_effect_int)
+
+    def test_bulk_add(self) -> None:
+        action: actions.Action[[list[int]]] = actions.Action()
+        action.add(priority=20)(lambda values: values.append(20))
+        action.add(priority=10)(lambda values: values.append(10))
+        with action.bulk_add():
+            action.add(priority=20)(lambda values: values.append(21))
+            action.add(priority=5)(lambda values: values.append(5))
+            action.add(priority=10)(lambda values: values.append(11))
+
+        values: list[int] = []
+        action.do(values)
+        self.assertEqual([5, 10, 11, 20, 21], values)
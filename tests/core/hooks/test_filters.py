@@ -59,3 +59,63 @@ class PluginFiltersTests(unittest.TestCase):
         self.assertEqual([1, 2], filtre.apply([]))
         filtre.clear(context="testcontext")
         self.assertEqual([2], filtre.apply([]))
+
+    def test_compile(self) -> None:
+        filtre: filters.Filter[list[int], []] = filters.Filter()
+        filtre.add_item(1)
+        filtre.add_items([2, 3])
+
+        @filtre.add()
+        def filter1(values: list[int]) -> list[int]:
+            return values + [len(values)]
+
+        filtre.add_item(4)
+        filtre.add_item(5)
+
+        # Static items are merged
+        self.assertEqual(3, len(filtre.compile()))
+        self.assertEqual([1, 2, 3, 3, 4, 5], filtre.apply([]))
+        self.assertEqual([0, 1, 2, 3, 4, 4, 5], filtre.apply([0]))
+
+    def test_compile_is_reset(self) -> None:
+        filtre: filters.Filter[list[int], []] = filters.Filter()
+        filtre.add_item(1)
+        self.assertEqual([1], list(filtre.iterate()))
+        with contexts.enter("testcontext"):
+            filtre.add_item(2, priority=1)
+        self.assertEqual([2, 1], list(filtre.iterate()))
+        filtre.clear(context="testcontext")
+        self.assertEqual([1], list(filtre.iterate()))
+
+    def test_apply_does_not_modify_value(self) -> None:
+        filtre: filters.Filter[list[int], []] = filters.Filter()
+        filtre.add_items([1, 2])
+        value = [0]
+        self.assertEqual([0, 1, 2], filtre.apply(value))
+        self.assertEqual([0], value)
+        # Items returned by the filter can be modified
+        filtre.apply([]).append(3)
+        self.assertEqual([1, 2], list(filtre.iterate()))
+
+    def test_priorities(self) -> None:
+        filtre: filters.Filter[list[int], []] = filters.Filter()
+        for value, priority in [(1, 20), (2, 10), (3, 30), (4, 10), (5, 20), (6, 5)]:
+            filtre.add_item(value, priority=priority)
+        self.assertEqual([6, 2, 4, 1, 5, 3], filtre.apply([]))
+
+    def test_bulk_add(self) -> None:
+        items = [(1, 20), (2, 10), (3, 30), (4, 10), (5, 20), (6, 5), (7, 10)]
+        filtre1: filters.Filter[list[int], []] = filters.Filter()
+        filtre2: filters.Filter[list[int], []] = filters.Filter()
+        filtre1.add_item(0, priority=20)
+        filtre2.add_item(0, priority=20)
+        for value, priority in items:
+            filtre1.add_item(value, priority=priority)
+        with filtre2.bulk_add():
+            with filtre2.bulk_add():
+                for value, priority in items:
+                    filtre2.add_item(value, priority=priority)
+
+        # Bulk addition gives the same results as adding items one by one
+        self.assertEqual(filtre1.apply([]), filtre2.apply([]))
+        self.assertEqual([6, 2, 4, 7, 0, 1, 5, 3], filtre2.apply([]))
@@ -7,7 +7,7 @@ import click
 
 from tests.helpers import PluginsTestCase, temporary_root
 from tutor import config as tutor_config
-from tutor import fmt, hooks, interactive, utils
+from tutor import exceptions, fmt, hooks, interactive, utils
 from tutor.types import Config, get_typed
 
 
@@ -55,6 +55,89 @@ class ConfigTests(unittest.TestCase):
         self.assertEqual("local.openedx.io", config["LMS_HOST"])
         self.assertEqual("studio.local.openedx.io", config["CMS_HOST"])
 
+    def test_render_full_out_of_order(self) -> None:
+        config: Config = {"X": "{{ Y }}/x", "Y": "{{ Z }}/y", "Z": "z"}
+        tutor_config.render_full(config)
+        self.assertEqual({"X": "z/y/x", "Y": "z/y", "Z": "z"}, config)
+
+    def test_lazy_config(self) -> None:
+        config: Config = {"X": "{{ Y }}", "Y": "{{ 8|random_string }}", "Z": "{{ W }}"}
+        lazy_config = tutor_config.LazyConfig(config)
+        x = lazy_config["X"]
+        self.assertEqual(x, lazy_config["Y"])
+        self.assertEqual({"X": x, "Y": x}, lazy_config.rendered)
+        self.assertIn("Z", lazy_config)
+        self.assertEqual(["X", "Y", "Z"], list(lazy_config))
+        self.assertRaises(KeyError, lambda: lazy_config["W"])
+
+    def test_lazy_config_circular_reference(self) -> None:
+        config: Config = {"X": "{{ Y }}", "Y": "{{ Z }}", "Z": "{{ X }}"}
+        lazy_config = tutor_config.LazyConfig(config)
+        with self.assertRaises(exceptions.TutorError) as e:
+            lazy_config["X"]
+        self.assertIn(
+            "Circular reference in configuration: X -> Y -> Z -> X", str(e.exception)
+        )
+        # The config object can still be used after a failure
+        self.assertRaises(exceptions.TutorError, lambda: lazy_config["Y"])
+
+    def test_lazy_config_missing_value(self) -> None:
+        lazy_config = tutor_config.LazyConfig({"X": "{{ Y }}", "Y": "{{ Z }}"})
+        with self.assertRaises(exceptions.TutorError) as e:
+            lazy_config["X"]
+        self.assertEqual(
+            "Error rendering configuration entry X -> Y: Missing configuration value: 'Z' is undefined",
+            str(e.exception),
+        )
+
+    @patch.object(fmt, "echo")
+    def test_load_full_from_cache(self, _: Mock) -> None:
+        tutor_config.enable_cache()
+        self.addCleanup(tutor_config.enable_cache, False)
+        with temporary_root() as root:
+            tutor_config.save_config_file(root, tutor_config.load_minimal(root))
+            config1 = tutor_config.load_full(root)
+            self.assertTrue(
+                os.path.exists(
+                    os.path.join(root, ".cache", tutor_config.CACHE_FILENAME)
+                )
+            )
+            with patch.object(tutor_config, "get_defaults") as get_defaults:
+                config2 = tutor_config.load_full(root)
+                get_defaults.assert_not_called()
+            self.assertEqual(config1, config2)
+
+            # Cache is invalidated by environment variables
+            with patch.dict(os.environ, {"TUTOR_LMS_HOST": "lms.example.com"}):
+                self.assertEqual(
+                    "lms.example.com", tutor_config.load_full(root)["LMS_HOST"]
+                )
+
+            # Cache is invalidated by changes to config.yml
+            config2["LMS_HOST"] = "lms2.example.com"
+            tutor_config.save_config_file(root, config2)
+            self.assertEqual(
+                "lms2.example.com", tutor_config.load_full(root)["LMS_HOST"]
+            )
+
+    @patch.object(fmt, "echo")
+    def test_load_full_from_cache_after_hooks_change(self, _: Mock) -> None:
+        tutor_config.enable_cache()
+        self.addCleanup(tutor_config.enable_cache, False)
+        with temporary_root() as root:
+            tutor_config.save_config_file(root, tutor_config.load_minimal(root))
+            self.assertEqual("mysql", tutor_config.load_full(root)["MYSQL_HOST"])
+            self.assertEqual("mysql", tutor_config.load_full(root)["MYSQL_HOST"])
+
+            # This is what the upgrade commands do
+            context = hooks.Contexts.app("mysql-8.1")
+            with context.enter():
+                hooks.Filters.CONFIG_DEFAULTS.add_item(("MYSQL_HOST", "mysql-8.1"))
+            self.assertEqual("mysql-8.1", tutor_config.load_full(root)["MYSQL_HOST"])
+
+            hooks.Filters.CONFIG_DEFAULTS.clear(context=context.name)
+            self.assertEqual("mysql", tutor_config.load_full(root)["MYSQL_HOST"])
+
     def test_is_service_activated(self) -> None:
         config: Config = {"RUN_SERVICE1": True, "RUN_SERVICE2": False}
         self.assertTrue(tutor_config.is_service_activated(config, "service1"))
@@ -6,7 +6,7 @@ from unittest.mock import Mock, patch
 
 from tests.helpers import PluginsTestCase, temporary_root
 from tutor import config as tutor_config
-from tutor import env, exceptions, fmt, plugins
+from tutor import env, exceptions, fmt, hooks, plugins
 from tutor.__about__ import __version__
 from tutor.plugins.v0 import DictPlugin
 from tutor.types import Config
@@ -25,6 +25,35 @@ class EnvTests(PluginsTestCase):
         self.assertIn(template_name, renderer.environment.loader.list_templates())
         self.assertNotIn(template_name, templates)
 
+    def test_iter_templates_in(self) -> None:
+        renderer = env.Renderer()
+        expected = [
+            template
+            for template in renderer.environment.loader.list_templates()
+            if template.startswith("apps/openedx") and env.is_rendered(template)
+        ]
+        self.assertEqual(expected, list(renderer.iter_templates_in("apps", "openedx")))
+        self.assertEqual([], list(renderer.iter_templates_in("doesnotexist")))
+
+    def test_iter_templates_in_with_plugin_patterns(self) -> None:
+        with tempfile.TemporaryDirectory() as plugin_templates:
+            for name in ["included.txt", "ignored.txt"]:
+                path = os.path.join(plugin_templates, "plugin1", "partials", name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write("some content")
+            DictPlugin({"name": "plugin1", "templates": plugin_templates})
+            self.assertEqual([], list(env.Renderer().iter_templates_in("plugin1")))
+
+            # Index and patterns are updated when the plugin is loaded
+            with hooks.Contexts.app("plugin1").enter():
+                hooks.Filters.ENV_PATTERNS_INCLUDE.add_item(r".*/included.txt$")
+            plugins.load("plugin1")
+            self.assertEqual(
+                ["plugin1/partials/included.txt"],
+                list(env.Renderer().iter_templates_in("plugin1")),
+            )
+
     def test_files_are_rendered(self) -> None:
         self.assertTrue(env.is_rendered("some/file"))
         self.assertFalse(env.is_rendered(".git"))
@@ -66,6 +95,67 @@ class EnvTests(PluginsTestCase):
         self.assertEqual({"x": "ac"}, env.render_unknown(config, {"x": "{{ var1 }}c"}))
         self.assertEqual(["x", "ac"], env.render_unknown(config, ["x", "{{ var1 }}c"]))
 
+    def test_render_str_without_markup(self) -> None:
+        self.assertEqual("value", env.render_str({}, "value"))
+        self.assertEqual("value", env.render_str({}, "value\n"))
+        self.assertEqual("value\n", env.render_str({}, "value\n\n"))
+
+    def test_get_renderer(self) -> None:
+        config1: Config = {"name": "world"}
+        config2: Config = {"name": "world"}
+        renderer = env.get_renderer(config1)
+        self.assertIs(renderer, env.get_renderer(config1))
+        self.assertIsNot(renderer, env.get_renderer(config2))
+        # Changes to the config are visible to the shared renderer
+        config2["name"] = "you"
+        self.assertEqual("hello you", env.render_str(config2, "hello {{ name }}"))
+
+    def test_get_renderer_after_template_hooks_change(self) -> None:
+        config: Config = {}
+        renderer = env.get_renderer(config)
+        context = hooks.Contexts.app("test-renderer")
+        with context.enter():
+            hooks.Filters.ENV_TEMPLATE_VARIABLES.add_item(("name", "world"))
+            hooks.Filters.ENV_TEMPLATE_FILTERS.add_item(("shout", str.upper))
+        self.assertIsNot(renderer, env.get_renderer(config))
+        self.assertEqual(
+            "hello WORLD", env.render_str(config, "hello {{ name|shout }}")
+        )
+        hooks.Filters.ENV_TEMPLATE_VARIABLES.clear(context=context.name)
+        hooks.Filters.ENV_TEMPLATE_FILTERS.clear(context=context.name)
+        self.assertRaises(
+            exceptions.TutorError, env.render_str, config, "hello {{ name }}"
+        )
+
+    def test_random_filters_are_not_frozen(self) -> None:
+        renderer = env.get_renderer({})
+        values = {renderer.render_str("{{ 32|random_string }}") for _ in range(3)}
+        self.assertEqual(3, len(values))
+
+    def test_bytecode_cache(self) -> None:
+        with temporary_root() as root:
+            cache_dir = env.cache_path(root, "jinja2")
+            with patch.object(env, "_BYTECODE_CACHE", env.BytecodeCache(root)):
+                environment = env.JinjaEnvironment()
+                template = environment.compile_str("hello {{ name }}")
+                self.assertIs(template, environment.compile_str("hello {{ name }}"))
+                self.assertEqual(1, len(os.listdir(cache_dir)))
+                # Compiled templates are loaded from the cache by other environments
+                self.assertEqual(
+                    "hello world",
+                    env.JinjaEnvironment()
+                    .compile_str("hello {{ name }}")
+                    .render(name="world"),
+                )
+
+    def test_bytecode_cache_removed_root(self) -> None:
+        with temporary_root() as root:
+            bytecode_cache = env.BytecodeCache(root)
+        with patch.object(env, "_BYTECODE_CACHE", bytecode_cache):
+            env.JinjaEnvironment().compile_str("hello {{ name }}")
+        # Cache directories are not created inside removed project roots
+        self.assertFalse(os.path.exists(root))
+
     def test_common_domain(self) -> None:
         self.assertEqual(
             "mydomain.com",
@@ -117,6 +207,93 @@ class EnvTests(PluginsTestCase):
                 ) as f:
                     self.assertIn("local.openedx.io{$default_site_port}", f.read())
 
+    def test_save_incremental(self) -> None:
+        with temporary_root() as root:
+            config = tutor_config.load_full(root)
+            with patch.object(fmt, "STDOUT"):
+                env.save(root, config)
+            self.assertTrue(os.path.exists(env.pathjoin(root, env.MANIFEST_FILENAME)))
+
+            # Nothing changed: nothing is written
+            with patch.object(fmt, "STDOUT"):
+                with patch.object(env, "write_to", wraps=env.write_to) as mock_write:
+                    env.save(root, config, incremental=True)
+            written = [call.args[1] for call in mock_write.call_args_list]
+            self.assertEqual([env.pathjoin(root, env.MANIFEST_FILENAME)], written)
+
+            # Only files that depend on the modified setting are re-rendered
+            config["LMS_HOST"] = "new.lms.host"
+            with patch.object(fmt, "STDOUT"):
+                with patch.object(env, "write_to", wraps=env.write_to) as mock_write:
+                    env.save(root, config, incremental=True)
+            written = [call.args[1] for call in mock_write.call_args_list]
+            caddyfile = env.pathjoin(root, "apps", "caddy", "Caddyfile")
+            self.assertIn(caddyfile, written)
+            self.assertNotIn(env.pathjoin(root, "apps", "redis", "redis.conf"), written)
+            with open(caddyfile, encoding="utf-8") as f:
+                self.assertIn("new.lms.host", f.read())
+
+    def test_save_incremental_modified_file(self) -> None:
+        with temporary_root() as root:
+            config = tutor_config.load_full(root)
+            with patch.object(fmt, "STDOUT"):
+                env.save(root, config)
+            path = env.pathjoin(root, "apps", "redis", "redis.conf")
+            with open(path, encoding="utf-8") as f:
+                original = f.read()
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("modified")
+            with patch.object(fmt, "STDOUT"):
+                env.save(root, config, incremental=True)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(original, f.read())
+
+    def test_save_parallel(self) -> None:
+        with temporary_root() as root1, temporary_root() as root2:
+            config = tutor_config.load_full(root1)
+            with patch.object(fmt, "STDOUT"):
+                env.save(root1, config)
+                env.save(root2, config, jobs=3)
+            base_dir1 = env.base_dir(root1)
+            base_dir2 = env.base_dir(root2)
+            paths = []
+            for dirpath, _dirnames, filenames in os.walk(base_dir1):
+                for filename in filenames:
+                    paths.append(
+                        os.path.relpath(os.path.join(dirpath, filename), base_dir1)
+                    )
+            self.assertIn(os.path.join("local", "docker-compose.yml"), paths)
+            for path in paths:
+                with open(os.path.join(base_dir1, path), "rb") as f1:
+                    with open(os.path.join(base_dir2, path), "rb") as f2:
+                        self.assertEqual(f1.read(), f2.read(), path)
+
+    def test_track_dependencies(self) -> None:
+        config: Config = {}
+        tutor_config.update_with_base(config)
+        tutor_config.update_with_defaults(config)
+        tutor_config.render_full(config)
+        renderer = env.Renderer(config)
+        with renderer.track_dependencies() as dependencies:
+            renderer.render_template("apps/openedx/settings/lms/production.py")
+        self.assertIn("LMS_HOST", dependencies.variables)
+        self.assertIn("openedx-lms-production-settings", dependencies.patches)
+        self.assertIn(
+            "apps/openedx/settings/partials/common_lms.py", dependencies.templates
+        )
+
+    def test_dependency_renderer(self) -> None:
+        config: Config = {}
+        tutor_config.update_with_base(config)
+        tutor_config.update_with_defaults(config)
+        tutor_config.render_full(config)
+        renderer = env.DependencyRenderer(config)
+        dependencies = renderer.get_dependencies("apps/caddy/Caddyfile")
+        self.assertIn("LMS_HOST", dependencies.variables)
+        # Template globals are not config values
+        self.assertNotIn("patch", dependencies.variables)
+        self.assertIn("caddyfile-lms", dependencies.patches)
+
     def test_patch(self) -> None:
         patches = {"plugin1": "abcd", "plugin2": "efgh"}
         with patch.object(
@@ -134,6 +311,29 @@ class EnvTests(PluginsTestCase):
             )
         self.assertEqual("abcd,\nefgh,", rendered)
 
+    def test_patch_is_rendered_once(self) -> None:
+        renderer = env.Renderer({"name": "world"})
+        with patch.object(
+            plugins, "iter_patches", return_value=["hello {{ name }}"]
+        ) as mock_iter_patches:
+            rendered1 = renderer.render_str('{{ patch("location") }}')
+            with renderer.track_dependencies() as dependencies2:
+                rendered2 = renderer.render_str('1 {{ patch("location") }}')
+            renderer.render_str('{{ patch("location", suffix="!") }}')
+        self.assertEqual("hello world", rendered1)
+        self.assertEqual("1 hello world", rendered2)
+        self.assertEqual(2, mock_iter_patches.call_count)
+        # Inputs of the patch are recorded even if it is not rendered again
+        self.assertEqual({"location"}, dependencies2.patches)
+        self.assertIn("name", dependencies2.variables)
+
+    def test_shared_renderer_patch_after_config_change(self) -> None:
+        config: Config = {"name": "world"}
+        with patch.object(plugins, "iter_patches", return_value=["{{ name }}"]):
+            self.assertEqual("world", env.render_str(config, '{{ patch("p") }}'))
+            config["name"] = "you"
+            self.assertEqual("you", env.render_str(config, '{{ patch("p") }}'))
+
     def test_plugin_templates(self) -> None:
         with tempfile.TemporaryDirectory() as plugin_templates:
             DictPlugin(
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+
+from tutor import hooks
+from tutor.core.hooks import Filter
+from tutor.hooks import profiling
+
+
+class HooksProfilerTests(unittest.TestCase):
+    def test_profiler(self) -> None:
+        filtre: Filter[list[int], []] = Filter()
+
+        @filtre.add()
+        def _add_one(values: list[int]) -> list[int]:
+            return values + [1]
+
+        with hooks.Contexts.app("myplugin").enter():
+            filtre.add_item(2)
+
+        with tempfile.TemporaryDirectory() as root:
+            trace_path = os.path.join(root, "trace.json")
+            profiler = profiling.HooksProfiler(trace_path=trace_path)
+            profiler.start()
+            try:
+                filtre.apply([])
+                filtre.apply([])
+            finally:
+                profiler.stop()
+            # Hooks are no longer profiled
+            filtre.apply([])
+            profiler.save(trace_path)
+            with open(trace_path, encoding="utf-8") as f:
+                events = json.load(f)["traceEvents"]
+
+        stats = sorted(profiler.iter_stats(), key=lambda s: s.plugin)
+        self.assertEqual(2, len(stats))
+        self.assertEqual(2, stats[0].calls)
+        self.assertIn("_add_one", stats[0].callback)
+        self.assertEqual("", stats[0].plugin)
+        self.assertEqual("<1 items>", stats[1].callback)
+        self.assertEqual("myplugin", stats[1].plugin)
+        self.assertEqual(4, len(events))
+        self.assertEqual("X", events[0]["ph"])
+        self.assertIn("_add_one", profiler.report())
+
+    def test_merged_items_are_shared(self) -> None:
+        filtre: Filter[list[int], []] = Filter()
+        with hooks.Contexts.app("plugin1").enter():
+            filtre.add_item(1)
+        with hooks.Contexts.app("plugin2").enter():
+            filtre.add_item(2)
+
+        profiler = profiling.HooksProfiler()
+        profiler.start()
+        try:
+            self.assertEqual([1, 2], filtre.apply([]))
+        finally:
+            profiler.stop()
+
+        stats = list(profiler.iter_stats())
+        self.assertEqual(1, len(stats))
+        self.assertEqual("<2 items>", stats[0].callback)
+        self.assertEqual("plugin1,plugin2", stats[0].plugin)
+
+    def test_catalog_hook_names(self) -> None:
+        profiler = profiling.HooksProfiler()
+        self.assertEqual(
+            "Filters.ENV_PATCHES", profiler.get_hook_name(hooks.Filters.ENV_PATCHES)
+        )
+        self.assertEqual(
+            "Actions.CORE_READY", profiler.get_hook_name(hooks.Actions.CORE_READY)
+        )
@@ -0,0 +1,51 @@
+import os
+import tempfile
+
+from tests.helpers import PluginsTestCase
+from tutor import hooks, images
+
+
+class ImagesTests(PluginsTestCase):
+    def test_get_context_hash(self) -> None:
+        with tempfile.TemporaryDirectory() as root:
+            context = os.path.join(root, "context")
+            mount = os.path.join(root, "mount")
+            os.makedirs(os.path.join(context, "sub"))
+            os.makedirs(mount)
+            with open(os.path.join(context, "sub", "Dockerfile"), "w") as f:
+                f.write("FROM scratch")
+            with open(os.path.join(mount, "file.py"), "w") as f:
+                f.write("print(1)")
+
+            def get_hash(*args: str) -> str:
+                return images.get_context_hash(context, "image:1", args, [mount])
+
+            initial = get_hash("--target=production")
+            self.assertEqual(initial, get_hash("--target=production"))
+            # Cache arguments don't modify the image
+            self.assertEqual(
+                initial,
+                get_hash("--target=production", "--cache-from=type=registry,ref=x"),
+            )
+            self.assertNotEqual(initial, get_hash("--target=development"))
+
+            # Change the build context
+            with open(os.path.join(context, "sub", "Dockerfile"), "w") as f:
+                f.write("FROM alpine")
+            updated = get_hash("--target=production")
+            self.assertNotEqual(initial, updated)
+
+            # Change the mounted directory
+            os.utime(os.path.join(mount, "file.py"), ns=(0, 0))
+            self.assertNotEqual(updated, get_hash("--target=production"))
+
+            # Dependency and version control directories are ignored
+            updated = get_hash("--target=production")
+            os.makedirs(os.path.join(mount, "node_modules"))
+            with open(os.path.join(mount, "node_modules", "lib.js"), "w") as f:
+                f.write("")
+            self.assertEqual(updated, get_hash("--target=production"))
+
+            # Changes to the build command are detected
+            hooks.Filters.DOCKER_BUILD_COMMAND.add_item("--pull")
+            self.assertNotEqual(updated, get_hash("--target=production"))
@@ -0,0 +1,63 @@
+import functools
+import threading
+import unittest
+
+from tutor import exceptions, parallel
+
+
+class ParallelTests(unittest.TestCase):
+    def test_sort(self) -> None:
+        self.assertEqual(
+            ["b", "a", "c"],
+            parallel.sort(["a", "b", "c"], {"a": {"b"}, "b": set(), "c": set()}),
+        )
+        with self.assertRaises(exceptions.TutorError) as e:
+            parallel.sort(["a", "b"], {"a": {"b"}, "b": {"a"}})
+        self.assertIn("a -> b -> a", str(e.exception))
+
+    def test_run_sequential(self) -> None:
+        calls: list[str] = []
+        parallel.run(
+            [(name, functools.partial(calls.append, name)) for name in "abc"],
+            dependencies={"a": ["c"], "b": ["missing"]},
+        )
+        self.assertEqual(["c", "a", "b"], calls)
+
+    def test_run_concurrently(self) -> None:
+        # "a" and "b" can only complete if they run at the same time
+        barrier = threading.Barrier(2, timeout=5)
+        calls: list[str] = []
+
+        def task(name: str) -> None:
+            if name in "ab":
+                barrier.wait()
+            calls.append(name)
+
+        parallel.run(
+            [(name, functools.partial(task, name)) for name in "abc"],
+            dependencies={"c": ["a", "b"]},
+            jobs=2,
+        )
+        self.assertEqual("c", calls[-1])
+
+    def test_run_failure(self) -> None:
+        calls: list[str] = []
+
+        def fail() -> None:
+            raise exceptions.TutorError("failed")
+
+        tasks = [
+            ("a", fail),
+            ("b", lambda: calls.append("b")),
+            ("c", lambda: calls.append("c")),
+        ]
+        with self.assertRaises(parallel.TasksFailedError) as e:
+            parallel.run(tasks, dependencies={"c": ["a"]}, jobs=2, fail_fast=False)
+        self.assertEqual(["b"], calls)
+        self.assertEqual({"a", "c"}, set(e.exception.errors))
+
+        calls.clear()
+        with self.assertRaises(parallel.TasksFailedError) as e:
+            parallel.run(tasks, dependencies={"b": ["a"], "c": ["a"]}, jobs=2)
+        self.assertEqual([], calls)
+        self.assertEqual(["a"], list(e.exception.errors))
@@ -1,7 +1,18 @@
 from __future__ import annotations
 
+import os
+import shutil
+import sys
+import tempfile
+import typing as t
+import unittest
+from unittest.mock import patch
+
+import importlib_metadata
+
 from tests.helpers import PluginsTestCase
 from tutor import hooks, plugins
+from tutor.plugins import base
 
 
 class PluginsTests(PluginsTestCase):
@@ -14,3 +25,76 @@ class PluginsTests(PluginsTestCase):
         hooks.Actions.PLUGIN_LOADED.do("dummyplugin")
 
         self.assertEqual(["hello!"], list(plugins.iter_patches("mypatch")))
+
+
+class DiscoveryCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root = tempfile.mkdtemp(prefix="tutor-test-discovery-")
+        self.addCleanup(shutil.rmtree, self.root)
+        self.site_packages = os.path.join(self.root, "site-packages")
+        self.plugins_root = os.path.join(self.root, "plugins")
+        os.makedirs(self.plugins_root)
+        self.add_distribution("plugin1")
+        patchers: list[t.Any] = [
+            patch.object(sys, "path", [self.site_packages, *sys.path]),
+            patch.object(base, "PLUGINS_ROOT", self.plugins_root),
+            patch.object(
+                base,
+                "DISCOVERY_CACHE_PATH",
+                os.path.join(self.root, "cache", "plugins.json"),
+            ),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        base.enable_discovery_cache()
+        self.addCleanup(base.enable_discovery_cache, False)
+
+    def add_distribution(self, name: str) -> None:
+        path = os.path.join(self.site_packages, f"{name}-1.0.dist-info")
+        os.makedirs(path)
+        with open(os.path.join(path, "METADATA"), "w", encoding="utf-8") as f:
+            f.write(f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n")
+        with open(os.path.join(path, "entry_points.txt"), "w", encoding="utf-8") as f:
+            f.write(f"[tutor.plugin.v1]\n{name} = {name}.plugin\n")
+
+    def discover(self) -> list[tuple[str, str, str]]:
+        return [
+            (entrypoint.name, entrypoint.value, entrypoint.dist.version)
+            for entrypoint in base.iter_entrypoints("tutor.plugin.v1")
+            # Ignore actual installed plugins
+            if entrypoint.dist and entrypoint.name in ["plugin1", "plugin2"]
+        ]
+
+    def test_iter_entrypoints(self) -> None:
+        self.assertEqual([("plugin1", "plugin1.plugin", "1.0")], self.discover())
+        self.assertTrue(os.path.exists(base.DISCOVERY_CACHE_PATH))
+
+        # Cached entrypoints are loaded from disk in the next process
+        base.enable_discovery_cache()
+        with patch.object(importlib_metadata, "entry_points") as entry_points:
+            self.assertEqual([("plugin1", "plugin1.plugin", "1.0")], self.discover())
+        entry_points.assert_not_called()
+
+    def test_iter_entrypoints_new_distribution(self) -> None:
+        self.discover()
+        self.add_distribution("plugin2")
+        base.enable_discovery_cache()
+        self.assertEqual(
+            [
+                ("plugin1", "plugin1.plugin", "1.0"),
+                ("plugin2", "plugin2.plugin", "1.0"),
+            ],
+            sorted(self.discover()),
+        )
+
+    def test_iter_plugins_root(self) -> None:
+        self.assertEqual([], list(base.iter_plugins_root("*.yml")))
+        for name in ["myplugin.yml", "myplugin.py", ".hidden.yml"]:
+            with open(os.path.join(self.plugins_root, name), "w", encoding="utf-8"):
+                pass
+        base.enable_discovery_cache()
+        self.assertEqual(
+            [os.path.join(self.plugins_root, "myplugin.yml")],
+            list(base.iter_plugins_root("*.yml")),
+        )
@@ -1,6 +1,10 @@
+import tempfile
 import unittest
 
-from tutor import serialize
+import yaml
+
+from tutor import config as tutor_config
+from tutor import env, serialize
 
 
 class SerializeTests(unittest.TestCase):
@@ -59,3 +63,69 @@ class SerializeTests(unittest.TestCase):
         self.assertEqual(None, serialize.load(serialize.str_format(None)))
         self.assertEqual("éü©", serialize.load(serialize.str_format("éü©")))
         self.assertEqual([1, "abcd"], serialize.load(serialize.str_format([1, "abcd"])))
+
+
+@unittest.skipIf(not yaml.__with_libyaml__, "libyaml is not available")
+class LibyamlSerializeTests(unittest.TestCase):
+    """
+    Check that the libyaml-based classes produce the same results as the pure-Python
+    ones.
+    """
+
+    def test_config_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="tutor-test-root-") as root:
+            config = tutor_config.load_full(root)
+        dumped = serialize.dumps(config)
+        self.assertEqual(
+            yaml.dump(config, default_flow_style=False, allow_unicode=True), dumped
+        )
+        self.assertEqual(
+            yaml.load(dumped, Loader=yaml.SafeLoader), serialize.load(dumped)
+        )
+        self.assertEqual(config, serialize.load(dumped))
+
+    def test_manifests_round_trip(self) -> None:
+        config = tutor_config.load_defaults()
+        tutor_config.update_with_base(config)
+        tutor_config.render_full(config)
+        for name in ["deployments.yml", "jobs.yml", "services.yml", "volumes.yml"]:
+            manifests = str(env.render_file(config, "k8s", name))
+            documents = list(serialize.load_all(manifests))
+            self.assertEqual(
+                list(yaml.load_all(manifests, Loader=yaml.SafeLoader)), documents
+            )
+            with tempfile.TemporaryFile("w+", encoding="utf-8") as f:
+                serialize.dump_all(documents, f)
+                f.seek(0)
+                dumped = f.read()
+            self.assertEqual(
+                yaml.safe_dump_all(
+                    documents, default_flow_style=False, allow_unicode=True
+                ),
+                dumped,
+            )
+
+    def test_unicode_round_trip(self) -> None:
+        content = {"key": "éü©", "items": ["ñ", "日本語"]}
+        dumped = serialize.dumps(content)
+        self.assertEqual(
+            yaml.dump(content, default_flow_style=False, allow_unicode=True), dumped
+        )
+        self.assertIn("éü©", dumped)
+        self.assertEqual(content, serialize.load(dumped))
+
+    def test_scalars_round_trip(self) -> None:
+        for value in ["abc", "éü©", 1, 1.5, None, True, False]:
+            dumped = serialize.dumps(value)
+            # libyaml omits the "..." document end marker after top-level scalars
+            self.assertEqual(
+                yaml.dump(value, default_flow_style=False, allow_unicode=True)
+                .removesuffix("...\n")
+                .rstrip("\n"),
+                dumped.removesuffix("...\n").rstrip("\n"),
+            )
+            self.assertEqual(value, serialize.load(dumped))
+            self.assertEqual(value, serialize.parse(dumped))
+
+    def test_parse_errors(self) -> None:
+        self.assertEqual("a: b: c", serialize.parse("a: b: c"))
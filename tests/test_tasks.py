@@ -0,0 +1,55 @@
+import subprocess
+import unittest
+
+from tests.helpers import temporary_root
+from tutor import tasks
+
+
+class TasksTests(unittest.TestCase):
+    def test_group_tasks(self) -> None:
+        self.assertEqual(
+            [("lms", ["echo 1", "echo 2"]), ("cms", ["echo 3"]), ("lms", ["echo 4"])],
+            tasks.group_tasks(
+                [
+                    ("lms", "echo 1"),
+                    ("lms", "echo 2"),
+                    ("cms", "echo 3"),
+                    ("lms", "echo 4"),
+                ]
+            ),
+        )
+
+    def test_batch_script(self) -> None:
+        script = tasks.get_batch_script(
+            ["echo 'hello'\nfalse\necho unreachable", "echo world"]
+        )
+        result = subprocess.run(
+            ["sh", "-e", "-c", script], capture_output=True, text=True, check=False
+        )
+        self.assertEqual(1, result.returncode)
+        self.assertEqual("===== Task 1/2 =====\nhello\n", result.stdout)
+        self.assertIn("Task 1/2 failed with status 1", result.stderr)
+
+        script = tasks.get_batch_script(["echo 'hello'", "exit 0", "echo world"])
+        result = subprocess.run(
+            ["sh", "-e", "-c", script], capture_output=True, text=True, check=False
+        )
+        self.assertEqual(0, result.returncode)
+        self.assertEqual(
+            "===== Task 1/3 =====\nhello\n===== Task 2/3 =====\n===== Task 3/3 =====\nworld\n",
+            result.stdout,
+        )
+
+    def test_ledger(self) -> None:
+        with temporary_root() as root:
+            ledger = tasks.TaskLedger(root)
+            self.assertIsNone(ledger.get_success("lms", "echo 1", "openedx:1"))
+            ledger.add_success("lms", "echo 1", "openedx:1")
+            self.assertIsNotNone(ledger.get_success("lms", "echo 1", "openedx:1"))
+
+            # The ledger is persisted
+            ledger = tasks.TaskLedger(root)
+            self.assertIsNotNone(ledger.get_success("lms", "echo 1", "openedx:1"))
+            self.assertIsNone(ledger.get_success("lms", "echo 1", "openedx:2"))
+            self.assertIsNone(ledger.get_success("cms", "echo 1", "openedx:1"))
+            self.assertIsNone(ledger.get_success("lms", "echo 2", "openedx:1"))
@@ -0,0 +1,108 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from tutor import trace, utils
+
+
+class TraceTests(unittest.TestCase):
+    def tearDown(self) -> None:
+        trace._TRACER = None
+        super().tearDown()
+
+    def test_span_is_noop_when_not_started(self) -> None:
+        with trace.span("noop"):
+            pass
+        self.assertIsNone(trace._TRACER)
+
+    def test_span(self) -> None:
+        trace.start()
+        with self.assertRaises(ValueError):
+            with trace.span("failed", "test", arg=1):
+                raise ValueError
+
+        assert trace._TRACER is not None
+        event = trace._TRACER.events[0]
+        self.assertEqual("failed", event["name"])
+        self.assertEqual("test", event["cat"])
+        self.assertEqual("X", event["ph"])
+        self.assertEqual({"arg": 1}, event["args"])
+        self.assertGreaterEqual(event["dur"], 0)
+
+    def test_traced(self) -> None:
+        @trace.traced("add")
+        def add(a: int, b: int) -> int:
+            return a + b
+
+        trace.start()
+        self.assertEqual(3, add(1, 2))
+        assert trace._TRACER is not None
+        self.assertEqual(["add"], [e["name"] for e in trace._TRACER.events])
+
+    def test_subprocess_span(self) -> None:
+        trace.start()
+        utils.execute_silent(sys.executable, "-c", "#" + "x" * 200)
+        assert trace._TRACER is not None
+        event = trace._TRACER.events[0]
+        self.assertEqual("subprocess", event["cat"])
+        self.assertEqual(100, len(event["name"]))
+        self.assertIn("x" * 200, event["args"]["command"])
+
+    def test_stop_without_path(self) -> None:
+        trace.start()
+        with trace.span("discarded"):
+            pass
+        trace.stop()
+        self.assertIsNone(trace._TRACER)
+
+    def test_start_from_env(self) -> None:
+        with patch.dict(os.environ, {trace.ENV_VAR_NAME: ""}):
+            trace.start_from_env()
+        self.assertIsNone(trace._TRACER)
+        with patch.dict(os.environ, {trace.ENV_VAR_NAME: "trace.json"}):
+            trace.start_from_env()
+        assert trace._TRACER is not None
+        self.assertEqual("trace.json", trace._TRACER.path)
+
+    def test_cli_trace(self) -> None:
+        names = self.run_cli_trace(env_var=False)
+        # Spans that start before the command line is parsed are not recorded
+        self.assertNotIn("CORE_READY", names)
+        self.assertIn("PROJECT_ROOT_READY", names)
+
+    def test_cli_trace_from_env(self) -> None:
+        names = self.run_cli_trace(env_var=True)
+        self.assertIn("CORE_READY", names)
+        self.assertIn("PROJECT_ROOT_READY", names)
+        self.assertIn("cli", names)
+
+    def run_cli_trace(self, env_var: bool) -> list[str]:
+        with tempfile.TemporaryDirectory() as root:
+            path = os.path.join(root, "trace.json")
+            args = ["--root", root]
+            env = dict(os.environ)
+            env.pop(trace.ENV_VAR_NAME, None)
+            if env_var:
+                env[trace.ENV_VAR_NAME] = path
+            else:
+                args += ["--trace", path]
+            # Run in a separate interpreter, because the trace is written by main()
+            subprocess.check_output(
+                [
+                    sys.executable,
+                    "-c",
+                    "from tutor.commands.cli import main; main()",
+                    *args,
+                    "config",
+                    "printroot",
+                ],
+                env=env,
+                stderr=subprocess.DEVNULL,
+            )
+            with open(path, encoding="utf-8") as f:
+                events = json.load(f)["traceEvents"]
+        return [event["name"] for event in events]
@@ -1,5 +1,6 @@
 import base64
 import os
+import sys
 import tempfile
 import unittest
 from io import StringIO
@@ -176,6 +177,18 @@ class UtilsTests(unittest.TestCase):
         self.assertEqual(2, process.wait.call_count)
         process.kill.assert_called_once()
 
+    @patch("sys.stdout", new_callable=StringIO)
+    def test_execute_prefixed(self, mock_stdout: StringIO) -> None:
+        result = utils.execute_prefixed(
+            "[image] ", sys.executable, "-c", "print('a'); print('b')"
+        )
+        self.assertEqual(0, result)
+        self.assertEqual(
+            ["[image] a", "[image] b"], mock_stdout.getvalue().splitlines()[1:]
+        )
+        with self.assertRaises(exceptions.TutorError):
+            utils.execute_prefixed("[image] ", sys.executable, "-c", "exit(1)")
+
     @patch("sys.platform", "win32")
     def test_check_macos_docker_memory_win32_should_skip(self) -> None:
         utils.check_macos_docker_memory()
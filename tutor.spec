@@ -34,6 +34,14 @@ hidden_imports.append("Crypto.Random")
 hidden_imports.append("Crypto.Signature.PKCS1_v1_5")
 hidden_imports.append("kubernetes")
 hidden_imports.append("uuid")
+# Core commands are imported dynamically
+hidden_imports.append("tutor.commands.config")
+hidden_imports.append("tutor.commands.dev")
+hidden_imports.append("tutor.commands.images")
+hidden_imports.append("tutor.commands.k8s")
+hidden_imports.append("tutor.commands.local")
+hidden_imports.append("tutor.commands.mounts")
+hidden_imports.append("tutor.commands.plugins")
 
 
 # The following was initially generated with:
@@ -1,35 +1,49 @@
 from __future__ import annotations
 
+import importlib
 import sys
 import typing as t
 
 import appdirs
 import click
 
-from tutor import exceptions, fmt, hooks, utils
+from tutor import config as tutor_config
+from tutor import exceptions, fmt, hooks, trace, utils
 from tutor.__about__ import __app__, __version__
-from tutor.commands.config import config_command
+
+# Core "do" init tasks are declared on CORE_READY, so the jobs module can't be
+# imported lazily.
+from tutor.commands import jobs  # noqa: F401
 from tutor.commands.context import Context
-from tutor.commands.dev import dev
-from tutor.commands.images import images_command
-from tutor.commands.k8s import k8s
-from tutor.commands.local import local
-from tutor.commands.mounts import mounts_command
-from tutor.commands.plugins import plugins_command
+from tutor.core.hooks.contexts import Context as HooksContext
+from tutor.hooks import profiling
+from tutor.plugins.base import enable_discovery_cache
 
 
 def main() -> None:
     try:
+        profiling.start_from_env()
+        trace.start_from_env()
+        # Installed plugins don't change often: don't scan them every time
+        enable_discovery_cache()
         # Everyone on board
         # Note that this action should not be triggered in the module scope, because it
         # makes it difficult for tests to rollback changes.
-        hooks.Actions.CORE_READY.do()
-        cli()
+        with trace.span("CORE_READY", "hooks"):
+            hooks.Actions.CORE_READY.do()
+        # The configuration cache is invalidated whenever plugins are loaded or
+        # configuration hooks are modified (e.g. by upgrade commands)
+        tutor_config.enable_cache()
+        with trace.span("cli", "cli"):
+            cli()
     except KeyboardInterrupt:
         pass
     except exceptions.TutorError as e:
         fmt.echo_error(f"Error: {e.args[0]}")
         sys.exit(1)
+    finally:
+        profiling.stop()
+        trace.stop()
 
 
 class TutorCli(click.Group):
@@ -42,6 +56,28 @@ class TutorCli(click.Group):
     """
 
     IS_ROOT_READY = False
+    # Project root, once the PROJECT_ROOT_READY action was triggered
+    ROOT: t.Optional[str] = None
+
+    # Core commands are imported only when they are needed, because importing all of
+    # them makes the command line noticeably slower to start. Commands are loaded from
+    # "module:attribute" paths.
+    LAZY_COMMANDS = {
+        "config": "tutor.commands.config:config_command",
+        "dev": "tutor.commands.dev:dev",
+        "images": "tutor.commands.images:images_command",
+        "k8s": "tutor.commands.k8s:k8s",
+        "local": "tutor.commands.local:local",
+        "mounts": "tutor.commands.mounts:mounts_command",
+        "plugins": "tutor.commands.plugins:plugins_command",
+    }
+    # Modules that must be imported along with a lazy command, because they declare
+    # hooks which are triggered by this command. For instance: starting the local
+    # platform stops the dev platform, and vice versa.
+    LAZY_COMMANDS_REQUIRE = {
+        "dev": ["tutor.commands.local"],
+        "local": ["tutor.commands.dev"],
+    }
 
     def get_command(
         self, ctx: click.Context, cmd_name: str
@@ -49,6 +85,9 @@ class TutorCli(click.Group):
         """
         This is run when passing a command from the CLI. E.g: tutor config ...
         """
+        # Commands are imported before plugins are enabled, such that the
+        # PLUGINS_LOADED actions that they declare are triggered.
+        self.load_lazy_command(cmd_name)
         self.ensure_plugins_enabled(ctx)
         return super().get_command(ctx, cmd_name=cmd_name)
 
@@ -58,9 +97,41 @@ class TutorCli(click.Group):
         - shell autocompletion: tutor <tab>
         - print help: tutor, tutor -h
         """
+        for cmd_name in self.LAZY_COMMANDS:
+            self.load_lazy_command(cmd_name)
         self.ensure_plugins_enabled(ctx)
         return super().list_commands(ctx)
 
+    def load_lazy_command(self, cmd_name: str) -> None:
+        if cmd_name not in self.LAZY_COMMANDS or cmd_name in self.commands:
+            return
+        root_ready_callbacks = hooks.Actions.PROJECT_ROOT_READY.callbacks[:]
+        plugins_loaded_callbacks = hooks.Actions.PLUGINS_LOADED.callbacks[:]
+        # Modules are imported outside of any hook context, as if they were imported
+        # on startup. Otherwise, the hooks that they declare would be cleared along
+        # with the current context.
+        current_contexts = HooksContext.CURRENT[:]
+        HooksContext.CURRENT.clear()
+        try:
+            for module_name in self.LAZY_COMMANDS_REQUIRE.get(cmd_name, []):
+                importlib.import_module(module_name)
+            module_name, attribute = self.LAZY_COMMANDS[cmd_name].split(":")
+            command = getattr(importlib.import_module(module_name), attribute)
+        finally:
+            HooksContext.CURRENT[:] = current_contexts
+        assert isinstance(command, click.Command)
+        self.add_command(command, cmd_name)
+
+        # When the project root is already ready, the PROJECT_ROOT_READY and
+        # PLUGINS_LOADED callbacks that were declared by the new modules are run now.
+        if self.ROOT is not None:
+            for callback in hooks.Actions.PROJECT_ROOT_READY.callbacks:
+                if callback not in root_ready_callbacks:
+                    callback.do(self.ROOT)
+            for plugins_loaded_callback in hooks.Actions.PLUGINS_LOADED.callbacks:
+                if plugins_loaded_callback not in plugins_loaded_callbacks:
+                    plugins_loaded_callback.do()
+
     def ensure_plugins_enabled(self, ctx: click.Context) -> None:
         """
         We enable plugins as soon as possible to have access to commands.
@@ -70,8 +141,10 @@ class TutorCli(click.Group):
             # That's ok, we just ignore it.
             return
         if not self.IS_ROOT_READY:
-            hooks.Actions.PROJECT_ROOT_READY.do(ctx.params["root"])
+            with trace.span("PROJECT_ROOT_READY", "hooks"):
+                hooks.Actions.PROJECT_ROOT_READY.do(ctx.params["root"])
             self.IS_ROOT_READY = True
+            self.ROOT = ctx.params["root"]
             for cmd in hooks.Filters.CLI_COMMANDS.iterate():
                 self.add_command(cmd)
 
@@ -99,6 +172,28 @@ class TutorCli(click.Group):
     is_flag=True,
     help="Print this help",
 )
+@click.option(
+    "--profile-hooks",
+    is_flag=True,
+    expose_value=False,
+    callback=lambda _ctx, _param, value: profiling.start() if value else None,
+    help=(
+        "Print the time spent in each hook callback on exit. To profile hooks from "
+        f"startup, or to write a trace file, define the {profiling.ENV_VAR_NAME} "
+        "environment variable instead"
+    ),
+)
+@click.option(
+    "--trace",
+    type=click.Path(dir_okay=False),
+    expose_value=False,
+    callback=lambda _ctx, _param, value: trace.save_on_exit(value) if value else None,
+    help=(
+        "Write the timeline of the command to this file on exit, in the Chrome trace "
+        "event format. To trace the command from startup, define the "
+        f"{trace.ENV_VAR_NAME}=FILE environment variable instead"
+    ),
+)
 @click.pass_context
 def cli(context: click.Context, root: str, show_help: bool) -> None:
     if utils.is_root():
@@ -119,18 +214,7 @@ def help_command(context: click.Context) -> None:
     context.invoke(cli, show_help=True)
 
 
-hooks.Filters.CLI_COMMANDS.add_items(
-    [
-        config_command,
-        dev,
-        help_command,
-        images_command,
-        k8s,
-        local,
-        mounts_command,
-        plugins_command,
-    ]
-)
+hooks.Filters.CLI_COMMANDS.add_item(help_command)
 
 
 if __name__ == "__main__":
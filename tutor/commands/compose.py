@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import shlex
+import subprocess
+import threading
 import typing as t
 
 import click
 
-from tutor import bindmount, fmt, hooks, utils
 from tutor import config as tutor_config
 from tutor import env as tutor_env
+from tutor import fmt, hooks, serialize, utils
+from tutor import images as tutor_images
 from tutor import interactive as interactive_config
 from tutor.commands import images, jobs
 from tutor.commands.config import save as config_save_command
@@ -23,6 +28,9 @@ from tutor.types import Config
 
 class ComposeTaskRunner(BaseComposeTaskRunner):
     HOOK_FIRED: bool = False
+    # Tasks may run concurrently, but the hook must be fired just once. Hook callbacks
+    # may run docker compose commands themselves, hence the re-entrant lock.
+    HOOK_LOCK = threading.RLock()
 
     def __init__(self, root: str, config: Config):
         super().__init__(root, config)
@@ -36,13 +44,14 @@ class ComposeTaskRunner(BaseComposeTaskRunner):
         """
         # Trigger the action just once per runtime
         start_commands = ("start", "up", "restart", "run")
-        if not ComposeTaskRunner.HOOK_FIRED and any(
-            [cmd in command for cmd in start_commands]
-        ):
-            ComposeTaskRunner.HOOK_FIRED = True
-            hooks.Actions.COMPOSE_PROJECT_STARTED.do(
-                self.root, self.config, self.project_name
-            )
+        with ComposeTaskRunner.HOOK_LOCK:
+            if not ComposeTaskRunner.HOOK_FIRED and any(
+                [cmd in command for cmd in start_commands]
+            ):
+                ComposeTaskRunner.HOOK_FIRED = True
+                hooks.Actions.COMPOSE_PROJECT_STARTED.do(
+                    self.root, self.config, self.project_name
+                )
         args = []
         for docker_compose_path in self.docker_compose_files:
             if os.path.exists(docker_compose_path):
@@ -80,12 +89,13 @@ class ComposeTaskRunner(BaseComposeTaskRunner):
         """
         Run the "{{ service }}-job" service from local/docker-compose.jobs.yml with the
         specified command.
+
+        When the COMPOSE_WARM_JOBS setting is enabled, the command is executed in a
+        long-lived container instead (see :py:meth:`run_task_in_warm_container`).
         """
-        run_command = []
-        for docker_compose_path in self.docker_compose_job_files:
-            path = tutor_env.pathjoin(self.root, docker_compose_path)
-            if os.path.exists(path):
-                run_command += ["-f", path]
+        if tutor_config.get_typed(self.config, "COMPOSE_WARM_JOBS", bool, False):
+            return self.run_task_in_warm_container(service, command)
+        run_command = self._get_docker_compose_job_files_args()
         run_command += ["run", "--rm"]
         if not utils.is_a_tty():
             run_command += ["-T"]
@@ -99,6 +109,127 @@ class ComposeTaskRunner(BaseComposeTaskRunner):
             command,
         )
 
+    def get_image(self, service: str) -> str:
+        """
+        Return the image of the "{{ service }}-job" service. When the image exists
+        locally, its ID is included, such that rebuilt images are detected.
+        """
+        image = ""
+        for path in self.docker_compose_job_files:
+            path = tutor_env.pathjoin(self.root, path)
+            if os.path.exists(path):
+                with open(path, encoding="utf-8") as f:
+                    services = (serialize.load(f) or {}).get("services") or {}
+                image = (services.get(f"{service}-job") or {}).get("image", image)
+        image_id = tutor_images.inspect(image, "{{ .Id }}") if image else None
+        return f"{image} ({image_id})" if image_id else image
+
+    def _get_docker_compose_job_files_args(self) -> list[str]:
+        args = []
+        for docker_compose_path in self.docker_compose_job_files:
+            path = tutor_env.pathjoin(self.root, docker_compose_path)
+            if os.path.exists(path):
+                args += ["-f", path]
+        return args
+
+    def run_task_in_warm_container(self, service: str, command: str) -> int:
+        """
+        Run a command with `docker exec` in a long-lived "{{ service }}-job" container,
+        such that consecutive tasks don't pay for the container start.
+
+        The container is started on first use, and it stops by itself after it has been
+        idle for COMPOSE_WARM_JOBS_IDLE_TIMEOUT seconds. It is replaced whenever the
+        docker-compose files or the job image change, for instance after an image
+        upgrade or a change in the environment.
+        """
+        container_name = f"{self.project_name}-{service}-job-warm"
+        fingerprint = self.get_job_fingerprint(service)
+        current_fingerprint = inspect_container(
+            container_name,
+            f'{{{{ if .State.Running }}}}{{{{ index .Config.Labels "{WARM_JOB_LABEL}" }}}}{{{{ end }}}}',
+        )
+        if current_fingerprint != fingerprint:
+            if current_fingerprint is not None:
+                fmt.echo_info(f"Replacing outdated job container {container_name}")
+                utils.docker("rm", "--force", container_name)
+            idle_timeout = tutor_config.get_typed(
+                self.config, "COMPOSE_WARM_JOBS_IDLE_TIMEOUT", int, 900
+            )
+            self.docker_compose(
+                *self._get_docker_compose_job_files_args(),
+                "run",
+                "--detach",
+                "--rm",
+                f"--name={container_name}",
+                f"--label={WARM_JOB_LABEL}={fingerprint}",
+                f"{service}-job",
+                "sh",
+                "-c",
+                WARM_JOB_KEEPALIVE_SCRIPT.format(timeout=idle_timeout),
+            )
+        exec_args = ["exec", "-i"]
+        if utils.is_a_tty():
+            exec_args.append("-t")
+        return utils.docker(
+            *exec_args,
+            container_name,
+            "sh",
+            "-c",
+            WARM_JOB_EXEC_SCRIPT.format(command=shlex.quote(command)),
+        )
+
+    def get_job_fingerprint(self, service: str) -> str:
+        """
+        Hash of the definition of the "{{ service }}-job" container: the docker-compose
+        files, which include image tags, environment variables and volumes, and the ID
+        of the image, such that images that are rebuilt or pulled with the same tag are
+        detected.
+        """
+        hasher = hashlib.sha256()
+        hasher.update(f"image:{self.get_image(service)}\0".encode())
+        for path in self.docker_compose_files + self.docker_compose_job_files:
+            path = tutor_env.pathjoin(self.root, path)
+            if os.path.exists(path):
+                hasher.update(path.encode())
+                with open(path, "rb") as f:
+                    hasher.update(f.read())
+        return hasher.hexdigest()
+
+
+# Label of warm job containers that stores the fingerprint of their definition
+WARM_JOB_LABEL = "org.overhang.tutor.job-fingerprint"
+# File that is touched in warm job containers as long as tasks are running
+WARM_JOB_ACTIVITY_FILE = "/tmp/.tutor-job-activity"
+# Keep warm job containers alive until they have been idle for some time
+WARM_JOB_KEEPALIVE_SCRIPT = (
+    f"touch {WARM_JOB_ACTIVITY_FILE}; "
+    f"while [ $(( $(date +%s) - $(stat -c %Y {WARM_JOB_ACTIVITY_FILE}) )) -lt {{timeout}} ]; "
+    "do sleep 5; done"
+)
+# Run a task in a warm job container. The task runs in its own shell, as it would in a
+# new container, while the activity file is regularly touched.
+WARM_JOB_EXEC_SCRIPT = f"""(while true; do touch {WARM_JOB_ACTIVITY_FILE}; sleep 5; done) &
+keepalive=$!
+status=0
+sh -e -c {{command}} || status=$?
+kill $keepalive
+exit $status"""
+
+
+def inspect_container(name: str, template: str) -> t.Optional[str]:
+    """
+    Return the formatted properties of a container, or None if it does not exist.
+    """
+    try:
+        return subprocess.run(
+            ["docker", "container", "inspect", f"--format={template}", name],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
 
 class BaseComposeContext(BaseTaskContext):
     NAME: t.Literal["local", "dev"]
@@ -472,9 +603,6 @@ def dc_command(
     context.job_runner(config).docker_compose(command, *args)
 
 
-hooks.Filters.ENV_TEMPLATE_VARIABLES.add_item(("iter_mounts", bindmount.iter_mounts))
-
-
 def add_commands(command_group: click.Group) -> None:
     command_group.add_command(launch)
     command_group.add_command(upgrade)
@@ -144,6 +144,19 @@ class ConfigListKeyValParamType(ConfigKeyValParamType):
     is_flag=True,
     help="Remove everything in the env directory before save",
 )
+@click.option(
+    "--incremental",
+    is_flag=True,
+    help="Only render the environment files whose templates, configuration values or patches changed since the last save",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of worker processes used to render the environment templates",
+)
 @click.pass_obj
 def save(
     context: Context,
@@ -154,6 +167,8 @@ def save(
     unset_vars: list[str],
     env_only: bool,
     clean_env: bool,
+    incremental: bool,
+    jobs: int,
 ) -> None:
     config = tutor_config.load_minimal(context.root)
 
@@ -211,7 +226,7 @@ def save(
 
     # Reload configuration, without version checking
     config = tutor_config.load_full(context.root)
-    env.save(context.root, config)
+    env.save(context.root, config, incremental=incremental, jobs=jobs)
 
 
 @click.command(help="Print the project root")
@@ -224,7 +239,8 @@ def printroot(context: Context) -> None:
 @click.argument("key", type=ConfigKeyParamType())
 @click.pass_obj
 def printvalue(context: Context, key: str) -> None:
-    config = tutor_config.load(context.root)
+    # Only the requested entry (and the entries it refers to) is rendered
+    config = tutor_config.load_lazy(context.root)
     try:
         value = config[key]
     except KeyError as e:
@@ -256,6 +272,73 @@ def patches_show(context: Context, name: str) -> None:
         print(rendered)
 
 
+@click.command(
+    name="deps",
+    short_help="Print the dependencies of templates",
+    help="""Print the configuration values, patches and included templates that the
+TEMPLATE files depend on. Template names are relative to the template roots, e.g:
+apps/openedx/settings/lms/production.py.
+
+Alternatively, print the environment files which depend on a given configuration value
+(--key) or patch (--patch). This information is read from the manifest that is
+generated by `tutor config save`, so that no template needs to be rendered.""",
+)
+@click.argument("templates", metavar="template", nargs=-1)
+@click.option(
+    "-k",
+    "--key",
+    "config_keys",
+    type=ConfigKeyParamType(),
+    multiple=True,
+    help="Print files that depend on this configuration value (can be used multiple times)",
+)
+@click.option(
+    "-p",
+    "--patch",
+    "patch_names",
+    multiple=True,
+    help="Print files that depend on this patch (can be used multiple times)",
+)
+@click.pass_obj
+def deps(
+    context: Context,
+    templates: list[str],
+    config_keys: list[str],
+    patch_names: list[str],
+) -> None:
+    if not (templates or config_keys or patch_names):
+        raise exceptions.TutorError(
+            "Define at least one template, configuration key or patch name"
+        )
+    config = tutor_config.load(context.root)
+    if templates:
+        renderer = env.DependencyRenderer(config)
+        rows: list[tuple[str, ...]] = [("TEMPLATE", "TYPE", "DEPENDENCY")]
+        for template in templates:
+            dependencies = renderer.get_dependencies(template)
+            for name in sorted(dependencies.variables):
+                rows.append((template, "config", name))
+            for name in sorted(dependencies.patches):
+                rows.append((template, "patch", name))
+            for name in sorted(dependencies.templates - {template}):
+                rows.append((template, "template", name))
+        fmt.echo(utils.format_table(rows))
+    if config_keys or patch_names:
+        manifest = env.EnvManifest(context.root, config)
+        if not manifest.load():
+            raise exceptions.TutorError(
+                "The environment manifest is missing or out-of-date. Generate it by running: tutor config save"
+            )
+        rows = [("DEPENDENCY", "TYPE", "FILE")]
+        for key in config_keys:
+            for path in manifest.iter_dependents(config_key=key):
+                rows.append((key, "config", path))
+        for name in patch_names:
+            for path in manifest.iter_dependents(patch=name):
+                rows.append((name, "patch", path))
+        fmt.echo(utils.format_table(rows))
+
+
 @click.command(name="edit", help="Edit config.yml of the current environment")
 @click.pass_obj
 def edit(context: Context) -> None:
@@ -286,6 +369,7 @@ def edit(context: Context) -> None:
 config_command.add_command(save)
 config_command.add_command(printroot)
 config_command.add_command(printvalue)
+config_command.add_command(deps)
 patches_command.add_command(patches_list)
 patches_command.add_command(patches_show)
 config_command.add_command(patches_command)
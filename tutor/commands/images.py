@@ -1,11 +1,14 @@
 from __future__ import annotations
 
+import functools
+import json
 import os
+import time
 import typing as t
 
 import click
 
-from tutor import bindmount, exceptions, fmt, hooks, images, utils
+from tutor import bindmount, exceptions, fmt, hooks, images, parallel, utils
 from tutor import config as tutor_config
 from tutor import env as tutor_env
 from tutor.commands.context import Context
@@ -181,6 +184,34 @@ def images_command() -> None:
     multiple=True,
     help="Set extra options for docker build command.",
 )
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help=(
+        "Number of images to build concurrently. Build logs are then prefixed by the "
+        "image name."
+    ),
+)
+@click.option(
+    "--skip-unchanged",
+    is_flag=True,
+    help=(
+        "Don't build the images that were already built by this option with the same "
+        "build context, build command and build context mounts."
+    ),
+)
+@click.option(
+    "--plan",
+    "show_plan",
+    is_flag=True,
+    help=(
+        "Don't build anything: instead, print in JSON format the images that would be "
+        "built, in build order, with their build arguments and build contexts."
+    ),
+)
 @click.pass_obj
 def build(
     context: Context,
@@ -193,12 +224,25 @@ def build(
     add_hosts: list[str],
     target: str,
     docker_args: list[str],
+    jobs: int,
+    skip_unchanged: bool,
+    show_plan: bool,
 ) -> None:
     """
     Build docker images
 
     Build the docker images necessary for an Open edX platform. By default, the remote
     registry cache will be used for better performance.
+
+    With --jobs=N, up to N images are built at the same time. Images that depend on
+    other images (see the IMAGES_BUILD_DEPENDENCIES filter) are built after them.
+
+    With --skip-unchanged, images are not built again if their build context, build
+    command and build context mounts did not change since the last build. Note that
+    changes in sources that are downloaded during the build are not detected.
+
+    With --plan, the build plan is printed instead. This is useful to review cache
+    usage without running any build.
     """
     config = tutor_config.load(context.root)
     command_args = []
@@ -216,9 +260,16 @@ def build(
         command_args += docker_args
     # Build context mounts
     build_contexts = get_image_build_contexts(config)
+    # Existing images can only be checked when they are loaded locally
+    skip_unchanged = skip_unchanged and not no_cache and docker_output == "type=docker"
 
+    # (name, path, tag, args, host paths)
+    image_builds: dict[str, tuple[str, str, list[str], list[str]]] = {}
     for image in image_names:
         for name, path, tag, custom_args in find_images_to_build(config, image):
+            if name in image_builds:
+                # Don't build the same image twice, as in "build openedx all"
+                continue
             image_build_args = [*command_args, *custom_args]
 
             # Registry cache
@@ -231,18 +282,103 @@ def build(
 
             # Build contexts
             for host_path, stage_name in build_contexts.get(name, []):
-                fmt.echo_info(
-                    f"Adding {host_path} to the build context '{stage_name}' of image '{image}'"
-                )
+                if not show_plan:
+                    fmt.echo_info(
+                        f"Adding {host_path} to the build context '{stage_name}' of image '{image}'"
+                    )
                 image_build_args.append(f"--build-context={stage_name}={host_path}")
 
-            # Build
-            images.build(
+            image_builds[name] = (
                 tutor_env.pathjoin(context.root, path),
                 tag,
-                *image_build_args,
+                image_build_args,
+                [host_path for host_path, _ in build_contexts.get(name, [])],
             )
 
+    dependencies: dict[str, list[str]] = {}
+    for name, dependency in hooks.Filters.IMAGES_BUILD_DEPENDENCIES.iterate():
+        if dependency in image_builds:
+            dependencies.setdefault(name, []).append(dependency)
+
+    if show_plan:
+        plan = [
+            get_build_plan(name, *image_builds[name], dependencies.get(name, []))
+            for name in parallel.sort(list(image_builds), dependencies)
+        ]
+        click.echo(json.dumps(plan, indent=2))
+        return
+
+    tasks: list[tuple[str, parallel.Task]] = [
+        (
+            name,
+            functools.partial(
+                build_image,
+                *image_builds[name],
+                skip_unchanged=skip_unchanged,
+                prefix=f"[{name}] " if jobs > 1 else "",
+            ),
+        )
+        for name in image_builds
+    ]
+    parallel.run(tasks, dependencies=dependencies, jobs=jobs)
+
+
+def build_image(
+    path: str,
+    tag: str,
+    args: list[str],
+    build_contexts: list[str],
+    skip_unchanged: bool = False,
+    prefix: str = "",
+) -> None:
+    """
+    Build an image. When `skip_unchanged` is true, the build is skipped if the local
+    image is labeled with the same context hash. Otherwise, the image is labeled with
+    this hash.
+    """
+    if not skip_unchanged:
+        images.build(path, tag, *args, prefix=prefix)
+        return
+    context_hash = images.get_context_hash(path, tag, args, build_contexts)
+    if images.get_context_hash_label(tag) == context_hash:
+        fmt.echo_info(f"{prefix}Image {tag} is up-to-date, skipping build")
+        return
+    images.build(path, tag, *args, prefix=prefix, context_hash=context_hash)
+
+
+def get_build_plan(
+    name: str,
+    path: str,
+    tag: str,
+    args: list[str],
+    build_contexts: list[str],
+    dependencies: list[str],
+) -> dict[str, t.Any]:
+    """
+    Return everything that goes into the build of an image, as a JSON-serializable
+    dict. The "changed" value is None when there is no local image to compare with.
+    """
+    context_hash = images.get_context_hash(path, tag, args, build_contexts)
+    current_hash = images.get_context_hash_label(tag)
+    return {
+        "name": name,
+        "tag": tag,
+        "path": path,
+        "args": args,
+        "cache_from": [
+            arg.split("=", 1)[1] for arg in args if arg.startswith("--cache-from=")
+        ],
+        "cache_to": [
+            arg.split("=", 1)[1] for arg in args if arg.startswith("--cache-to=")
+        ],
+        "build_contexts": dict(
+            arg.split("=", 2)[1:] for arg in args if arg.startswith("--build-context=")
+        ),
+        "dependencies": dependencies,
+        "context_hash": context_hash,
+        "changed": None if current_hash is None else current_hash != context_hash,
+    }
+
 
 def get_image_build_contexts(config: Config) -> dict[str, list[tuple[str, str]]]:
     """
@@ -267,22 +403,94 @@ def get_image_build_contexts(config: Config) -> dict[str, list[tuple[str, str]]]
 
 @click.command(short_help="Pull images from the Docker registry")
 @click.argument("image_names", metavar="image", type=PullImageNameParam(), nargs=-1)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of images to pull concurrently.",
+)
 @click.pass_obj
-def pull(context: Context, image_names: list[str]) -> None:
+def pull(context: Context, image_names: list[str], jobs: int) -> None:
     config = tutor_config.load_full(context.root)
-    for image in image_names:
-        for tag in find_remote_image_tags(config, hooks.Filters.IMAGES_PULL, image):
-            images.pull(tag)
+    tags = [
+        tag
+        for image in image_names
+        for tag in find_remote_image_tags(config, hooks.Filters.IMAGES_PULL, image)
+    ]
+    run_remote_image_tasks(images.pull, tags, jobs)
 
 
 @click.command(short_help="Push images to the Docker registry")
 @click.argument("image_names", metavar="image", type=PushImageNameParam(), nargs=-1)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Number of images to push concurrently.",
+)
 @click.pass_obj
-def push(context: Context, image_names: list[str]) -> None:
+def push(context: Context, image_names: list[str], jobs: int) -> None:
     config = tutor_config.load_full(context.root)
-    for image in image_names:
-        for tag in find_remote_image_tags(config, hooks.Filters.IMAGES_PUSH, image):
-            images.push(tag)
+    tags = [
+        tag
+        for image in image_names
+        for tag in find_remote_image_tags(config, hooks.Filters.IMAGES_PUSH, image)
+    ]
+    run_remote_image_tasks(images.push, tags, jobs)
+
+
+def run_remote_image_tasks(
+    func: t.Callable[..., None], tags: list[str], jobs: int
+) -> None:
+    """
+    Pull or push images, with up to `jobs` images at the same time.
+
+    When images are processed concurrently, all of them are processed even if some
+    fail, and all failures are reported at the end. When there are multiple images, the
+    duration and size of each one of them is printed on exit.
+    """
+    # Don't process the same image twice, as in "pull openedx all"
+    tags = list(dict.fromkeys(tags))
+    durations: dict[str, float] = {}
+    failed: set[str] = set()
+
+    def run(tag: str) -> None:
+        start = time.perf_counter()
+        try:
+            if jobs > 1:
+                func(tag, prefix=f"[{tag}] ")
+            else:
+                func(tag)
+        except BaseException:
+            failed.add(tag)
+            raise
+        finally:
+            durations[tag] = time.perf_counter() - start
+
+    try:
+        parallel.run(
+            [(tag, functools.partial(run, tag)) for tag in tags],
+            jobs=jobs,
+            fail_fast=False,
+        )
+    finally:
+        if len(tags) > 1:
+            fmt.echo_info("Summary:")
+            for tag in tags:
+                if tag not in durations:
+                    fmt.echo_info(f"  {tag}: not processed")
+                elif tag in failed:
+                    fmt.echo_info(f"  {tag}: failed after {durations[tag]:.1f}s")
+                else:
+                    size = images.get_size(tag)
+                    size_str = (
+                        "unknown size" if size is None else f"{size / 1e6:.1f} MB"
+                    )
+                    fmt.echo_info(f"  {tag}: {durations[tag]:.1f}s, {size_str}")
 
 
 @click.command(short_help="Print tag associated to a Docker image")
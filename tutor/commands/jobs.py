@@ -15,7 +15,7 @@ import click
 from typing_extensions import ParamSpec
 
 from tutor import config as tutor_config
-from tutor import env, exceptions, fmt, hooks, utils
+from tutor import env, exceptions, fmt, hooks, parallel, trace, utils
 from tutor.commands.context import BaseTaskContext, Context
 from tutor.commands.jobs_utils import (
     TEST_DEFAULTS,
@@ -29,6 +29,7 @@ from tutor.commands.jobs_utils import (
     tests_teardown_lms_template,
 )
 from tutor.hooks import priorities
+from tutor.tasks import TaskLedger, get_batch_script, group_tasks
 
 
 class DoGroup(click.Group):
@@ -78,21 +79,105 @@ def _add_core_init_tasks() -> None:
         hooks.Filters.CLI_DO_INIT_TASKS.add_item(
             ("cms", env.read_core_template_file("jobs", "init", "cms.sh"))
         )
+    # The lms and cms share the same database, so their migrations can't run
+    # concurrently
+    hooks.Filters.CLI_DO_INIT_TASKS_DEPENDENCIES.add_items(
+        [
+            ("mysql", ()),
+            ("lms", ("mysql",)),
+            ("cms", ("mysql", "lms")),
+        ]
+    )
 
 
 @click.command("init", help="Initialise all applications")
 @click.option("-l", "--limit", help="Limit initialisation to this service or plugin")
-def initialise(limit: t.Optional[str]) -> t.Iterator[tuple[str, str]]:
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help=(
+        "Number of init tasks to run concurrently, based on the dependencies between "
+        "services. Task logs are then prefixed by the task name."
+    ),
+)
+@click.option(
+    "--batch",
+    is_flag=True,
+    help=(
+        "Run consecutive init tasks from the same service in a single container, to "
+        "save container start times."
+    ),
+)
+@click.option(
+    "--skip-unchanged/--force",
+    default=False,
+    show_default=True,
+    help=(
+        "Skip the init tasks that already succeeded with the same script and the same "
+        "image. Successful tasks are recorded in all cases."
+    ),
+)
+def initialise(
+    limit: t.Optional[str], jobs: int, batch: bool, skip_unchanged: bool
+) -> t.Iterable[tuple[str, str]]:
     fmt.echo_info("Initialising all services...")
-    filter_context = hooks.Contexts.app(limit).name if limit else None
+    return ScheduledTasks(
+        iter_init_tasks(limit, verbose=jobs == 1 and not batch),
+        jobs=jobs,
+        batch=batch,
+        record=True,
+        skip_unchanged=skip_unchanged,
+        success_message="All services initialised.",
+    )
 
+
+def iter_init_tasks(
+    limit: t.Optional[str], verbose: bool = False
+) -> t.Iterator[tuple[str, str]]:
+    filter_context = hooks.Contexts.app(limit).name if limit else None
     for service, task in hooks.Filters.CLI_DO_INIT_TASKS.iterate_from_context(
         filter_context
     ):
-        fmt.echo_info(f"Running init task in {service}")
+        if verbose:
+            # Batched and concurrent tasks are all collected before they are run
+            fmt.echo_info(f"Running init task in {service}")
         yield service, task
 
-    fmt.echo_info("All services initialised.")
+
+class ScheduledTasks:
+    """
+    Tasks that are yielded by a `do` subcommand, along with the options that define how
+    they are run by :py:func:`do_callback`. `do` subcommands which return a plain
+    iterable of tasks run them one after the other, without recording them.
+
+    - `jobs`: number of tasks to run concurrently.
+    - `batch`: run consecutive tasks from the same service in a single container.
+    - `record`: record successful tasks in the :py:class:`tutor.tasks.TaskLedger`.
+    - `skip_unchanged`: skip the tasks that already succeeded in the same image.
+    - `success_message`: printed once all tasks succeeded.
+    """
+
+    def __init__(
+        self,
+        tasks: t.Iterable[tuple[str, str]],
+        jobs: int = 1,
+        batch: bool = False,
+        record: bool = False,
+        skip_unchanged: bool = False,
+        success_message: str = "",
+    ):
+        self.tasks = tasks
+        self.jobs = jobs
+        self.batch = batch
+        self.record = record
+        self.skip_unchanged = skip_unchanged
+        self.success_message = success_message
+
+    def __iter__(self) -> t.Iterator[tuple[str, str]]:
+        return iter(self.tasks)
 
 
 @click.command(help="Create an Open edX user and interactively set their password")
@@ -717,8 +802,120 @@ def do_callback(service_commands: t.Iterable[tuple[str, str]]) -> None:
     context = click.get_current_context().obj
     config = tutor_config.load(context.root)
     runner = context.job_runner(config)
-    for service, command in service_commands:
-        runner.run_task_from_str(service, command)
+    if not isinstance(service_commands, ScheduledTasks):
+        service_commands = ScheduledTasks(service_commands)
+    jobs = service_commands.jobs
+    batch = service_commands.batch
+    ledger = TaskLedger(context.root) if service_commands.record else None
+    skip_unchanged = service_commands.skip_unchanged
+    images: dict[str, str] = {}
+
+    def get_image(service: str) -> str:
+        if service not in images:
+            images[service] = runner.get_image(service)
+        return images[service]
+
+    def is_unchanged(service: str, command: str) -> bool:
+        if ledger is None or not skip_unchanged:
+            return False
+        timestamp = ledger.get_success(service, command, get_image(service))
+        if timestamp is None:
+            return False
+        fmt.echo_info(
+            f"Skipping unchanged task in {service} (succeeded on {timestamp})"
+        )
+        return True
+
+    def run_task(service: str, commands: list[str], prefix: str = "") -> None:
+        command = commands[0] if len(commands) == 1 else get_batch_script(commands)
+        with trace.span(f"do {service}", "task", command=command):
+            with utils.prefixed_output(prefix):
+                runner.run_task(service, command)
+        if ledger is not None:
+            for command in commands:
+                ledger.add_success(service, command, get_image(service))
+
+    if jobs <= 1 and not batch:
+        for service, command in service_commands:
+            rendered = runner.render_str(command)
+            if not is_unchanged(service, rendered):
+                run_task(service, [rendered])
+    else:
+        # Scripts are rendered sequentially, before running any task
+        tasks = [
+            (service, runner.render_str(command))
+            for service, command in service_commands
+        ]
+        tasks = [
+            (service, command)
+            for service, command in tasks
+            if not is_unchanged(service, command)
+        ]
+        groups = (
+            group_tasks(tasks)
+            if batch
+            else [(service, [command]) for service, command in tasks]
+        )
+        if ledger is not None:
+            # Images are fetched before tasks run concurrently
+            for service, _commands in groups:
+                get_image(service)
+        names = [
+            f"{service} ({index + 1}/{len(groups)})"
+            for index, (service, _) in enumerate(groups)
+        ]
+        parallel.run(
+            [
+                (
+                    name,
+                    functools.partial(
+                        run_task, service, commands, f"[{name}] " if jobs > 1 else ""
+                    ),
+                )
+                for name, (service, commands) in zip(names, groups)
+            ],
+            dependencies=get_task_dependencies(
+                names, [service for service, _ in groups]
+            ),
+            jobs=jobs,
+        )
+
+    if service_commands.success_message:
+        fmt.echo_info(service_commands.success_message)
+
+
+def get_task_dependencies(
+    names: list[str], services: list[str]
+) -> dict[str, list[str]]:
+    """
+    Compute the dependencies between tasks, based on the services that run them and on
+    the :py:data:`tutor.hooks.Filters.CLI_DO_INIT_TASKS_DEPENDENCIES` filter.
+
+    A task depends on the previous tasks of the same service and of the services that
+    it requires. Tasks from undeclared services are barriers: they depend on all
+    previous tasks, and all subsequent tasks depend on them.
+    """
+    requirements: dict[str, set[str]] = {}
+    for (
+        service,
+        required_services,
+    ) in hooks.Filters.CLI_DO_INIT_TASKS_DEPENDENCIES.iterate():
+        requirements.setdefault(service, set()).update(required_services)
+
+    dependencies: dict[str, list[str]] = {}
+    barriers: set[str] = set()
+    for index, (name, service) in enumerate(zip(names, services)):
+        if service not in requirements:
+            dependencies[name] = names[:index]
+            barriers.add(name)
+            continue
+        allowed_services = requirements[service] | {service}
+        dependencies[name] = [
+            previous_name
+            for previous_name, previous_service in zip(names[:index], services)
+            if previous_service in allowed_services or previous_name in barriers
+        ]
+    return dependencies
 
 
 hooks.Filters.CLI_DO_COMMANDS.add_items(
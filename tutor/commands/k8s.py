@@ -1,8 +1,9 @@
 import os
 import tempfile
 from datetime import datetime
-from time import sleep
-from typing import Any, Iterable, List, Optional, Type
+from math import ceil
+from time import monotonic
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Type
 
 import click
 
@@ -24,7 +25,7 @@ class K8sClients:
 
     def __init__(self) -> None:
         # Loading the kubernetes module here to avoid import overhead
-        from kubernetes import client, config  # noqa: E402, F401
+        from kubernetes import client, config, watch  # noqa: E402, F401
 
         if os.path.exists(
             os.path.expanduser(config.kube_config.KUBE_CONFIG_DEFAULT_LOCATION)
@@ -45,6 +46,7 @@ class K8sClients:
         self._batch_api = None
         self._core_api = None
         self._client = client
+        self._watch = watch
 
     @classmethod
     def instance(cls: Type["K8sClients"]) -> "K8sClients":
@@ -64,6 +66,12 @@ class K8sClients:
             self._core_api = self._client.CoreV1Api()
         return self._core_api
 
+    def watch(self) -> Any:
+        """
+        Return a new watch object, which streams events from the API.
+        """
+        return self._watch.Watch()  # type: ignore
+
 
 class K8sTaskRunner(BaseTaskRunner):
     """
@@ -85,14 +93,23 @@ class K8sTaskRunner(BaseTaskRunner):
         job_name = canonical_job_name + "-" + datetime.now().strftime("%Y%m%d%H%M%S")
 
         # Wait until all other jobs are completed
-        while True:
-            active_jobs = self.active_job_names()
-            if not active_jobs:
-                break
-            fmt.echo_info(
-                f"Waiting for active jobs to terminate: {' '.join(active_jobs)}"
+        deadline = self.get_deadline()
+        active_jobs: List[str] = []
+        for k8s_jobs in self.watch(
+            K8sClients.instance().batch_api.list_namespaced_job,
+            deadline,
+            label_selector="app.kubernetes.io/managed-by=tutor",
+        ):
+            still_active_jobs = sorted(
+                job.metadata.name for job in k8s_jobs if job.status.active
             )
-            sleep(5)
+            if not still_active_jobs:
+                break
+            if still_active_jobs != active_jobs:
+                fmt.echo_info(
+                    f"Waiting for active jobs to terminate: {' '.join(still_active_jobs)}"
+                )
+            active_jobs = still_active_jobs
 
         # Render the full kustomization first so that patches in k8s-override are applied
         # against canonical job names (e.g. "lms-job") before we rename for uniqueness.
@@ -141,33 +158,172 @@ class K8sTaskRunner(BaseTaskRunner):
         finally:
             os.unlink(tmp.name)
 
-        message = (
-            "Job {job_name} is running. To view the logs from this job, run:\n\n"
-            """    kubectl logs --namespace={namespace} --follow $(kubectl get --namespace={namespace} pods """
-            """--selector=job-name={job_name} -o=jsonpath="{{.items[0].metadata.name}}")\n\n"""
-            "Waiting for job completion..."
-        ).format(job_name=job_name, namespace=k8s_namespace(self.config))
-        fmt.echo_info(message)
+        fmt.echo_info(f"Job {job_name} is running. Waiting for job completion...")
+        self.wait_for_job(job_name, deadline)
+        fmt.echo_info(f"Job {job_name} successful.")
+        return 0
+
+    def get_deadline(self) -> Optional[float]:
+        """
+        Return the time at which a task times out, based on the K8S_JOBS_TIMEOUT
+        setting, or None if there is no timeout.
+        """
+        timeout = get_typed(self.config, "K8S_JOBS_TIMEOUT", int, 0)
+        return monotonic() + timeout if timeout > 0 else None
 
-        # Wait for completion
-        field_selector = f"metadata.name={job_name}"
+    def wait_for_job(self, job_name: str, deadline: Optional[float]) -> None:
+        """
+        Stream the logs of the job pods until the job completes. Failed pods are
+        retried by Kubernetes, in which case the logs of the new pod are streamed, too.
+        """
+        clients = K8sClients.instance()
+        namespace = k8s_namespace(self.config)
+        streamed_pods: List[str] = []
+        failed_pods = 0
         while True:
-            namespaced_jobs = K8sClients.instance().batch_api.list_namespaced_job(
-                k8s_namespace(self.config), field_selector=field_selector
-            )
-            if not namespaced_jobs.items:
-                continue
-            job = namespaced_jobs.items[0]
-            if not job.status.active:
-                if job.status.succeeded:
-                    fmt.echo_info(f"Job {job_name} successful.")
+            # Wait for a new pod to start, then stream its logs until it exits
+            for pods in self.watch(
+                clients.core_api.list_namespaced_pod,
+                deadline,
+                label_selector=f"job-name={job_name}",
+            ):
+                started_pods = [
+                    pod.metadata.name
+                    for pod in pods
+                    if pod.metadata.name not in streamed_pods
+                    and pod.status.phase in ("Running", "Succeeded", "Failed")
+                ]
+                if started_pods:
                     break
-                if job.status.failed:
-                    raise exceptions.TutorError(
-                        f"Job {job_name} failed. View the job logs to debug this issue."
-                    )
-            sleep(5)
-        return 0
+                # The job may terminate before any pod starts, for instance when
+                # it reaches its deadline while the image is being pulled
+                job = clients.batch_api.read_namespaced_job(job_name, namespace)
+                if self.is_job_complete(job):
+                    return
+            streamed_pods.append(started_pods[0])
+            self.stream_logs(started_pods[0], deadline)
+
+            # Wait for the job to complete, or to start a new pod
+            for k8s_jobs in self.watch(
+                clients.batch_api.list_namespaced_job,
+                deadline,
+                field_selector=f"metadata.name={job_name}",
+            ):
+                if not k8s_jobs:
+                    raise exceptions.TutorError(f"Job {job_name} was deleted.")
+                job = k8s_jobs[0]
+                if self.is_job_complete(job):
+                    return
+                if (job.status.failed or 0) > failed_pods and job.status.active:
+                    failed_pods = job.status.failed
+                    fmt.echo_alert(f"Job {job_name} failed: retrying...")
+                    break
+
+    @staticmethod
+    def is_job_complete(job: Any) -> bool:
+        """
+        Return True if the job succeeded, and raise an error if it failed.
+        """
+        conditions = [
+            condition.type
+            for condition in job.status.conditions or []
+            if condition.status == "True"
+        ]
+        if "Failed" in conditions:
+            raise exceptions.TutorError(
+                f"Job {job.metadata.name} failed. View the job logs above to debug this issue."
+            )
+        return "Complete" in conditions
+
+    def stream_logs(self, pod_name: str, deadline: Optional[float]) -> None:
+        """
+        Print the logs of a pod as they are written, until the pod exits. A TutorError
+        is raised when the deadline is reached.
+        """
+        # Loading the kubernetes module here to avoid import overhead
+        from kubernetes.client.exceptions import ApiException
+        from urllib3.exceptions import ReadTimeoutError
+
+        clients = K8sClients.instance()
+        kwargs: dict[str, Any] = {}
+        if deadline is not None:
+            # Pods that don't print anything are interrupted by the request timeout
+            kwargs["_request_timeout"] = max(1, deadline - monotonic())
+        try:
+            for line in clients.watch().stream(
+                clients.core_api.read_namespaced_pod_log,
+                name=pod_name,
+                namespace=k8s_namespace(self.config),
+                **kwargs,
+            ):
+                utils.echo_output(line)
+                if deadline is not None and monotonic() >= deadline:
+                    raise timeout_error()
+        except ReadTimeoutError as e:
+            raise timeout_error() from e
+        except ApiException as e:
+            # For instance: the container could not be started
+            fmt.echo_alert(f"Could not fetch the logs of pod {pod_name}: {e.reason}")
+
+    def watch(
+        self, list_objects: Callable[..., Any], deadline: Optional[float], **kwargs: Any
+    ) -> Iterator[List[Any]]:
+        """
+        Watch the objects that are returned by a `list_namespaced_*` API function.
+
+        The list of objects is yielded once, and then every time one of the objects
+        changes. Changes are received from the Kubernetes watch API, so there is no
+        polling. A TutorError is raised when the deadline is reached.
+        """
+        # Loading the kubernetes module here to avoid import overhead
+        from kubernetes.client.exceptions import ApiException
+
+        namespace = k8s_namespace(self.config)
+        while True:
+            result = list_objects(namespace, **kwargs)
+            objects = {item.metadata.name: item for item in result.items}
+            yield list(objects.values())
+            watch_kwargs: dict[str, Any] = {
+                "resource_version": result.metadata.resource_version
+            }
+            if deadline is not None:
+                timeout = deadline - monotonic()
+                if timeout <= 0:
+                    raise timeout_error()
+                watch_kwargs["timeout_seconds"] = max(1, ceil(timeout))
+            try:
+                for event in (
+                    K8sClients.instance()
+                    .watch()
+                    .stream(list_objects, namespace, **kwargs, **watch_kwargs)
+                ):
+                    if not event or event["type"] not in (
+                        "ADDED",
+                        "MODIFIED",
+                        "DELETED",
+                    ):
+                        continue
+                    item = event["object"]
+                    if event["type"] == "DELETED":
+                        objects.pop(item.metadata.name, None)
+                    else:
+                        objects[item.metadata.name] = item
+                    yield list(objects.values())
+            except ApiException as e:
+                # When the resource version has expired, objects are listed again
+                if e.status != 410:
+                    raise
+
+    def get_image(self, service: str) -> str:
+        """
+        Return the image of the "{{ service }}-job" job definition.
+        """
+        try:
+            job = self.load_job(f"{service}-job")
+        except exceptions.TutorError:
+            return ""
+        image = job["spec"]["template"]["spec"]["containers"][0].get("image", "")
+        return str(image)
 
     def load_job(self, name: str) -> Any:
         """
@@ -648,6 +804,13 @@ def resource_namespace_selector(config: Config) -> List[str]:
     return ["--namespace", k8s_namespace(config)]
 
 
+def timeout_error() -> exceptions.TutorError:
+    return exceptions.TutorError(
+        "Task timed out. The task timeout can be changed with the K8S_JOBS_TIMEOUT "
+        "setting."
+    )
+
+
 def k8s_namespace(config: Config) -> str:
     return get_typed(config, "K8S_NAMESPACE", str)
 
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
 import typing as t
 from copy import deepcopy
 
-from tutor import env, exceptions, fmt, hooks, plugins, serialize, utils
+from tutor import env, exceptions, fmt, hooks, plugins, serialize, trace, utils
+from tutor.__about__ import __version__
+from tutor.plugins.base import PLUGINS_ROOT
 from tutor.types import Config, ConfigValue, cast_config, get_typed
 
 CONFIG_FILENAME = "config.yml"
+CACHE_FILENAME = "config.json"
+
+# The on-disk configuration cache is disabled by default. See enable_cache.
+_CACHE_ENABLED = False
 
 
 def load(root: str) -> Config:
@@ -18,6 +26,25 @@ def load(root: str) -> Config:
     project root. A warning will also be printed if the version from disk
     differs from the package version.
     """
+    check_project_root(root)
+    return load_full(root)
+
+
+def load_lazy(root: str) -> LazyConfig:
+    """
+    Same as :py:func:`load`, but configuration entries are rendered only when they are
+    accessed. This is much faster for commands that only need a few values.
+
+    Note that the CONFIG_LOADED action is not triggered.
+    """
+    check_project_root(root)
+    config = get_user(root)
+    update_with_base(config)
+    update_with_defaults(config)
+    return LazyConfig(config)
+
+
+def check_project_root(root: str) -> None:
     if not os.path.exists(config_path(root)):
         raise exceptions.TutorError(
             "Project root does not exist. Make sure to generate the initial "
@@ -25,7 +52,6 @@ def load(root: str) -> Config:
             "launch` prior to running other commands."
         )
     env.check_is_up_to_date(root)
-    return load_full(root)
 
 
 def load_defaults() -> Config:
@@ -49,6 +75,7 @@ def load_minimal(root: str) -> Config:
     return config
 
 
+@trace.traced("config.load_full")
 def load_full(root: str) -> Config:
     """
     Load a full configuration, with user, base and defaults.
@@ -58,14 +85,158 @@ def load_full(root: str) -> Config:
         defaults (dict): default values of params which might be missing from the
         current config
     """
-    config = get_user(root)
-    update_with_base(config)
-    update_with_defaults(config)
-    render_full(config)
+    config = load_full_from_cache(root)
+    if config is None:
+        loaded_plugins = list(plugins.iter_loaded())
+        config = get_user(root)
+        update_with_base(config)
+        update_with_defaults(config)
+        render_full(config)
+        # Loading the user configuration might enable obsolete plugins: we don't want
+        # to skip this step next time.
+        if loaded_plugins == list(plugins.iter_loaded()):
+            save_cache(root, config)
     hooks.Actions.CONFIG_LOADED.do(deepcopy(config))
     return config
 
 
+def enable_cache(enabled: bool = True) -> None:
+    """
+    Store the fully loaded configuration on disk, in $TUTOR_ROOT/.cache/config.json,
+    and reuse it in subsequent calls to :py:func:`load_full`.
+
+    The cache is invalidated whenever config.yml, the loaded plugins, the plugin files,
+    the ``TUTOR_*`` environment variables, the callbacks of the CONFIG_* filters or the
+    tutor version change. Callbacks are compared by name and static items (see
+    :py:func:`get_config_callbacks_key`), so that the values returned by a callback
+    function must only depend on the other inputs of the cache key. This is the case of
+    plugin callbacks, and this is why the cache is only enabled by the command line
+    interface.
+    """
+    global _CACHE_ENABLED
+    _CACHE_ENABLED = enabled
+
+
+def load_full_from_cache(root: str) -> t.Optional[Config]:
+    """
+    Return the cached full configuration, or None if it is missing or out-of-date.
+    """
+    if not _CACHE_ENABLED:
+        return None
+    key = get_cache_key(root)
+    if key is None:
+        return None
+    try:
+        with open(env.cache_path(root, CACHE_FILENAME), encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get("key") != key:
+        return None
+    return cast_config(cached["config"])
+
+
+def save_cache(root: str, config: Config) -> None:
+    if not _CACHE_ENABLED:
+        return
+    key = get_cache_key(root)
+    if key is None:
+        return
+    try:
+        serialized = json.dumps({"key": key, "config": config})
+    except (TypeError, ValueError):
+        # Some entries can't be stored as json (e.g: dates)
+        return
+    if json.loads(serialized)["config"] != config:
+        # Some entries would not be restored identically (e.g: tuples)
+        return
+    path = env.cache_path(root, CACHE_FILENAME)
+    try:
+        utils.ensure_file_directory_exists(path)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(serialized)
+    except (OSError, exceptions.TutorError):
+        # The cache is not essential: for instance, the project root might be read-only
+        pass
+
+
+def get_cache_key(root: str) -> t.Optional[str]:
+    """
+    Return a hash of all the inputs of :py:func:`load_full`. Return None if the
+    configuration can't be cached.
+    """
+    if os.path.exists(os.path.join(root, "config.json")):
+        # Legacy configuration, which will be converted on load
+        return None
+    try:
+        with open(config_path(root), "rb") as f:
+            user_config = hashlib.sha256(f.read()).hexdigest()
+    except FileNotFoundError:
+        user_config = ""
+
+    def mtime(path: str) -> float:
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return 0
+
+    plugin_files = []
+    if os.path.isdir(PLUGINS_ROOT):
+        plugin_files = sorted(
+            (name, mtime(os.path.join(PLUGINS_ROOT, name)))
+            for name in os.listdir(PLUGINS_ROOT)
+        )
+    inputs = {
+        "version": __version__,
+        "config": user_config,
+        "plugins": list(plugins.iter_loaded()),
+        "plugins_info": list(plugins.iter_info()),
+        "plugin_files": plugin_files,
+        "environment": sorted(
+            (name, value)
+            for name, value in os.environ.items()
+            if name.startswith("TUTOR_")
+        ),
+        "templates": [
+            mtime(os.path.join(env.TEMPLATES_ROOT, "config", filename))
+            for filename in ["base.yml", "defaults.yml"]
+        ],
+        "hooks": get_config_callbacks_key(),
+    }
+    return hashlib.sha256(json.dumps(inputs, default=repr).encode()).hexdigest()
+
+
+def get_config_callbacks_key() -> list[t.Any]:
+    """
+    Describe the callbacks of the filters that are applied by :py:func:`load_full`.
+
+    Callbacks may be added outside of plugins, at runtime: for instance, the upgrade
+    commands override the MYSQL_HOST setting. Callbacks that were created with
+    ``add_items`` are described by their static items, and the other ones by their
+    function name. Callback contexts are included as well.
+    """
+    description: list[t.Any] = []
+    for filtre in [
+        hooks.Filters.CONFIG_DEFAULTS,
+        hooks.Filters.CONFIG_OVERRIDES,
+        hooks.Filters.CONFIG_UNIQUE,
+        hooks.Filters.CONFIG_USER,
+    ]:
+        callbacks = []
+        for callback in filtre.callbacks:
+            if callback.items is None:
+                func = callback.func
+                value: t.Any = [
+                    getattr(func, "__module__", None),
+                    getattr(func, "__qualname__", None) or repr(func),
+                ]
+            else:
+                value = callback.items
+            callbacks.append([callback.contexts, callback.priority, value])
+        description.append(callbacks)
+    return description
+
+
 def update_with_base(config: Config) -> None:
     """
     Add base configuration to the config object.
@@ -188,15 +359,76 @@ def merge(config: Config, base: Config) -> None:
             config[key] = value
 
 
+@trace.traced("config.render_full")
 def render_full(config: Config) -> None:
     """
     Fill and render an existing configuration with defaults.
 
     It is generally necessary to apply this function before rendering templates,
     otherwise configuration entries may not be rendered.
+
+    Entries which refer to other entries are rendered after these, regardless of
+    their order in the configuration.
+    """
+    lazy_config = LazyConfig(config)
+    config.update({key: lazy_config[key] for key in config})
+
+
+class LazyConfig(t.Mapping[str, ConfigValue]):
     """
-    for key, value in config.items():
-        config[key] = env.render_unknown(config, value)
+    Read-only view of an unrendered configuration, where entries are rendered on first
+    access.
+
+    Rendered values are memoized. Entries which are referred to by other entries are
+    rendered first, such that the order of keys does not matter. Circular references
+    result in a TutorError.
+    """
+
+    def __init__(self, config: Config):
+        self.unrendered = config
+        self.rendered: Config = {}
+        # Keys that are currently being rendered, in the order in which they were
+        # requested
+        self._rendering: list[str] = []
+        self._failed = False
+
+    def __getitem__(self, key: str) -> ConfigValue:
+        if key in self.rendered:
+            return self.rendered[key]
+        value = self.unrendered[key]
+        if key in self._rendering:
+            chain = self._rendering[self._rendering.index(key) :] + [key]
+            self._failed = True
+            raise exceptions.TutorError(
+                f"Circular reference in configuration: {' -> '.join(chain)}"
+            )
+        self._rendering.append(key)
+        try:
+            rendered: ConfigValue = env.render_unknown(self, value)
+        except exceptions.TutorError as e:
+            if self._failed:
+                raise
+            # Report the error only once, with the chain of entries that led to it
+            self._failed = True
+            raise exceptions.TutorError(
+                f"Error rendering configuration entry {' -> '.join(self._rendering)}: {e}"
+            ) from e
+        finally:
+            self._rendering.pop()
+            if not self._rendering:
+                self._failed = False
+        self.rendered[key] = rendered
+        return rendered
+
+    def __contains__(self, key: object) -> bool:
+        # Don't render the value just to check whether it exists
+        return key in self.unrendered
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self.unrendered)
+
+    def __len__(self) -> int:
+        return len(self.unrendered)
 
 
 def is_service_activated(config: Config, service: str) -> bool:
@@ -5,6 +5,7 @@ __license__ = "Apache 2.0"
 
 import sys
 import typing as t
+from contextlib import contextmanager
 from weakref import WeakSet
 
 from typing_extensions import ParamSpec
@@ -63,6 +64,10 @@ class Action(t.Generic[T]):
 
     def __init__(self) -> None:
         self.callbacks: list[ActionCallback[T]] = []
+        # Callbacks are sorted lazily while this is > 0 (see bulk_add)
+        self.bulk_depth = 0
+        # Number of sorted callbacks when entering bulk_add
+        self.bulk_start = 0
         self.INSTANCES.add(self)
 
     def add(
@@ -91,11 +96,40 @@ class Action(t.Generic[T]):
 
         def inner(func: ActionCallbackFunc[T]) -> ActionCallbackFunc[T]:
             callback = ActionCallback(func, priority=priority)
-            priorities.insert_callback(callback, self.callbacks)
+            if self.bulk_depth > 0:
+                self.callbacks.append(callback)
+            else:
+                priorities.insert_callback(callback, self.callbacks)
             return func
 
         return inner
 
+    @contextmanager
+    def bulk_add(self) -> t.Iterator[None]:
+        """
+        Context manager to efficiently add many callbacks to the action.
+
+        Within this context, new callbacks are appended to the list of callbacks, which
+        is sorted by priority just once, on exit. The result is the same as adding the
+        callbacks one by one. Because callbacks are not sorted until then, the action
+        should not be triggered from within this context.
+
+        Usage::
+
+            with my_action.bulk_add():
+                for func in funcs:
+                    my_action.add()(func)
+        """
+        if self.bulk_depth == 0:
+            self.bulk_start = len(self.callbacks)
+        self.bulk_depth += 1
+        try:
+            yield
+        finally:
+            self.bulk_depth -= 1
+            if self.bulk_depth == 0:
+                priorities.sort_callbacks(self.callbacks, start=self.bulk_start)
+
     def do(
         self,
         *args: T.args,
@@ -161,6 +195,8 @@ class Action(t.Generic[T]):
             for callback in self.callbacks
             if not callback.is_in_context(context)
         ]
+        # Callbacks added in bulk must all be sorted again
+        self.bulk_start = 0
 
     @classmethod
     def clear_all(cls, context: t.Optional[str] = None) -> None:
@@ -5,6 +5,7 @@ __license__ = "Apache 2.0"
 
 import sys
 import typing as t
+from contextlib import contextmanager
 from weakref import WeakSet
 
 from typing_extensions import Concatenate, ParamSpec
@@ -26,10 +27,14 @@ class FilterCallback(contexts.Contextualized, t.Generic[T1, T2]):
         self,
         func: FilterCallbackFunc[T1, T2],
         priority: t.Optional[int] = None,
+        items: t.Optional[list[t.Any]] = None,
     ):
         super().__init__()
         self.func = func
         self.priority = priority or priorities.DEFAULT
+        # Static list of items that are appended to the filtered value, for callbacks
+        # that were created with Filter.add_items. Such callbacks can be merged.
+        self.items = items
 
     def apply(self, value: T1, *args: T2.args, **kwargs: T2.kwargs) -> T1:
         return self.func(value, *args, **kwargs)
@@ -69,6 +74,12 @@ class Filter(t.Generic[T1, T2]):
 
     def __init__(self) -> None:
         self.callbacks: list[FilterCallback[T1, T2]] = []
+        # Callbacks that are actually applied in the absence of context (see compile)
+        self.compiled: t.Optional[list[FilterCallback[T1, T2]]] = None
+        # Callbacks are sorted lazily while this is > 0 (see bulk_add)
+        self.bulk_depth = 0
+        # Number of sorted callbacks when entering bulk_add
+        self.bulk_start = 0
         self.INSTANCES.add(self)
 
     def add(
@@ -101,12 +112,84 @@ class Filter(t.Generic[T1, T2]):
         """
 
         def inner(func: FilterCallbackFunc[T1, T2]) -> FilterCallbackFunc[T1, T2]:
-            callback: FilterCallback[T1, T2] = FilterCallback(func, priority=priority)
-            priorities.insert_callback(callback, self.callbacks)
+            self.insert(FilterCallback(func, priority=priority))
             return func
 
         return inner
 
+    def insert(self, callback: FilterCallback[T1, T2]) -> None:
+        """
+        Add a callback to the filter, sorted by priority.
+        """
+        if self.bulk_depth > 0:
+            self.callbacks.append(callback)
+        else:
+            priorities.insert_callback(callback, self.callbacks)
+        self.compiled = None
+
+    @contextmanager
+    def bulk_add(self) -> t.Iterator[None]:
+        """
+        Context manager to efficiently add many callbacks to the filter.
+
+        Within this context, new callbacks are appended to the list of callbacks, which
+        is sorted by priority just once, on exit. The result is the same as adding the
+        callbacks one by one. Because callbacks are not sorted until then, the filter
+        should not be applied from within this context.
+
+        Usage::
+
+            with my_filter.bulk_add():
+                for item in items:
+                    my_filter.add_item(item)
+        """
+        if self.bulk_depth == 0:
+            self.bulk_start = len(self.callbacks)
+        self.bulk_depth += 1
+        try:
+            yield
+        finally:
+            self.bulk_depth -= 1
+            if self.bulk_depth == 0:
+                priorities.sort_callbacks(self.callbacks, start=self.bulk_start)
+                self.compiled = None
+
+    def compile(self) -> list[FilterCallback[T1, T2]]:
+        """
+        Return the chain of callbacks that are applied when no context is specified.
+
+        Consecutive callbacks that add static items (see :py:meth:`add_items`) are merged
+        into a single callback, such that items are concatenated just once, and not every
+        time the filter is applied. The chain is computed again whenever callbacks are
+        added or cleared.
+        """
+        if self.compiled is None:
+            compiled: list[FilterCallback[T1, T2]] = []
+            items: t.Optional[list[t.Any]] = None
+            for callback in self.callbacks:
+                if callback.items is None:
+                    compiled.append(callback)
+                    items = None
+                elif items is None:
+                    # Items from the following callbacks will be added to this list
+                    items = list(callback.items)
+                    merged: FilterCallback[T1, T2] = FilterCallback(
+                        t.cast(FilterCallbackFunc[T1, T2], _items_callback(items)),
+                        priority=callback.priority,
+                        items=items,
+                    )
+                    merged.contexts = callback.contexts[:]
+                    compiled.append(merged)
+                else:
+                    items += callback.items
+                    merged.contexts += [
+                        context
+                        for context in callback.contexts
+                        if context not in merged.contexts
+                    ]
+            self.compiled = compiled
+        return self.compiled
+
     def apply(
         self,
         value: T1,
@@ -139,7 +222,8 @@ class Filter(t.Generic[T1, T2]):
 
         If ``context`` is None then it is ignored.
         """
-        for callback in self.callbacks:
+        callbacks = self.compile() if context is None else self.callbacks
+        for callback in callbacks:
             if callback.is_in_context(context):
                 try:
                     value = callback.apply(
@@ -163,6 +247,9 @@ class Filter(t.Generic[T1, T2]):
             for callback in self.callbacks
             if not callback.is_in_context(context)
         ]
+        # Callbacks added in bulk must all be sorted again
+        self.bulk_start = 0
+        self.compiled = None
 
     @classmethod
     def clear_all(cls, context: t.Optional[str] = None) -> None:
@@ -226,11 +313,9 @@ class Filter(t.Generic[T1, T2]):
             my_filter.add_item("item2")
         """
 
-        @self.add(priority=priority)
-        def callback(
-            values: list[L], /, *_args: T2.args, **_kwargs: T2.kwargs
-        ) -> list[L]:
-            return values + items
+        self.insert(
+            FilterCallback(_items_callback(items), priority=priority, items=items)
+        )
 
     def iterate(
         self: "Filter[list[L], T2]", *args: T2.args, **kwargs: T2.kwargs
@@ -261,4 +346,21 @@ class Filter(t.Generic[T1, T2]):
         """
         Same as :py:func:`Filter.iterate` but apply only callbacks from a given context.
         """
+        if context is None:
+            compiled = self.compile()
+            if len(compiled) == 1 and compiled[0].items is not None:
+                # The filter only has static items: there is no need to copy them
+                yield from compiled[0].items
+                return
         yield from self.apply_from_context(context, [], *args, **kwargs)
+
+
+def _items_callback(items: list[L]) -> t.Callable[..., list[L]]:
+    """
+    Callback that appends static items to a list.
+    """
+
+    def callback(values: list[L], /, *_args: t.Any, **_kwargs: t.Any) -> list[L]:
+        return values + items
+
+    return callback
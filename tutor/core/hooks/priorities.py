@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import heapq
 import typing as t
 
 from typing_extensions import Protocol
@@ -21,11 +22,45 @@ TPrioritized = t.TypeVar("TPrioritized", bound=PrioritizedCallback)
 
 
 def insert_callback(callback: TPrioritized, callbacks: list[TPrioritized]) -> None:
-    # I wish we could use bisect.insort_right here but the `key=` parameter
-    # is unsupported in Python 3.9
-    position = 0
-    while (
-        position < len(callbacks) and callbacks[position].priority <= callback.priority
-    ):
-        position += 1
-    callbacks.insert(position, callback)
+    """
+    Insert a callback in a list of callbacks sorted by priority. Callbacks with the same
+    priority remain sorted in the order they were added.
+    """
+    if not callbacks or callbacks[-1].priority <= callback.priority:
+        # Fast path: most callbacks are added with increasing priorities
+        callbacks.append(callback)
+        return
+    # Binary search, equivalent to:
+    #   bisect.insort_right(callbacks, callback, key=lambda c: c.priority)
+    # But the `key=` parameter is unsupported in Python 3.9
+    low, high = 0, len(callbacks)
+    while low < high:
+        middle = (low + high) // 2
+        if callback.priority < callbacks[middle].priority:
+            high = middle
+        else:
+            low = middle + 1
+    callbacks.insert(low, callback)
+
+
+def sort_callbacks(callbacks: list[TPrioritized], start: int = 0) -> None:
+    """
+    Sort callbacks by priority, assuming that ``callbacks[:start]`` is already sorted.
+
+    The sort is stable: callbacks with the same priority remain sorted in the order
+    they were added. Thus, the result is the same as inserting the callbacks after
+    ``start`` one by one with :py:func:`insert_callback`.
+    """
+    if start >= len(callbacks):
+        return
+    added = sorted(callbacks[start:], key=get_priority)
+    if start > 0 and callbacks[start - 1].priority > added[0].priority:
+        # Merge new callbacks with the existing ones. In case of equal priorities,
+        # existing callbacks come first.
+        callbacks[:] = heapq.merge(callbacks[:start], added, key=get_priority)
+    else:
+        callbacks[start:] = added
+
+
+def get_priority(callback: PrioritizedCallback) -> int:
+    return callback.priority
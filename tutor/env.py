@@ -1,20 +1,27 @@
 from __future__ import annotations
 
+import bisect
+import hashlib
+import json
 import os
 import re
 import shutil
 import typing as t
+from collections import ChainMap
+from contextlib import contextmanager
 from copy import deepcopy
 
 import importlib_resources
 import jinja2
+import jinja2.runtime
 
-from tutor import exceptions, fmt, hooks, plugins, utils
+from tutor import exceptions, fmt, hooks, plugins, trace, utils
 from tutor.__about__ import __app__, __version__, __version_suffix__
 from tutor.types import Config, ConfigValue
 
 TEMPLATES_ROOT = str(importlib_resources.files("tutor") / "templates")
 VERSION_FILENAME = "version"
+MANIFEST_FILENAME = ".manifest.json"
 BIN_FILE_EXTENSIONS = [
     ".ico",
     ".jpg",
@@ -79,13 +86,129 @@ def _prepare_environment() -> None:
 _prepare_environment()
 
 
+class TemplateDependencies:
+    """
+    Inputs that were read while rendering a template: names of the variables that were
+    looked up, names of the patches that were expanded and names of the templates that
+    were loaded, including the rendered template itself and its includes.
+    """
+
+    def __init__(self) -> None:
+        self.variables: set[str] = set()
+        self.patches: set[str] = set()
+        self.templates: set[str] = set()
+
+    def update(self, other: TemplateDependencies) -> None:
+        self.variables.update(other.variables)
+        self.patches.update(other.patches)
+        self.templates.update(other.templates)
+
+
+class DependencyTrackingContext(jinja2.runtime.Context):
+    """
+    Jinja rendering context which records the variables that are looked up by templates.
+    """
+
+    def resolve_or_missing(self, key: str) -> t.Any:
+        if isinstance(self.environment, JinjaEnvironment):
+            if self.environment.dependencies is not None:
+                self.environment.dependencies.variables.add(key)
+        return super().resolve_or_missing(key)
+
+
+class BytecodeCache(jinja2.FileSystemBytecodeCache):
+    """
+    Persistent cache of compiled templates, stored in $TUTOR_ROOT/.cache/jinja2.
+
+    The cache directory is created on demand, but only as long as the project root
+    exists. Caching is just an optimization, so that errors that occur while writing to
+    the cache are ignored.
+    """
+
+    def __init__(self, root: str) -> None:
+        self.root = root
+        super().__init__(cache_path(root, "jinja2"))
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        if not os.path.isdir(self.root):
+            # The project root was removed, for instance a temporary root
+            return
+        try:
+            utils.ensure_directory_exists(self.directory)
+            super().dump_bytecode(bucket)
+        except (OSError, exceptions.TutorError):
+            pass
+
+
+# Compiled templates are stored in this cache, when the project root is known (see
+# _enable_bytecode_cache).
+_BYTECODE_CACHE: t.Optional[BytecodeCache] = None
+
+
 class JinjaEnvironment(jinja2.Environment):
     loader: jinja2.FileSystemLoader
+    context_class = DependencyTrackingContext
 
     def __init__(self) -> None:
         template_roots = hooks.Filters.ENV_TEMPLATE_ROOTS.apply([TEMPLATES_ROOT])
         loader = jinja2.FileSystemLoader(template_roots)
-        super().__init__(loader=loader, undefined=jinja2.StrictUndefined)
+        super().__init__(
+            loader=loader,
+            undefined=jinja2.StrictUndefined,
+            bytecode_cache=_BYTECODE_CACHE,
+        )
+        # When set, template inputs are recorded in this object (see Renderer.track_dependencies)
+        self.dependencies: t.Optional[TemplateDependencies] = None
+        # Compiled templates from strings (see compile_str)
+        self.string_templates: dict[str, jinja2.Template] = {}
+
+    def compile_str(self, text: str) -> jinja2.Template:
+        """
+        Same as `from_string`, but compiled templates are stored in memory and in the
+        bytecode cache, such that the same string is compiled just once.
+        """
+        template = self.string_templates.get(text)
+        if template is None:
+            if self.bytecode_cache is None:
+                template = self.from_string(text)
+            else:
+                bucket = self.bytecode_cache.get_bucket(self, text, None, text)
+                if bucket.code is None:
+                    bucket.code = self.compile(text)
+                    self.bytecode_cache.set_bucket(bucket)
+                template = self.template_class.from_code(
+                    self, bucket.code, self.make_globals(None)
+                )
+            self.string_templates[text] = template
+        return template
+
+    def get_template(
+        self,
+        name: t.Union[str, jinja2.Template],
+        parent: t.Optional[str] = None,
+        globals: t.Optional[t.MutableMapping[str, t.Any]] = None,
+    ) -> jinja2.Template:
+        """
+        Same as the parent method, but keep track of loaded templates, such that
+        `{% include ... %}` statements are recorded as dependencies.
+        """
+        template = super().get_template(name, parent=parent, globals=globals)
+        self.track_template(template)
+        return template
+
+    def select_template(
+        self,
+        names: t.Iterable[t.Union[str, jinja2.Template]],
+        parent: t.Optional[str] = None,
+        globals: t.Optional[t.MutableMapping[str, t.Any]] = None,
+    ) -> jinja2.Template:
+        template = super().select_template(names, parent=parent, globals=globals)
+        self.track_template(template)
+        return template
+
+    def track_template(self, template: jinja2.Template) -> None:
+        if self.dependencies is not None and template.name is not None:
+            self.dependencies.templates.add(template.name)
 
     def read_str(self, template_name: str) -> str:
         return self.read_bytes(template_name).decode()
@@ -103,9 +226,31 @@ class JinjaEnvironment(jinja2.Environment):
         raise ValueError("Template path does not exist")
 
 
+def evaluated_at_runtime(func: JinjaFilter) -> JinjaFilter:
+    """
+    Prevent Jinja from evaluating a filter at compile time.
+
+    When a filter is called with constant arguments, Jinja evaluates it once during
+    compilation and stores the result in the compiled template. Because compiled
+    templates are cached, the results of filters such as "random_string" would then
+    be identical across renders. Context filters are never evaluated at compile time.
+    """
+    if hasattr(func, "jinja_pass_arg"):
+        # Filter already has a special signature (context, environment, etc.)
+        return func
+
+    @jinja2.pass_context
+    def filter_func(
+        _context: jinja2.runtime.Context, *args: t.Any, **kwargs: t.Any
+    ) -> t.Any:
+        return func(*args, **kwargs)
+
+    return filter_func
+
+
 class Renderer:
     def __init__(self, config: t.Optional[Config] = None):
-        self.config = deepcopy(config or {})
+        self.config: t.Mapping[str, t.Any] = deepcopy(config or {})
 
         # Create environment with extra filters and globals
         self.environment = JinjaEnvironment()
@@ -115,7 +260,7 @@ class Renderer:
         for name, func in plugin_filters:
             if name in self.environment.filters:
                 fmt.echo_alert(f"Found conflicting template filters named '{name}'")
-            self.environment.filters[name] = func
+            self.environment.filters[name] = evaluated_at_runtime(func)
         self.environment.filters["walk_templates"] = self.walk_templates
 
         # Globals
@@ -126,18 +271,46 @@ class Renderer:
         self.environment.globals["iter_values_named"] = self.iter_values_named
         self.environment.globals["patch"] = self.patch
 
+        # Rendered patches, indexed by (name, separator, suffix), along with their
+        # inputs. Patches only depend on the configuration, so that they can be reused
+        # across templates.
+        self.rendered_patches: dict[
+            tuple[str, str, str], tuple[str, TemplateDependencies]
+        ] = {}
+
+    @contextmanager
+    def track_dependencies(self) -> t.Iterator[TemplateDependencies]:
+        """
+        Record the inputs of all templates rendered within this context.
+
+        Usage::
+
+            with renderer.track_dependencies() as dependencies:
+                renderer.render_template("local/docker-compose.yml")
+            print(dependencies.variables)
+        """
+        dependencies = TemplateDependencies()
+        parent_dependencies = self.environment.dependencies
+        self.environment.dependencies = dependencies
+        try:
+            yield dependencies
+        finally:
+            self.environment.dependencies = parent_dependencies
+            if parent_dependencies is not None:
+                parent_dependencies.update(dependencies)
+
     def iter_templates_in(self, *prefix: str) -> t.Iterable[str]:
         """
         The elements of `prefix` must contain only "/", and not os.sep.
         """
         full_prefix = "/".join(prefix)
-        env_templates: list[str] = self.environment.loader.list_templates()
-        for template in env_templates:
-            if template.startswith(full_prefix):
-                # Exclude templates that match certain patterns
-                # Note that here we don't rely on the OS separator, as we are handling templates.
-                if is_rendered(template):
-                    yield template
+        templates = _list_rendered_templates(tuple(self.environment.loader.searchpath))
+        # Templates are sorted, so that templates with the same prefix are contiguous
+        start = bisect.bisect_left(templates, full_prefix)
+        for template in templates[start:]:
+            if not template.startswith(full_prefix):
+                break
+            yield template
 
     def iter_values_named(
         self,
@@ -157,6 +330,8 @@ class Renderer:
                 continue
             if suffix is not None and not var_name.endswith(suffix):
                 continue
+            if self.environment.dependencies is not None:
+                self.environment.dependencies.variables.add(var_name)
             if not allow_empty and not value:
                 continue
             yield value
@@ -174,21 +349,36 @@ class Renderer:
         """
         Render calls to {{ patch("...") }} in environment templates from plugin patches.
         """
-        patches = []
-        for patch in plugins.iter_patches(name):
-            try:
-                patches.append(self.render_str(patch))
-            except exceptions.TutorError:
-                fmt.echo_error(f"Error rendering patch '{name}':\n{patch}")
-                raise
+        key = (name, separator, suffix)
+        if key in self.rendered_patches:
+            # Patches are rendered just once, but their inputs are still recorded
+            rendered, dependencies = self.rendered_patches[key]
+            if self.environment.dependencies is not None:
+                self.environment.dependencies.update(dependencies)
+            return rendered
+
+        with self.track_dependencies() as dependencies:
+            dependencies.patches.add(name)
+            patches = []
+            for patch in plugins.iter_patches(name):
+                try:
+                    patches.append(self.render_str(patch))
+                except exceptions.TutorError:
+                    fmt.echo_error(f"Error rendering patch '{name}':\n{patch}")
+                    raise
         rendered = separator.join(patches)
         if rendered:
             rendered += suffix
+        self.rendered_patches[key] = (rendered, dependencies)
         return rendered
 
     def render_str(self, text: str) -> str:
+        if not has_markup(text):
+            # No need to compile templates without markup. Note that Jinja removes a
+            # single trailing newline.
+            return text[:-1] if text.endswith("\n") else text
         try:
-            template = self.environment.from_string(text)
+            template = self.environment.compile_str(text)
         except jinja2.exceptions.TemplateSyntaxError as e:
             raise exceptions.TutorError(f"Template syntax error: {e.args[0]}")
         return self.__render(template)
@@ -201,6 +391,8 @@ class Renderer:
         The template_name *always* uses "/" separators, and is not os-dependent. Do not pass the result of
         os.path.join(...) to this function.
         """
+        if self.environment.dependencies is not None:
+            self.environment.dependencies.templates.add(template_name)
         if not hooks.Filters.IS_FILE_RENDERED.apply(True, template_name):
             return self.environment.read_bytes(template_name)
 
@@ -229,10 +421,22 @@ class Renderer:
             write_to(rendered, template_dst)
 
     def __render(self, template: jinja2.Template) -> str:
+        # Configuration values are looked up on demand, instead of being copied to a
+        # new dict for every rendered template. This is also what makes it possible to
+        # render lazy configuration objects.
+        # Shared variables are only ever read from, so they need not be a dict. The
+        # first, empty map is the one that gets copied by jinja2 when it generates
+        # tracebacks.
+        variables = ChainMap(
+            {}, t.cast(t.MutableMapping[str, t.Any], self.config), template.globals
+        )
+        context = template.new_context(t.cast(dict[str, t.Any], variables), shared=True)
         try:
-            return template.render(**self.config)
+            return self.environment.concat(template.root_render_func(context))
         except jinja2.exceptions.UndefinedError as e:
             raise exceptions.TutorError(f"Missing configuration value: {e.args[0]}")
+        except Exception:
+            self.environment.handle_exception()
 
 
 class PatchRenderer(Renderer):
@@ -298,6 +502,55 @@ class PatchRenderer(Renderer):
         fmt.echo(utils.format_table(plugins_table))
 
 
+class DependencyRenderer(Renderer):
+    """
+    Render templates to collect the config values, patches and included templates that
+    each of them depends on.
+    """
+
+    def __init__(self, config: t.Optional[Config] = None):
+        self.dependencies: dict[str, TemplateDependencies] = {}
+        super().__init__(config)
+
+    def render_template(self, template_name: str) -> t.Union[str, bytes]:
+        """
+        Render the template and store its dependencies.
+        """
+        with self.track_dependencies() as dependencies:
+            rendered = super().render_template(template_name)
+        self.dependencies[template_name] = dependencies
+        return rendered
+
+    def render_all(self, *prefix: str) -> None:
+        """
+        Render all templates.
+        """
+        for template_name in self.iter_templates_in(*prefix):
+            self.render_template(template_name)
+
+    def get_dependencies(self, template_name: str) -> TemplateDependencies:
+        """
+        Return the dependencies of a single template, rendering it if necessary.
+
+        Variables that are not config keys (such as template globals) are discarded.
+        """
+        if template_name not in self.dependencies:
+            self.render_template(template_name)
+        dependencies = self.dependencies[template_name]
+        config_dependencies = TemplateDependencies()
+        config_dependencies.update(dependencies)
+        config_dependencies.variables.intersection_update(self.config.keys())
+        return config_dependencies
+
+
+def has_markup(text: str) -> bool:
+    """
+    Return whether a string may contain Jinja markup, or line endings that would be
+    modified by the Jinja renderer.
+    """
+    return "{" in text or "\r" in text
+
+
 def is_rendered(path: str) -> bool:
     """
     Return whether the template should be rendered or not.
@@ -305,15 +558,46 @@ def is_rendered(path: str) -> bool:
     If the path matches an include pattern, it is rendered. If not and it matches an
     ignore pattern, it is not rendered. By default, all files are rendered.
     """
-    for include_pattern in hooks.Filters.ENV_PATTERNS_INCLUDE.iterate():
-        if re.match(include_pattern, path):
+    include_patterns, ignore_patterns = _compiled_patterns()
+    for include_pattern in include_patterns:
+        if include_pattern.match(path):
             return True
-    for ignore_pattern in hooks.Filters.ENV_PATTERNS_IGNORE.iterate():
-        if re.match(ignore_pattern, path):
+    for ignore_pattern in ignore_patterns:
+        if ignore_pattern.match(path):
             return False
     return True
 
 
+@hooks.lru_cache
+def _compiled_patterns() -> tuple[list[re.Pattern[str]], list[re.Pattern[str]]]:
+    """
+    Compiled include and ignore patterns, implemented for performance reasons.
+    """
+    return (
+        [
+            re.compile(pattern)
+            for pattern in hooks.Filters.ENV_PATTERNS_INCLUDE.iterate()
+        ],
+        [
+            re.compile(pattern)
+            for pattern in hooks.Filters.ENV_PATTERNS_IGNORE.iterate()
+        ],
+    )
+
+
+@hooks.lru_cache
+def _list_rendered_templates(template_roots: tuple[str, ...]) -> list[str]:
+    """
+    Sorted list of the templates from the template roots that should be rendered.
+
+    Listing templates requires walking all template roots, so the result is computed
+    just once and then reused until plugins are loaded or unloaded. Template files
+    that are added in the meantime will be ignored.
+    """
+    loader = jinja2.FileSystemLoader(template_roots)
+    return [template for template in loader.list_templates() if is_rendered(template)]
+
+
 # Skip rendering some files that follow commonly-ignored patterns:
 #
 #   .*
@@ -333,16 +617,41 @@ hooks.Filters.ENV_PATTERNS_IGNORE.add_items(
 )
 
 
-def save(root: str, config: Config) -> None:
+@trace.traced("env.save")
+def save(root: str, config: Config, incremental: bool = False, jobs: int = 1) -> None:
     """
     Save the full environment, including version information.
+
+    In incremental mode, files whose inputs did not change since the last save are
+    neither rendered nor written (see :py:class:`EnvManifest`). When `jobs` > 1,
+    templates are rendered concurrently by as many worker processes.
     """
     root_env = pathjoin(root)
-    for src, dst in hooks.Filters.ENV_TEMPLATE_TARGETS.iterate():
-        save_all_from(src, os.path.join(root_env, dst), config)
+    manifest = EnvManifest(root, config)
+    if incremental:
+        manifest.load()
+    targets = [
+        (src, os.path.join(root_env, dst))
+        for src, dst in hooks.Filters.ENV_TEMPLATE_TARGETS.iterate()
+    ]
+    if jobs > 1:
+        save_all_parallel(targets, config, manifest, jobs)
+    else:
+        # The same renderer is used for all targets, such that patches are rendered
+        # just once
+        renderer = get_renderer(config)
+        for src, dst in targets:
+            _save_all_from(renderer, src, dst, manifest=manifest)
+    manifest.save()
 
     upgrade_obsolete(root)
-    fmt.echo_info(f"Environment generated in {base_dir(root)}")
+    if incremental:
+        fmt.echo_info(
+            f"Environment generated in {base_dir(root)} "
+            f"({manifest.rendered_count} files rendered, {manifest.skipped_count} unchanged)"
+        )
+    else:
+        fmt.echo_info(f"Environment generated in {base_dir(root)}")
 
 
 def upgrade_obsolete(_root: str) -> None:
@@ -351,13 +660,313 @@ def upgrade_obsolete(_root: str) -> None:
     """
 
 
-def save_all_from(prefix: str, dst: str, config: Config) -> None:
+def save_all_from(
+    prefix: str, dst: str, config: Config, manifest: t.Optional[EnvManifest] = None
+) -> None:
     """
     Render the templates that start with `prefix` and store them with the same
     hierarchy at `dst`. Here, `prefix` can be the result of os.path.join(...).
+
+    When a manifest is passed, the inputs of every rendered file are recorded in it,
+    and files that are already up-to-date in the manifest are skipped.
+    """
+    _save_all_from(get_renderer(config), prefix, dst, manifest=manifest)
+
+
+def _save_all_from(
+    renderer: Renderer,
+    prefix: str,
+    dst: str,
+    manifest: t.Optional[EnvManifest] = None,
+) -> None:
+    if manifest is None:
+        renderer.render_all_to(dst, prefix.replace(os.sep, "/"))
+        return
+    for template_name in renderer.iter_templates_in(prefix.replace(os.sep, "/")):
+        template_dst = os.path.join(dst, template_name.replace("/", os.sep))
+        if manifest.is_up_to_date(template_dst, renderer):
+            manifest.skip(template_dst)
+            continue
+        with renderer.track_dependencies() as dependencies:
+            rendered = renderer.render_template(template_name)
+        if not manifest.is_written(template_dst, rendered):
+            write_to(rendered, template_dst)
+        manifest.record(template_dst, rendered, dependencies, renderer)
+
+
+def save_all_parallel(
+    targets: list[tuple[str, str]], config: Config, manifest: EnvManifest, jobs: int
+) -> None:
+    """
+    Same as :py:func:`save_all_from` for multiple (prefix, dst) targets, but templates
+    are rendered by `jobs` worker processes.
+
+    Workers are forked from the current process, such that they share the loaded
+    plugins and the pre-built renderer. Files are written by the current process, in
+    the same order as the sequential rendering, and only after all templates have been
+    successfully rendered: a rendering error does not leave the environment half
+    written. Files are not written to a temporary location first, because that would
+    break the single-file bind-mounts of docker-compose services.
+    """
+    # These modules are slow to import, and rarely needed
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    if "fork" not in multiprocessing.get_all_start_methods():
+        fmt.echo_alert(
+            "Parallel rendering is not supported on this platform: rendering templates sequentially"
+        )
+        for src, dst in targets:
+            save_all_from(src, dst, config, manifest=manifest)
+        return
+
+    renderer = get_renderer(config)
+    pending: list[tuple[str, str]] = []
+    for prefix, dst in targets:
+        for template_name in renderer.iter_templates_in(prefix.replace(os.sep, "/")):
+            template_dst = os.path.join(dst, template_name.replace("/", os.sep))
+            if manifest.is_up_to_date(template_dst, renderer):
+                manifest.skip(template_dst)
+            else:
+                pending.append((template_name, template_dst))
+
+    # Spread templates evenly across shards
+    template_names = sorted({template_name for template_name, _dst in pending})
+    shards = [template_names[i::jobs] for i in range(jobs) if template_names[i::jobs]]
+    results: dict[str, tuple[t.Union[str, bytes], TemplateDependencies]] = {}
+    if shards:
+        with ProcessPoolExecutor(
+            max_workers=len(shards),
+            mp_context=multiprocessing.get_context("fork"),
+            initializer=_init_render_worker,
+            initargs=(renderer,),
+        ) as executor:
+            for shard_results in executor.map(_render_templates, shards):
+                results.update(shard_results)
+
+    for template_name, template_dst in pending:
+        rendered, dependencies = results[template_name]
+        if not manifest.is_written(template_dst, rendered):
+            write_to(rendered, template_dst)
+        manifest.record(template_dst, rendered, dependencies, renderer)
+
+
+# Renderer of the current worker process (see save_all_parallel)
+_WORKER_RENDERER: t.Optional[Renderer] = None
+
+
+def _init_render_worker(renderer: Renderer) -> None:
+    global _WORKER_RENDERER
+    _WORKER_RENDERER = renderer
+
+
+def _render_templates(
+    template_names: list[str],
+) -> dict[str, tuple[t.Union[str, bytes], TemplateDependencies]]:
+    """
+    Render a shard of templates in a worker process.
+    """
+    assert _WORKER_RENDERER is not None
+    results = {}
+    for template_name in template_names:
+        with _WORKER_RENDERER.track_dependencies() as dependencies:
+            rendered = _WORKER_RENDERER.render_template(template_name)
+        results[template_name] = (rendered, dependencies)
+    return results
+
+
+class EnvManifest:
+    """
+    Record of the inputs that were used to render each file of the environment.
+
+    For every rendered file, we store the hash of the rendered output, along with the
+    hashes of the config values, patches and template sources that were read during
+    rendering. When all these hashes match the current ones, the file does not need to
+    be rendered again. The manifest is discarded entirely whenever something that is not
+    tracked per-file changes: Tutor version, enabled plugins, template roots, template
+    names or the list of config keys.
+
+    The manifest is stored in $TUTOR_ROOT/env/.manifest.json.
+    """
+
+    def __init__(self, root: str, config: Config) -> None:
+        self.root = root
+        self.config = config
+        self.path = pathjoin(root, MANIFEST_FILENAME)
+        self.inputs = self._hash_inputs()
+        # Entries from the previous save
+        self.previous: dict[str, dict[str, t.Any]] = {}
+        # Entries from the current save
+        self.files: dict[str, dict[str, t.Any]] = {}
+        self.rendered_count = 0
+        self.skipped_count = 0
+        # Caches: hashes are computed at most once per save
+        self._config_hashes: dict[str, str] = {}
+        self._patch_hashes: dict[str, str] = {}
+        self._template_hashes: dict[str, t.Optional[str]] = {}
+
+    def load(self) -> bool:
+        """
+        Load entries from the previous save. Entries are ignored if global inputs have
+        changed.
+
+        Return True if entries were loaded.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(manifest, dict) or manifest.get("inputs") != self.inputs:
+            return False
+        files = manifest.get("files")
+        if not isinstance(files, dict):
+            return False
+        self.previous = files
+        return True
+
+    def save(self) -> None:
+        write_to(
+            json.dumps({"inputs": self.inputs, "files": self.files}, sort_keys=True),
+            self.path,
+        )
+
+    def is_up_to_date(self, path: str, renderer: Renderer) -> bool:
+        """
+        Return True if the file at `path` was rendered from the same inputs and was not
+        modified since.
+        """
+        entry = self.previous.get(self._key(path))
+        if entry is None:
+            return False
+        for name, digest in entry["templates"].items():
+            if self._hash_template(name, renderer) != digest:
+                return False
+        for name, digest in entry["config"].items():
+            if self._hash_config(name) != digest:
+                return False
+        for name, digest in entry["patches"].items():
+            if self._hash_patch(name) != digest:
+                return False
+        return self._is_unmodified(path, entry["output"])
+
+    def is_written(self, path: str, rendered: t.Union[str, bytes]) -> bool:
+        """
+        Return True if the file at `path` was previously rendered with the same output
+        and was not modified since. In that case, there is no need to write it again.
+        """
+        entry = self.previous.get(self._key(path))
+        if entry is None or entry["output"] != _hash(rendered):
+            return False
+        return self._is_unmodified(path, entry["output"])
+
+    def skip(self, path: str) -> None:
+        key = self._key(path)
+        self.files[key] = self.previous[key]
+        self.skipped_count += 1
+
+    def record(
+        self,
+        path: str,
+        rendered: t.Union[str, bytes],
+        dependencies: TemplateDependencies,
+        renderer: Renderer,
+    ) -> None:
+        self.files[self._key(path)] = {
+            "output": _hash(rendered),
+            "templates": {
+                name: self._hash_template(name, renderer)
+                for name in sorted(dependencies.templates)
+            },
+            "config": {
+                name: self._hash_config(name)
+                for name in sorted(dependencies.variables)
+                if name in self.config
+            },
+            "patches": {
+                name: self._hash_patch(name) for name in sorted(dependencies.patches)
+            },
+        }
+        self.rendered_count += 1
+
+    def iter_dependents(
+        self,
+        config_key: t.Optional[str] = None,
+        patch: t.Optional[str] = None,
+        template: t.Optional[str] = None,
+    ) -> t.Iterator[str]:
+        """
+        Iterate on the files from the last save which depend on the given config key,
+        patch or template. Paths are relative to the environment base directory.
+
+        This does not require any rendering, but the manifest must be loaded first.
+        """
+        for path, entry in sorted(self.previous.items()):
+            if (
+                (config_key is not None and config_key in entry["config"])
+                or (patch is not None and patch in entry["patches"])
+                or (template is not None and template in entry["templates"])
+            ):
+                yield path
+
+    def _is_unmodified(self, path: str, digest: str) -> bool:
+        if not os.path.isfile(path):
+            return False
+        with open(path, "rb") as f:
+            return _hash(f.read()) == digest
+
+    def _key(self, path: str) -> str:
+        return os.path.relpath(path, base_dir(self.root)).replace(os.sep, "/")
+
+    def _hash_inputs(self) -> str:
+        environment = JinjaEnvironment()
+        return _hash(
+            {
+                "version": __version__,
+                "plugins": sorted(plugins.iter_loaded()),
+                "plugins_info": sorted(plugins.iter_info(), key=str),
+                "template_roots": environment.loader.searchpath,
+                "templates": sorted(environment.loader.list_templates()),
+                "variables": sorted(
+                    (name, value)
+                    for name, value in hooks.Filters.ENV_TEMPLATE_VARIABLES.iterate()
+                    if not callable(value)
+                ),
+                "config": sorted(self.config.keys()),
+            }
+        )
+
+    def _hash_config(self, name: str) -> str:
+        if name not in self._config_hashes:
+            self._config_hashes[name] = _hash(self.config.get(name))
+        return self._config_hashes[name]
+
+    def _hash_patch(self, name: str) -> str:
+        if name not in self._patch_hashes:
+            self._patch_hashes[name] = _hash(list(plugins.iter_patches(name)))
+        return self._patch_hashes[name]
+
+    def _hash_template(self, name: str, renderer: Renderer) -> t.Optional[str]:
+        if name not in self._template_hashes:
+            try:
+                self._template_hashes[name] = _hash(
+                    renderer.environment.read_bytes(name)
+                )
+            except ValueError:
+                # Template was removed
+                self._template_hashes[name] = None
+        return self._template_hashes[name]
+
+
+def _hash(value: t.Any) -> str:
     """
-    renderer = Renderer(config)
-    renderer.render_all_to(dst, prefix.replace(os.sep, "/"))
+    Compute the sha256 digest of str/bytes content or of any json-serializable object.
+    """
+    if isinstance(value, str):
+        value = value.encode()
+    elif not isinstance(value, bytes):
+        value = json.dumps(value, sort_keys=True, default=str).encode()
+    return hashlib.sha256(value).hexdigest()
 
 
 def write_to(content: t.Union[str, bytes], path: str) -> None:
@@ -373,16 +982,81 @@ def write_to(content: t.Union[str, bytes], path: str) -> None:
             of_text.write(content)
 
 
+def get_renderer(config: t.Mapping[str, t.Any]) -> Renderer:
+    """
+    Return a renderer for the given configuration object.
+
+    The same renderer is returned for subsequent calls with the same config object, such
+    that compiled templates are reused. The renderer is reset whenever plugins are
+    loaded or unloaded, and whenever the template filters, roots or variables are
+    modified. Note that, as opposed to `Renderer(config)`, the configuration is not
+    copied: changes made to the config object are visible to the renderer.
+    """
+    global _SHARED_RENDERER, _SHARED_RENDERER_CALLBACKS
+    callbacks = _get_renderer_callbacks()
+    if (
+        _SHARED_RENDERER is None
+        or _SHARED_RENDERER.config is not config
+        or _SHARED_RENDERER_CALLBACKS != callbacks
+    ):
+        # We don't pass the config to the constructor, to avoid a deep copy
+        _SHARED_RENDERER = Renderer()
+        _SHARED_RENDERER.config = config
+        _SHARED_RENDERER_CALLBACKS = callbacks
+    else:
+        # The config object might have been modified since the last call
+        _SHARED_RENDERER.rendered_patches.clear()
+    return _SHARED_RENDERER
+
+
+def _get_renderer_callbacks() -> tuple[tuple[t.Any, ...], ...]:
+    """
+    Callbacks of the filters that are applied when creating a renderer. Callbacks may
+    be added outside of plugin loading, and the shared renderer must then be recreated.
+    """
+    return (
+        tuple(hooks.Filters.ENV_TEMPLATE_FILTERS.callbacks),
+        tuple(hooks.Filters.ENV_TEMPLATE_ROOTS.callbacks),
+        tuple(hooks.Filters.ENV_TEMPLATE_VARIABLES.callbacks),
+    )
+
+
+_SHARED_RENDERER: t.Optional[Renderer] = None
+_SHARED_RENDERER_CALLBACKS: tuple[tuple[t.Any, ...], ...] = ()
+
+
+@hooks.Actions.PLUGIN_LOADED.add()
+def _reset_shared_renderer_on_load(_plugin: str) -> None:
+    global _SHARED_RENDERER
+    _SHARED_RENDERER = None
+
+
+@hooks.Actions.PLUGIN_UNLOADED.add()
+def _reset_shared_renderer_on_unload(_plugin: str, _root: str, _config: Config) -> None:
+    global _SHARED_RENDERER
+    _SHARED_RENDERER = None
+
+
+@hooks.Actions.PROJECT_ROOT_READY.add()
+def _enable_bytecode_cache(root: str) -> None:
+    """
+    Store compiled templates in $TUTOR_ROOT/.cache/jinja2.
+    """
+    global _BYTECODE_CACHE, _SHARED_RENDERER
+    _BYTECODE_CACHE = BytecodeCache(root)
+    _SHARED_RENDERER = None
+
+
 def render_file(config: Config, *path: str) -> t.Union[str, bytes]:
     """
     Return the rendered contents of a template.
     """
-    renderer = Renderer(config)
+    renderer = get_renderer(config)
     template_name = "/".join(path)
     return renderer.render_template(template_name)
 
 
-def render_unknown(config: Config, value: t.Any) -> t.Any:
+def render_unknown(config: t.Mapping[str, t.Any], value: t.Any) -> t.Any:
     """
     Render an unknown `value` object with the selected config.
 
@@ -397,7 +1071,7 @@ def render_unknown(config: Config, value: t.Any) -> t.Any:
     return value
 
 
-def render_str(config: Config, text: str) -> str:
+def render_str(config: t.Mapping[str, t.Any], text: str) -> str:
     """
     Args:
         text (str)
@@ -406,7 +1080,7 @@ def render_str(config: Config, text: str) -> str:
     Return:
         substituted (str)
     """
-    return Renderer(config).render_str(text)
+    return get_renderer(config).render_str(text)
 
 
 def check_is_up_to_date(root: str) -> None:
@@ -522,6 +1196,13 @@ def data_path(root: str, *path: str) -> str:
     return os.path.join(root_dir(root), "data", *path)
 
 
+def cache_path(root: str, *path: str) -> str:
+    """
+    Return the file's absolute path inside the cache directory.
+    """
+    return os.path.join(root_dir(root), ".cache", *path)
+
+
 def pathjoin(root: str, *path: str) -> str:
     """
     Return the file's absolute path inside the environment.
@@ -212,6 +212,22 @@ class Filters:
     #:   may contain Jinja markup, similar to templates.
     CLI_DO_INIT_TASKS: Filter[list[tuple[str, str]], []] = Filter()
 
+    #: Declare which services must be initialised before the init tasks of a service.
+    #: This is only used when running ``do`` tasks concurrently, for instance with
+    #: ``tutor local do init --jobs=4``. The init tasks of a service always run in
+    #: their original order, after the previous init tasks of the services it depends
+    #: on. The init tasks of services that are not declared in this filter run alone,
+    #: after all previous tasks, as they do in sequential mode.
+    #:
+    #: :parameter list[tuple[str, tuple[str, ...]]] dependencies: list of ``(service,
+    #:   required_services)`` tuples. For instance, ``("myservice", ("mysql",))`` means
+    #:   that init tasks from "myservice" run after the init tasks of "mysql", but they may
+    #:   run concurrently with the init tasks of other declared services, such as "lms".
+    #:   A service without requirements is declared with an empty tuple.
+    CLI_DO_INIT_TASKS_DEPENDENCIES: Filter[list[tuple[str, tuple[str, ...]]], []] = (
+        Filter()
+    )
+
     #: List of folders to bind-mount in docker-compose containers, either in ``tutor local`` or ``tutor dev``.
     #:
     #: This filter is for processing values of the ``MOUNTS`` setting such as::
@@ -380,6 +396,17 @@ class Filters:
         list[tuple[str, Union[str, tuple[str, ...]], str, tuple[str, ...]]], [Config]
     ] = Filter()
 
+    #: Declare that an image must be built after another one, for instance because its
+    #: Dockerfile starts with ``FROM`` this other image. This is only useful when images
+    #: are built concurrently, with ``tutor images build --jobs=N ...``. Dependencies
+    #: which are not part of the same build command are ignored.
+    #:
+    #: :parameter list[tuple[str, str]] dependencies: list of ``(name, dependency)``
+    #:   tuples, where both values are image names from :py:data:`IMAGES_BUILD`. For
+    #:   instance, ``("myimage", "openedx")`` means that "myimage" is built after
+    #:   "openedx".
+    IMAGES_BUILD_DEPENDENCIES: Filter[list[tuple[str, str]], []] = Filter()
+
     #: List of image names which must be built prior to launching the platform. These
     #: images will be built on launch, in "dev" and "local" mode (but not in Kubernetes).
     #:
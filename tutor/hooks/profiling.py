@@ -0,0 +1,275 @@
+"""
+Measure the time spent in hook callbacks.
+
+Profiling is enabled by defining the ``TUTOR_PROFILE_HOOKS`` environment variable, or
+by running ``tutor --profile-hooks ...``. When the command exits, a report of the
+slowest callbacks is printed. When ``TUTOR_PROFILE_HOOKS`` is a file path (and not
+"1"), every callback call is also written to that file in the Chrome trace event
+format, which can be viewed in https://ui.perfetto.dev or chrome://tracing.
+
+Note that the environment variable makes it possible to profile the callbacks that
+are triggered before the command line arguments are parsed, such as plugin discovery.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import typing as t
+from time import perf_counter
+
+from tutor import fmt, trace
+from tutor.core.hooks import Action, Filter
+from tutor.core.hooks.actions import ActionCallback
+from tutor.core.hooks.filters import FilterCallback
+
+from .catalog import Actions, Filters
+
+ENV_VAR_NAME = "TUTOR_PROFILE_HOOKS"
+
+# Number of callbacks that are printed in the report
+REPORT_SIZE = 30
+
+
+class CallbackStats:
+    def __init__(self, hook: str, callback: str, plugin: str) -> None:
+        self.hook = hook
+        self.callback = callback
+        self.plugin = plugin
+        self.calls = 0
+        # Cumulative duration, in seconds, including the hooks that are triggered by the
+        # callback
+        self.duration = 0.0
+
+
+class HooksProfiler:
+    """
+    Record the number of calls and the cumulative duration of all filter and action
+    callbacks.
+
+    While the profiler is running, the methods that trigger hooks are replaced by
+    instrumented versions. There is no overhead when the profiler is stopped.
+    """
+
+    def __init__(self, trace_path: t.Optional[str] = None) -> None:
+        # Callback stats, indexed by (hook name, callback id). Callbacks are stored
+        # along with their stats, such that their ids can't be reused.
+        self.stats: dict[tuple[str, int], tuple[t.Any, CallbackStats]] = {}
+        # Chrome trace events, recorded only when there is a trace path
+        self.trace_path = trace_path
+        self.events: list[dict[str, t.Any]] = []
+        # Names of the hooks that are currently triggered
+        self.hooks: list[str] = []
+        self.hook_names = get_hook_names()
+        self.start_time = perf_counter()
+        self._originals: dict[tuple[type, str], t.Any] = {}
+
+    def start(self) -> None:
+        profiler = self
+        apply_from_context = Filter.apply_from_context
+        do_from_context = Action.do_from_context
+        apply = FilterCallback.apply
+        do = ActionCallback.do
+
+        def profiled_apply_from_context(
+            filtre: Filter[t.Any, t.Any], *args: t.Any, **kwargs: t.Any
+        ) -> t.Any:
+            profiler.hooks.append(profiler.get_hook_name(filtre))
+            try:
+                return apply_from_context(filtre, *args, **kwargs)
+            finally:
+                profiler.hooks.pop()
+
+        def profiled_do_from_context(
+            action: Action[t.Any], *args: t.Any, **kwargs: t.Any
+        ) -> None:
+            profiler.hooks.append(profiler.get_hook_name(action))
+            try:
+                do_from_context(action, *args, **kwargs)
+            finally:
+                profiler.hooks.pop()
+
+        def profiled_apply(
+            callback: FilterCallback[t.Any, t.Any], *args: t.Any, **kwargs: t.Any
+        ) -> t.Any:
+            start = perf_counter()
+            try:
+                return apply(callback, *args, **kwargs)
+            finally:
+                profiler.record(callback, start, perf_counter())
+
+        def profiled_do(
+            callback: ActionCallback[t.Any], *args: t.Any, **kwargs: t.Any
+        ) -> None:
+            start = perf_counter()
+            try:
+                do(callback, *args, **kwargs)
+            finally:
+                profiler.record(callback, start, perf_counter())
+
+        for cls, name, func in [
+            (Filter, "apply_from_context", profiled_apply_from_context),
+            (Action, "do_from_context", profiled_do_from_context),
+            (FilterCallback, "apply", profiled_apply),
+            (ActionCallback, "do", profiled_do),
+        ]:
+            self._originals[(cls, name)] = getattr(cls, name)
+            setattr(cls, name, func)
+
+    def stop(self) -> None:
+        for (cls, name), func in self._originals.items():
+            setattr(cls, name, func)
+        self._originals.clear()
+
+    def get_hook_name(self, hook: t.Union[Filter[t.Any, t.Any], Action[t.Any]]) -> str:
+        name = self.hook_names.get(id(hook))
+        if name is None:
+            # Hooks that are not part of the catalog, such as hooks created by plugins
+            name = f"{hook.__class__.__name__}@{id(hook):x}"
+        return name
+
+    def record(
+        self,
+        callback: t.Union[FilterCallback[t.Any, t.Any], ActionCallback[t.Any]],
+        start: float,
+        end: float,
+    ) -> None:
+        hook = self.hooks[-1] if self.hooks else ""
+        key = (hook, id(callback))
+        if key not in self.stats:
+            stats = CallbackStats(
+                hook, get_callback_name(callback), get_plugin_name(callback.contexts)
+            )
+            self.stats[key] = (callback, stats)
+        stats = self.stats[key][1]
+        stats.calls += 1
+        stats.duration += end - start
+        if self.trace_path:
+            self.events.append(
+                {
+                    "name": stats.callback,
+                    "cat": hook,
+                    "ph": "X",
+                    "ts": (start - self.start_time) * 1e6,
+                    "dur": (end - start) * 1e6,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": {"hook": hook, "plugin": stats.plugin},
+                }
+            )
+
+    def iter_stats(self) -> t.Iterator[CallbackStats]:
+        """
+        Iterate on callback stats, by decreasing cumulative duration.
+        """
+        yield from sorted(
+            (stats for _callback, stats in self.stats.values()),
+            key=lambda stats: stats.duration,
+            reverse=True,
+        )
+
+    def report(self, size: int = REPORT_SIZE) -> str:
+        all_stats = list(self.iter_stats())
+        lines = [
+            f"{'TOTAL (ms)':>10} {'CALLS':>7}  {'HOOK':<30} {'PLUGIN':<20} CALLBACK"
+        ]
+        for stats in all_stats[:size]:
+            lines.append(
+                f"{stats.duration * 1000:>10.2f} {stats.calls:>7}  "
+                f"{stats.hook:<30} {stats.plugin or '-':<20} {stats.callback}"
+            )
+        if len(all_stats) > size:
+            lines.append(f"... and {len(all_stats) - size} more callbacks")
+        return "\n".join(lines)
+
+    def save(self, path: str) -> None:
+        """
+        Write trace events to a file in the Chrome trace event format.
+        """
+        trace.save_events(path, self.events)
+
+
+def get_hook_names() -> dict[int, str]:
+    """
+    Names of the hooks from the catalog, indexed by object id.
+    """
+    names: dict[int, str] = {}
+    for catalog in [Actions, Filters]:
+        for name, value in vars(catalog).items():
+            if isinstance(value, (Action, Filter)):
+                names[id(value)] = f"{catalog.__name__}.{name}"
+    return names
+
+
+def get_callback_name(
+    callback: t.Union[FilterCallback[t.Any, t.Any], ActionCallback[t.Any]],
+) -> str:
+    items = getattr(callback, "items", None)
+    if items is not None:
+        # Callback created by Filter.add_items
+        return f"<{len(items)} items>"
+    func = callback.func
+    module = getattr(func, "__module__", None) or "?"
+    name = getattr(func, "__qualname__", None) or repr(func)
+    return f"{module}.{name}"
+
+
+def get_plugin_name(contexts: list[str]) -> str:
+    """
+    Return the name of the plugin that created a callback, based on its contexts.
+
+    Static items that were added by different plugins are merged in a single callback
+    (see :py:meth:`tutor.core.hooks.Filter.compile`). The time spent in such a callback
+    is shared by all these plugins, and their comma-separated names are returned.
+    """
+    plugins: list[str] = []
+    for context in contexts:
+        if context.startswith("app:") and context[4:] not in plugins:
+            plugins.append(context[4:])
+    return ",".join(plugins)
+
+
+# Profiler of the current process, if any
+_PROFILER: t.Optional[HooksProfiler] = None
+
+
+def start(trace_path: t.Optional[str] = None) -> None:
+    """
+    Start profiling hook callbacks. Nothing happens if profiling was already started.
+
+    When `trace_path` is defined, all callback calls will be written to this file on
+    :py:func:`stop`.
+    """
+    global _PROFILER
+    if _PROFILER is None:
+        _PROFILER = HooksProfiler(trace_path=trace_path)
+        _PROFILER.start()
+
+
+def start_from_env() -> None:
+    """
+    Start profiling if the ``TUTOR_PROFILE_HOOKS`` environment variable is defined.
+    """
+    value = os.environ.get(ENV_VAR_NAME)
+    if value:
+        start(trace_path=None if value == "1" else value)
+
+
+def stop() -> None:
+    """
+    Stop profiling, print the report and write the trace file, if any.
+    """
+    global _PROFILER
+    if _PROFILER is None:
+        return
+    profiler = _PROFILER
+    _PROFILER = None
+    profiler.stop()
+    # The report is printed to stderr, so that it does not mix with the command output
+    fmt.echo(fmt.info(f"Hook callbacks profile:\n{profiler.report()}"), err=True)
+    if profiler.trace_path:
+        profiler.save(profiler.trace_path)
+        fmt.echo(
+            fmt.info(f"Hook callbacks trace written to {profiler.trace_path}"),
+            err=True,
+        )
@@ -1,21 +1,136 @@
+import hashlib
+import os
+import subprocess
+import typing as t
+
 from tutor import fmt, hooks, utils
 
+# Label of the images that stores the hash of their build context
+CONTEXT_HASH_LABEL = "org.overhang.tutor.context-hash"
+
+# Build arguments which don't modify the built image, and which are thus not included
+# in the context hash
+NON_HASHED_ARGS_PREFIXES = ("--cache-from=", "--cache-to=", "--output=")
+
+# Directories of build context mounts which are not included in the context hash:
+# version control data and dependencies, which are large and derived from other files
+NON_HASHED_DIRECTORIES = {".git", ".hg", ".svn", "__pycache__", "node_modules"}
+
+
+def build(
+    path: str, tag: str, *args: str, prefix: str = "", context_hash: str = ""
+) -> None:
+    """
+    Build an image with `docker buildx build`. When a `prefix` is defined, every line of
+    the build output is prefixed with it, such that multiple images can be built
+    concurrently. The `context_hash`, if any, is stored as an image label.
+    """
+    fmt.echo_info(f"{prefix}Building image {tag}")
+    if context_hash:
+        args = (*args, f"--label={CONTEXT_HASH_LABEL}={context_hash}")
+    utils.docker(*get_build_command(path, tag, *args), prefix=prefix)
 
-def build(path: str, tag: str, *args: str) -> None:
-    fmt.echo_info(f"Building image {tag}")
+
+def get_build_command(path: str, tag: str, *args: str) -> list[str]:
+    """
+    Return the `docker` arguments to build an image, as modified by the
+    DOCKER_BUILD_COMMAND filter.
+    """
     build_command = ["build", f"--tag={tag}", *args, path]
     # `buildx` can be removed once Tutor requires Docker v23+. At that point, BuildKit will be
     # enabled by default for all Docker users.
     build_command.insert(0, "buildx")
-    command = hooks.Filters.DOCKER_BUILD_COMMAND.apply(build_command)
-    utils.docker(*command)
+    return hooks.Filters.DOCKER_BUILD_COMMAND.apply(build_command)
+
+
+def pull(tag: str, prefix: str = "") -> None:
+    fmt.echo_info(f"{prefix}Pulling image {tag}")
+    utils.docker("pull", tag, prefix=prefix)
+
+
+def push(tag: str, prefix: str = "") -> None:
+    fmt.echo_info(f"{prefix}Pushing image {tag}")
+    utils.docker("push", tag, prefix=prefix)
+
+
+def get_size(tag: str) -> t.Optional[int]:
+    """
+    Return the size of a local image, in bytes, or None if it is unknown.
+    """
+    size = inspect(tag, "{{.Size}}")
+    return int(size) if size and size.isdigit() else None
+
+
+def get_context_hash_label(tag: str) -> t.Optional[str]:
+    """
+    Return the context hash that is stored in the labels of a local image, if any.
+    """
+    return (
+        inspect(tag, f'{{{{ index .Config.Labels "{CONTEXT_HASH_LABEL}" }}}}') or None
+    )
+
+
+def inspect(tag: str, template: str) -> t.Optional[str]:
+    """
+    Return the formatted properties of a local image, or None if the image does not
+    exist.
+    """
+    try:
+        return subprocess.run(
+            ["docker", "image", "inspect", f"--format={template}", tag],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
 
+def get_context_hash(
+    path: str, tag: str, args: t.Iterable[str], build_contexts: list[str]
+) -> str:
+    """
+    Compute a hash of what goes into an image build: the content of the rendered build
+    context at `path`, the build command and the host directories that are added with
+    ``--build-context``.
 
-def pull(tag: str) -> None:
-    fmt.echo_info(f"Pulling image {tag}")
-    utils.docker("pull", tag)
+    Host directories, such as a local edx-platform checkout, can be very large: their
+    files are compared by size and modification time instead of their content, and
+    dependency and version control directories are ignored. Sources that are
+    downloaded during the build, such as git repositories, are not part of the hash.
+    """
+    hasher = hashlib.sha256()
+    for arg in get_build_command(path, tag, *args):
+        if not arg.startswith(NON_HASHED_ARGS_PREFIXES):
+            hasher.update(f"arg:{arg}\0".encode())
+    for relative_path, file_path in iter_files(path):
+        hasher.update(f"file:{relative_path}\0".encode())
+        with open(file_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 16), b""):
+                hasher.update(chunk)
+    for build_context in build_contexts:
+        hasher.update(f"context:{build_context}\0".encode())
+        for relative_path, file_path in iter_files(
+            build_context, exclude=NON_HASHED_DIRECTORIES
+        ):
+            stat = os.stat(file_path)
+            hasher.update(
+                f"{relative_path}:{stat.st_size}:{stat.st_mtime_ns}\0".encode()
+            )
+    return hasher.hexdigest()
 
 
-def push(tag: str) -> None:
-    fmt.echo_info(f"Pushing image {tag}")
-    utils.docker("push", tag)
+def iter_files(
+    root: str, exclude: t.Collection[str] = ()
+) -> t.Iterator[tuple[str, str]]:
+    """
+    Yield the (slash-separated relative path, full path) of all files in a directory,
+    in a stable order. Symbolic links to directories are not followed, and directories
+    with a name in `exclude` are skipped.
+    """
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in exclude)
+        for filename in sorted(filenames):
+            file_path = os.path.join(dirpath, filename)
+            if os.path.isfile(file_path):
+                yield os.path.relpath(file_path, root).replace(os.sep, "/"), file_path
@@ -0,0 +1,108 @@
+"""
+Run tasks concurrently, in the order defined by their dependencies.
+"""
+
+from __future__ import annotations
+
+import typing as t
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+from tutor import exceptions
+
+Task = t.Callable[[], None]
+
+
+class TasksFailedError(exceptions.TutorError):
+    def __init__(self, errors: dict[str, BaseException]):
+        self.errors = errors
+        details = "\n".join(f"  {name}: {error}" for name, error in errors.items())
+        super().__init__(f"{len(errors)} task(s) failed:\n{details}")
+
+
+def run(
+    tasks: list[tuple[str, Task]],
+    dependencies: t.Optional[t.Mapping[str, t.Iterable[str]]] = None,
+    jobs: int = 1,
+    fail_fast: bool = True,
+) -> None:
+    """
+    Run named tasks, such that each task starts after all its dependencies succeeded.
+    Dependencies which are not part of the tasks are ignored. Independent tasks run in
+    their original order, concurrently with `jobs` threads.
+
+    When `jobs` is 1, tasks are run in the current thread and the first error is raised
+    as is. Otherwise, all errors are raised as a single :py:class:`TasksFailedError`.
+    On error, no new task is started when `fail_fast` is true; otherwise, only the tasks
+    that depend on the failed ones are skipped.
+    """
+    names = [name for name, _task in tasks]
+    functions = dict(tasks)
+    requires: dict[str, set[str]] = {
+        name: set((dependencies or {}).get(name, [])) & set(names) for name in names
+    }
+    if jobs <= 1:
+        for name in sort(names, requires):
+            functions[name]()
+        return
+
+    errors: dict[str, BaseException] = {}
+    done: set[str] = set()
+    # Dependencies come first, such that failures are propagated in a single pass
+    pending = sort(names, requires)
+    running: dict[Future[None], str] = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        while pending or running:
+            # Start all tasks that are ready, in their original order
+            if not (errors and fail_fast):
+                for name in list(pending):
+                    if len(running) >= jobs:
+                        break
+                    if requires[name] & errors.keys():
+                        # Skip tasks that depend on a failed task
+                        pending.remove(name)
+                        errors[name] = exceptions.TutorError(
+                            "skipped because a dependency failed"
+                        )
+                    elif requires[name] <= done:
+                        pending.remove(name)
+                        running[executor.submit(functions[name])] = name
+            if not running:
+                break
+            finished, _not_done = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    done.add(name)
+                else:
+                    errors[name] = error
+    if errors:
+        raise TasksFailedError(errors)
+
+
+def sort(names: list[str], requires: t.Mapping[str, t.Collection[str]]) -> list[str]:
+    """
+    Sort names such that each one comes after its requirements. The original order is
+    preserved as much as possible. Raise an error on dependency cycles.
+    """
+    result: list[str] = []
+    added: set[str] = set()
+    visiting: list[str] = []
+
+    def add(name: str) -> None:
+        if name in added:
+            return
+        if name in visiting:
+            cycle = " -> ".join(visiting[visiting.index(name) :] + [name])
+            raise exceptions.TutorError(f"Dependency cycle: {cycle}")
+        visiting.append(name)
+        for requirement in names:
+            if requirement in requires.get(name, ()):
+                add(requirement)
+        visiting.pop()
+        added.add(name)
+        result.append(name)
+
+    for name in names:
+        add(name)
+    return result
@@ -1,8 +1,17 @@
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
 import os
+import sys
+import typing as t
+from pathlib import Path
 
 import appdirs
+import importlib_metadata
 
-from tutor.__about__ import __app__
+from tutor.__about__ import __app__, __version__
 
 PLUGINS_ROOT_ENV_VAR_NAME = "TUTOR_PLUGINS_ROOT"
 
@@ -14,3 +23,139 @@ PLUGINS_ROOT_ENV_VAR_NAME = "TUTOR_PLUGINS_ROOT"
 PLUGINS_ROOT = os.path.expanduser(
     os.environ.get(PLUGINS_ROOT_ENV_VAR_NAME, "")
 ) or appdirs.user_data_dir(appname=__app__ + "-plugins")
+
+# File where the results of plugin discovery are cached.
+# On linux this is typically ``~/.cache/tutor/plugins.json``.
+DISCOVERY_CACHE_PATH = os.path.join(
+    appdirs.user_cache_dir(appname=__app__), "plugins.json"
+)
+
+_DISCOVERY_CACHE_ENABLED = False
+_discovery_cache: t.Optional[dict[str, t.Any]] = None
+
+
+def enable_discovery_cache(enabled: bool = True) -> None:
+    """
+    Store the results of plugin discovery on disk, in :py:data:`DISCOVERY_CACHE_PATH`,
+    and reuse them in subsequent calls to :py:func:`iter_entrypoints` and
+    :py:func:`iter_plugins_root`.
+
+    Scanning the entrypoints of all installed packages is slow when there are many of
+    them. The cache is invalidated whenever a package is installed or removed, i.e:
+    whenever one of the ``*.dist-info`` or ``*.egg-info`` folders from the python path
+    is modified, or when the plugins root is modified.
+    """
+    global _DISCOVERY_CACHE_ENABLED, _discovery_cache
+    _DISCOVERY_CACHE_ENABLED = enabled
+    _discovery_cache = None
+
+
+def iter_entrypoints(group: str) -> t.Iterator[importlib_metadata.EntryPoint]:
+    """
+    Yield the entrypoints from the given group of all installed packages.
+    """
+    cache = _get_discovery_cache()
+    if cache is None:
+        yield from importlib_metadata.entry_points(group=group)
+        return
+
+    entrypoints: dict[str, list[str]] = cache["entrypoints"]
+    if group not in entrypoints:
+        paths = []
+        for entrypoint in importlib_metadata.entry_points(group=group):
+            # Distributions from the python path are stored in "*-info" folders
+            path = getattr(entrypoint.dist, "_path", None)
+            if not isinstance(path, Path):
+                # This entrypoint does not come from a folder: don't cache anything
+                yield from importlib_metadata.entry_points(group=group)
+                return
+            if str(path) not in paths:
+                paths.append(str(path))
+        entrypoints[group] = paths
+        _save_discovery_cache(cache)
+
+    for path in entrypoints[group]:
+        distribution = importlib_metadata.PathDistribution(Path(path))
+        yield from distribution.entry_points.select(group=group)
+
+
+def iter_plugins_root(pattern: str) -> t.Iterator[str]:
+    """
+    Yield the paths of files from the plugins root that match a glob pattern, such as
+    "*.yml".
+    """
+    cache = _get_discovery_cache()
+    if cache is None:
+        names = _list_plugins_root()
+    else:
+        names = cache["plugins_root"]
+    for name in sorted(fnmatch.filter(names, pattern)):
+        if name.startswith("."):
+            # Hidden files are ignored, as with glob
+            continue
+        yield os.path.join(PLUGINS_ROOT, name)
+
+
+def _list_plugins_root() -> list[str]:
+    try:
+        return os.listdir(PLUGINS_ROOT)
+    except OSError:
+        return []
+
+
+def _get_discovery_cache() -> t.Optional[dict[str, t.Any]]:
+    """
+    Return the discovery cache, or None if it is disabled. Out-of-date caches are
+    replaced by an empty cache.
+    """
+    global _discovery_cache
+    if not _DISCOVERY_CACHE_ENABLED:
+        return None
+    if _discovery_cache is None:
+        key = get_discovery_cache_key()
+        try:
+            with open(DISCOVERY_CACHE_PATH, encoding="utf-8") as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            cache = None
+        if not isinstance(cache, dict) or cache.get("key") != key:
+            cache = {"key": key, "entrypoints": {}}
+            cache["plugins_root"] = _list_plugins_root()
+            _save_discovery_cache(cache)
+        _discovery_cache = cache
+    return _discovery_cache
+
+
+def _save_discovery_cache(cache: dict[str, t.Any]) -> None:
+    try:
+        os.makedirs(os.path.dirname(DISCOVERY_CACHE_PATH), exist_ok=True)
+        with open(DISCOVERY_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+    except OSError:
+        # The cache is not essential: for instance, the home directory might be
+        # read-only
+        pass
+
+
+def get_discovery_cache_key() -> str:
+    """
+    Hash of the modification times of the plugins root and of all the package metadata
+    folders from the python path.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(f"{__version__} {sys.executable}".encode())
+    for path in [PLUGINS_ROOT, *sys.path]:
+        path = os.path.abspath(path)
+        try:
+            entries = list(os.scandir(path))
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            # Missing folder, or zip file
+            hasher.update(f"{path} -\n".encode())
+            continue
+        hasher.update(f"{path} {mtime}\n".encode())
+        for entry in sorted(entries, key=lambda entry: entry.name):
+            if entry.name.endswith((".dist-info", ".egg-info")):
+                mtime = entry.stat().st_mtime_ns
+                hasher.update(f"{entry.name} {mtime}\n".encode())
+    return hasher.hexdigest()
@@ -216,8 +216,11 @@ def is_directory_mounted(image_name: str, dirname: str) -> bool:
     return False
 
 
-hooks.Filters.ENV_TEMPLATE_VARIABLES.add_item(
-    ("iter_mounted_directories", iter_mounted_directories)
+hooks.Filters.ENV_TEMPLATE_VARIABLES.add_items(
+    [
+        ("iter_mounted_directories", iter_mounted_directories),
+        ("iter_mounts", bindmount.iter_mounts),
+    ]
 )
 
 
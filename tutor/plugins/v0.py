@@ -2,16 +2,15 @@ import importlib
 import importlib.util
 import os
 import typing as t
-from glob import glob
 
 import click
 import importlib_metadata
 
-from tutor import env, exceptions, fmt, hooks, serialize
+from tutor import env, exceptions, fmt, hooks, serialize, trace
 from tutor.__about__ import __app__  # noqa: F401
 from tutor.types import Config
 
-from .base import PLUGINS_ROOT
+from .base import iter_entrypoints, iter_plugins_root
 
 
 class BasePlugin:
@@ -141,17 +140,18 @@ class BasePlugin:
             raise exceptions.TutorError(
                 f"Invalid patches in plugin {self.name}. Expected dict, got {patches.__class__}."
             )
-        for patch_name, content in patches.items():
-            if not isinstance(patch_name, str):
-                raise exceptions.TutorError(
-                    f"Invalid patch name '{patch_name}' in plugin {self.name}. "
-                    f"Expected str, got {patch_name.__class__}."
-                )
-            if not isinstance(content, str):
-                raise exceptions.TutorError(
-                    f"Invalid patch '{patch_name}' in plugin {self.name}. Expected str, got {content.__class__}."
-                )
-            hooks.Filters.ENV_PATCHES.add_item((patch_name, content))
+        with hooks.Filters.ENV_PATCHES.bulk_add():
+            for patch_name, content in patches.items():
+                if not isinstance(patch_name, str):
+                    raise exceptions.TutorError(
+                        f"Invalid patch name '{patch_name}' in plugin {self.name}. "
+                        f"Expected str, got {patch_name.__class__}."
+                    )
+                if not isinstance(content, str):
+                    raise exceptions.TutorError(
+                        f"Invalid patch '{patch_name}' in plugin {self.name}. Expected str, got {content.__class__}."
+                    )
+                hooks.Filters.ENV_PATCHES.add_item((patch_name, content))
 
     def _load_tasks(self) -> None:
         """
@@ -262,8 +262,7 @@ class EntrypointPlugin(BasePlugin):
 
     @classmethod
     def discover_all(cls) -> None:
-        entrypoints = importlib_metadata.entry_points(group=cls.ENTRYPOINT)
-        for entrypoint in entrypoints:
+        for entrypoint in iter_entrypoints(cls.ENTRYPOINT):
             try:
                 error: t.Optional[str] = None
                 cls(entrypoint)
@@ -271,7 +270,7 @@ class EntrypointPlugin(BasePlugin):
                 error = str(e)
             if error:
                 fmt.echo_error(
-                    f"Failed to load entrypoint '{entrypoint.name} = {entrypoint.module_name}' from distribution "
+                    f"Failed to load entrypoint '{entrypoint.name} = {entrypoint.value}' from distribution "
                     f"{entrypoint.dist}: {error}"
                 )
 
@@ -350,7 +349,7 @@ class DictPlugin(BasePlugin):
 
     @classmethod
     def discover_all(cls) -> None:
-        for path in glob(os.path.join(PLUGINS_ROOT, "*.yml")):
+        for path in iter_plugins_root("*.yml"):
             with open(path, encoding="utf-8") as f:
                 data = serialize.load(f)
                 if not isinstance(data, dict):
@@ -366,6 +365,7 @@ class DictPlugin(BasePlugin):
 
 
 @hooks.Actions.CORE_READY.add()
+@trace.traced("plugins.discover (v0)")
 def _discover_v0_plugins() -> None:
     """
     Install all entrypoint and dict plugins.
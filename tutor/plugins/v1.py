@@ -1,23 +1,23 @@
 import importlib.util
 import os
 import sys
-from glob import glob
 
 import importlib_metadata
 
-from tutor import hooks
+from tutor import hooks, trace
 from tutor.types import Config
 
-from .base import PLUGINS_ROOT
+from .base import iter_entrypoints, iter_plugins_root
 
 
 @hooks.Actions.CORE_READY.add()
+@trace.traced("plugins.discover (v1)")
 def _discover_module_plugins() -> None:
     """
     Discover .py files in the plugins root folder.
     """
     with hooks.Contexts.PLUGINS.enter():
-        for path in glob(os.path.join(PLUGINS_ROOT, "*.py")):
+        for path in iter_plugins_root("*.py"):
             discover_module(path)
 
 
@@ -28,7 +28,7 @@ def _discover_entrypoint_plugins() -> None:
     """
     with hooks.Contexts.PLUGINS.enter():
         if "TUTOR_IGNORE_ENTRYPOINT_PLUGINS" not in os.environ:
-            for entrypoint in importlib_metadata.entry_points(group="tutor.plugin.v1"):
+            for entrypoint in iter_entrypoints("tutor.plugin.v1"):
                 discover_package(entrypoint)
 
 
@@ -8,27 +8,51 @@ import yaml
 from yaml.parser import ParserError
 from yaml.scanner import ScannerError
 
+# Use the much faster libyaml bindings when they are available. The output of these
+# classes is identical to their pure-Python counterparts for mappings and sequences,
+# which is all that Tutor ever dumps. Top-level scalars are a special case: libyaml
+# does not write the "..." document end marker after them. The loaded value is the
+# same either way.
+try:
+    from yaml import CDumper as Dumper
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import Dumper, SafeDumper, SafeLoader
+
 
 def load(stream: t.Union[str, t.IO[str]]) -> t.Any:
-    return yaml.load(stream, Loader=yaml.SafeLoader)
+    return yaml.load(stream, Loader=SafeLoader)
 
 
 def load_all(stream: str) -> t.Iterator[t.Any]:
-    return yaml.load_all(stream, Loader=yaml.SafeLoader)
+    return yaml.load_all(stream, Loader=SafeLoader)
 
 
 def dump_all(documents: t.Sequence[t.Any], fileobj: TextIOWrapper) -> None:
-    yaml.safe_dump_all(
-        documents, stream=fileobj, default_flow_style=False, allow_unicode=True
+    yaml.dump_all(
+        documents,
+        stream=fileobj,
+        Dumper=SafeDumper,
+        default_flow_style=False,
+        allow_unicode=True,
     )
 
 
 def dump(content: t.Any, fileobj: TextIOWrapper) -> None:
-    yaml.dump(content, stream=fileobj, default_flow_style=False, allow_unicode=True)
+    yaml.dump(
+        content,
+        stream=fileobj,
+        Dumper=Dumper,
+        default_flow_style=False,
+        allow_unicode=True,
+    )
 
 
 def dumps(content: t.Any) -> str:
-    result = yaml.dump(content, default_flow_style=False, allow_unicode=True)
+    result = yaml.dump(
+        content, Dumper=Dumper, default_flow_style=False, allow_unicode=True
+    )
     assert isinstance(result, str)
     return result
 
@@ -1,4 +1,12 @@
-from tutor import env
+import hashlib
+import json
+import os
+import shlex
+import threading
+import typing as t
+from datetime import datetime, timezone
+
+from tutor import env, trace
 from tutor.types import Config
 
 
@@ -16,11 +24,16 @@ class BaseTaskRunner:
 
     def run_task_from_template(self, service: str, *path: str) -> None:
         command = self.render(*path)
-        self.run_task(service, command)
+        with trace.span(f"do {service}", "task", template="/".join(path)):
+            self.run_task(service, command)
 
     def run_task_from_str(self, service: str, command: str) -> None:
-        rendered = env.render_str(self.config, command).strip()
-        self.run_task(service, rendered)
+        rendered = self.render_str(command)
+        with trace.span(f"do {service}", "task", command=rendered):
+            self.run_task(service, rendered)
+
+    def render_str(self, command: str) -> str:
+        return env.render_str(self.config, command).strip()
 
     def render(self, *path: str) -> str:
         rendered = env.render_file(self.config, *path).strip()
@@ -36,7 +49,98 @@ class BaseTaskRunner:
         """
         raise NotImplementedError
 
+    def get_image(self, service: str) -> str:
+        """
+        Return the image in which tasks of this service are run. This is used to detect
+        that a task must be run again because its image changed. Runners that can't
+        tell return an empty string.
+        """
+        return ""
+
 
 class BaseComposeTaskRunner(BaseTaskRunner):
     def docker_compose(self, *command: str) -> int:
         raise NotImplementedError
+
+
+class TaskLedger:
+    """
+    Record of the tasks that succeeded, stored in the data directory.
+
+    Tasks are identified by the hash of their service and of their rendered script,
+    such that scripts, which may include passwords, are not stored. Each task is stored
+    along with the image it ran in and the time of its last success.
+    """
+
+    def __init__(self, root: str):
+        self.path = env.data_path(root, "tasks.json")
+        self.lock = threading.Lock()
+        self.tasks: dict[str, dict[str, str]] = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding="utf-8") as f:
+                self.tasks = json.load(f)
+
+    @staticmethod
+    def get_hash(service: str, command: str) -> str:
+        return hashlib.sha256(f"{service}\n{command}".encode()).hexdigest()
+
+    def get_success(self, service: str, command: str, image: str) -> t.Optional[str]:
+        """
+        Return the time of the last success of a task, if it ran in the same image.
+        """
+        task = self.tasks.get(self.get_hash(service, command))
+        if task is None or task["image"] != image:
+            return None
+        return task["timestamp"]
+
+    def add_success(self, service: str, command: str, image: str) -> None:
+        """
+        Record the success of a task. The ledger is saved right away, such that
+        interrupted jobs are recorded, too.
+        """
+        with self.lock:
+            self.tasks[self.get_hash(service, command)] = {
+                "service": service,
+                "image": image,
+                "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            }
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.tasks, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+
+
+def group_tasks(tasks: list[tuple[str, str]]) -> list[tuple[str, list[str]]]:
+    """
+    Group consecutive tasks that run in the same service, such that they can be run in
+    a single container (see :py:func:`get_batch_script`).
+    """
+    groups: list[tuple[str, list[str]]] = []
+    for service, command in tasks:
+        if groups and groups[-1][0] == service:
+            groups[-1][1].append(command)
+        else:
+            groups.append((service, [command]))
+    return groups
+
+
+def get_batch_script(commands: list[str]) -> str:
+    """
+    Return a script that runs multiple scripts one after the other. Each script runs in
+    its own shell, such that it behaves as if it ran in a separate container. The batch
+    stops at the first script that fails, with the same exit code.
+    """
+    count = len(commands)
+    lines: list[str] = []
+    for index, command in enumerate(commands, start=1):
+        lines += [
+            f'echo "===== Task {index}/{count} ====="',
+            "status=0",
+            f"sh -e -c {shlex.quote(command)} || status=$?",
+            'if [ "$status" -ne 0 ]; then',
+            f'    echo "===== Task {index}/{count} failed with status $status =====" >&2',
+            '    exit "$status"',
+            "fi",
+        ]
+    return "\n".join(lines)
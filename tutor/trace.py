@@ -0,0 +1,167 @@
+"""
+Record the timeline of a ``tutor`` command.
+
+Spans are recorded for the major steps of a command, such as plugin discovery,
+configuration loading, environment rendering, subprocesses and ``do`` tasks. When the
+command is run with ``tutor --trace FILE ...``, these spans are written on exit to FILE
+in the Chrome trace event format, which can be viewed in https://ui.perfetto.dev,
+https://www.speedscope.app or chrome://tracing.
+
+Spans are not recorded unless :py:func:`start` was called, which is the case only in
+the command line interface, when tracing is enabled. Because the ``--trace`` option is
+parsed after plugins are discovered, the ``TUTOR_TRACE=FILE`` environment variable must
+be defined instead to record the startup of the command.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import sys
+import threading
+import typing as t
+from contextlib import contextmanager
+from time import perf_counter
+
+from typing_extensions import ParamSpec
+
+from tutor import fmt
+
+ENV_VAR_NAME = "TUTOR_TRACE"
+
+P = ParamSpec("P")
+T = t.TypeVar("T")
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.events: list[dict[str, t.Any]] = []
+        # Trace events are written to this path on exit
+        self.path: t.Optional[str] = None
+        self.origin = perf_counter()
+
+    def add(
+        self,
+        name: str,
+        category: str,
+        start: float,
+        end: float,
+        args: t.Optional[dict[str, t.Any]] = None,
+    ) -> None:
+        self.events.append(
+            {
+                "name": name,
+                "cat": category,
+                "ph": "X",
+                "ts": (start - self.origin) * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": args or {},
+            }
+        )
+
+    def save(self, path: str) -> None:
+        save_events(
+            path,
+            [
+                {
+                    "name": "process_name",
+                    "ph": "M",
+                    "pid": os.getpid(),
+                    "args": {"name": " ".join(["tutor", *sys.argv[1:]])},
+                },
+                *self.events,
+            ],
+        )
+
+
+def save_events(path: str, events: list[dict[str, t.Any]]) -> None:
+    """
+    Write trace events to a file in the Chrome trace event format.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+# Tracer of the current process, if any
+_TRACER: t.Optional[Tracer] = None
+
+
+def start() -> None:
+    """
+    Start recording spans. Nothing happens if recording was already started.
+    """
+    global _TRACER
+    if _TRACER is None:
+        _TRACER = Tracer()
+
+
+def save_on_exit(path: str) -> None:
+    """
+    Write all recorded spans to `path` on :py:func:`stop`. Recording is started, if
+    necessary.
+    """
+    start()
+    assert _TRACER is not None
+    _TRACER.path = path
+
+
+def start_from_env() -> None:
+    """
+    Start recording spans if the ``TUTOR_TRACE`` environment variable is defined. Its
+    value is the path of the trace file.
+    """
+    path = os.environ.get(ENV_VAR_NAME)
+    if path:
+        save_on_exit(path)
+
+
+def stop() -> None:
+    """
+    Stop recording spans and write the trace file, if any.
+    """
+    global _TRACER
+    if _TRACER is None:
+        return
+    tracer = _TRACER
+    _TRACER = None
+    if tracer.path:
+        tracer.save(tracer.path)
+        fmt.echo(fmt.info(f"Trace written to {tracer.path}"), err=True)
+
+
+@contextmanager
+def span(name: str, category: str = "tutor", **args: t.Any) -> t.Iterator[None]:
+    """
+    Record the duration of the enclosed block, including when it fails. This is a no-op
+    when recording was not started.
+    """
+    tracer = _TRACER
+    if tracer is None:
+        yield
+        return
+    start_time = perf_counter()
+    try:
+        yield
+    finally:
+        tracer.add(name, category, start_time, perf_counter(), args)
+
+
+def traced(
+    name: str, category: str = "tutor"
+) -> t.Callable[[t.Callable[P, T]], t.Callable[P, T]]:
+    """
+    Decorator to record a span every time the decorated function is called.
+    """
+
+    def decorator(func: t.Callable[P, T]) -> t.Callable[P, T]:
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            with span(name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
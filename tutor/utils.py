@@ -11,17 +11,19 @@ import string
 import struct
 import subprocess
 import sys
+import threading
 import uuid as uuid_module
-from typing import List, Tuple
-from urllib.error import URLError
-from urllib.request import urlopen
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, ContextManager, Iterator, List, Tuple
 
 import click
-from Crypto.Protocol.KDF import bcrypt, bcrypt_check
-from Crypto.PublicKey import RSA
-from Crypto.PublicKey.RSA import RsaKey
 
-from . import exceptions, fmt
+from . import exceptions, fmt, trace
+
+# Crypto and urllib.request are slow to import, and they are rarely used: we import
+# them on first use, to improve the command line startup time.
+if TYPE_CHECKING:
+    from Crypto.PublicKey.RSA import RsaKey
 
 
 def encrypt(text: str) -> str:
@@ -31,6 +33,8 @@ def encrypt(text: str) -> str:
     The encryption process is compatible with the password verification performed by
     `htpasswd <https://httpd.apache.org/docs/2.4/programs/htpasswd.html>`__.
     """
+    from Crypto.Protocol.KDF import bcrypt
+
     return bcrypt(text.encode(), 12).decode()
 
 
@@ -38,6 +42,8 @@ def verify_encrypted(encrypted: str, text: str) -> bool:
     """
     Return True/False if the encrypted content corresponds to the unencrypted text.
     """
+    from Crypto.Protocol.KDF import bcrypt_check
+
     try:
         bcrypt_check(text.encode(), encrypted.encode())
         return True
@@ -108,6 +114,8 @@ def rsa_private_key(bits: int = 2048) -> str:
     """
     Export an RSA private key in PEM format.
     """
+    from Crypto.PublicKey import RSA
+
     key = RSA.generate(bits)
     return key.export_key().decode()
 
@@ -130,10 +138,12 @@ def uid_master_hash(master_key: str, uid: str) -> str:
     return hmac.new(master_key.encode(), uid.encode(), hashlib.sha256).hexdigest()
 
 
-def rsa_import_key(key: str) -> RsaKey:
+def rsa_import_key(key: str) -> "RsaKey":
     """
     Import PEM-formatted RSA key and return the corresponding object.
     """
+    from Crypto.PublicKey import RSA
+
     return RSA.import_key(key.encode())
 
 
@@ -185,11 +195,13 @@ def docker_run(*command: str) -> int:
     return docker(*args, *command)
 
 
-def docker(*command: str) -> int:
+def docker(*command: str, prefix: str = "") -> int:
     if shutil.which("docker") is None:
         raise exceptions.TutorError(
             "docker is not installed. Please follow instructions from https://docs.docker.com/install/"
         )
+    if prefix:
+        return execute_prefixed(prefix, "docker", *command)
     return execute("docker", *command)
 
 
@@ -210,16 +222,40 @@ def is_a_tty() -> bool:
     Return True if stdin is able to allocate a tty. Tty allocation sometimes cannot be
     enabled, for instance in cron jobs
     """
+    if getattr(_OUTPUT, "prefix", ""):
+        # The output of commands is captured, and stdin is not forwarded to them
+        return False
     return sys.stdin.isatty()
 
 
+# Thread-local output settings
+_OUTPUT = threading.local()
+
+
+@contextmanager
+def prefixed_output(prefix: str) -> Iterator[None]:
+    """
+    Within this context manager, the output of commands run with :py:func:`execute` in
+    the current thread is prefixed. This is useful to run commands concurrently from
+    different threads.
+    """
+    _OUTPUT.prefix = prefix
+    try:
+        yield
+    finally:
+        _OUTPUT.prefix = ""
+
+
 def execute(*command: str) -> int:
+    prefix = getattr(_OUTPUT, "prefix", "")
+    if prefix:
+        return execute_prefixed(prefix, *command)
     click.echo(fmt.command(shlex.join(command)))
     return execute_silent(*command)
 
 
 def execute_silent(*command: str) -> int:
-    with subprocess.Popen(command) as p:
+    with trace_command(command), subprocess.Popen(command) as p:
         try:
             result = p.wait(timeout=None)
         except KeyboardInterrupt:
@@ -237,11 +273,70 @@ def execute_silent(*command: str) -> int:
     return result
 
 
+# Lock to print the output of concurrent commands one line at a time
+_OUTPUT_LOCK = threading.Lock()
+
+
+def execute_prefixed(prefix: str, *command: str) -> int:
+    """
+    Run a command and print each line of its output, prefixed by `prefix`. This is
+    useful to run multiple commands concurrently, without interleaving their output.
+    """
+    literal_command = shlex.join(command)
+    with _OUTPUT_LOCK:
+        click.echo(f"{prefix}{fmt.command(literal_command)}")
+    with trace_command(command):
+        with subprocess.Popen(
+            command,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        ) as p:
+            assert p.stdout is not None
+            try:
+                for line in p.stdout:
+                    text = line.decode(errors="replace").rstrip("\r\n")
+                    with _OUTPUT_LOCK:
+                        click.echo(f"{prefix}{text}")
+                result = p.wait(timeout=None)
+            except KeyboardInterrupt:
+                p.kill()
+                p.wait()
+                raise
+            if result > 0:
+                raise exceptions.TutorError(
+                    f"Command failed with status {result}: {literal_command}"
+                )
+    return result
+
+
+def echo_output(text: str) -> None:
+    """
+    Print a line of output, with the prefix of :py:func:`prefixed_output`, if any.
+    """
+    prefix = getattr(_OUTPUT, "prefix", "")
+    with _OUTPUT_LOCK:
+        click.echo(f"{prefix}{text}")
+
+
+def trace_command(command: Tuple[str, ...]) -> ContextManager[None]:
+    """
+    Record the duration of a subprocess. Commands can be very long, for instance when
+    they include a script, so the span name is truncated.
+    """
+    literal_command = shlex.join(command)
+    name = literal_command.split("\n", 1)[0]
+    if len(name) > 100:
+        name = name[:97] + "..."
+    return trace.span(name, "subprocess", command=literal_command)
+
+
 def check_output(*command: str) -> bytes:
     literal_command = shlex.join(command)
     click.echo(fmt.command(literal_command))
     try:
-        return subprocess.check_output(command)
+        with trace_command(command):
+            return subprocess.check_output(command)
     except Exception as e:
         raise exceptions.TutorError(f"Command failed: {literal_command}") from e
 
@@ -313,6 +408,9 @@ def read_url(url: str) -> str:
     """
     if is_http(url):
         # web index
+        from urllib.error import URLError
+        from urllib.request import urlopen
+
         try:
             response = urlopen(url)
             content: str = response.read().decode()